@@ -3,8 +3,18 @@ from sqlalchemy.orm import Session
 from app.core.database import engine, get_db
 from app.services.health_service import HealthService
 from app.services.dataset_service import DatasetService
+from app.services.dataset_deletion_service import DatasetDeletionService
 from app.services.label_service import LabelService
 from app.services.image_service import ImageService
+from app.services.job_service import JobService
+from app.services.near_duplicate_service import NearDuplicateService
+from app.services.annotation_service import AnnotationService
+from app.services.export_service import ExportService
+from app.services.import_service import ImportService
+from app.services.stats_service import StatsService
+from app.services.snapshot_service import SnapshotService
+from app.services.version_service import VersionService
+from app.services.split_service import SplitService
 
 
 def get_health_service() -> HealthService:
@@ -15,9 +25,49 @@ def get_dataset_service(db: Session = Depends(get_db)) -> DatasetService:
     return DatasetService(db)
 
 
+def get_dataset_deletion_service(db: Session = Depends(get_db)) -> DatasetDeletionService:
+    return DatasetDeletionService(db)
+
+
 def get_label_service(db: Session = Depends(get_db)) -> LabelService:
     return LabelService(db)
 
 
 def get_image_service(db: Session = Depends(get_db)) -> ImageService:
     return ImageService(db)
+
+
+def get_job_service(db: Session = Depends(get_db)) -> JobService:
+    return JobService(db)
+
+
+def get_near_duplicate_service(db: Session = Depends(get_db)) -> NearDuplicateService:
+    return NearDuplicateService(db)
+
+
+def get_annotation_service(db: Session = Depends(get_db)) -> AnnotationService:
+    return AnnotationService(db)
+
+
+def get_export_service(db: Session = Depends(get_db)) -> ExportService:
+    return ExportService(db)
+
+
+def get_import_service(db: Session = Depends(get_db)) -> ImportService:
+    return ImportService(db)
+
+
+def get_stats_service(db: Session = Depends(get_db)) -> StatsService:
+    return StatsService(db)
+
+
+def get_snapshot_service(db: Session = Depends(get_db)) -> SnapshotService:
+    return SnapshotService(db)
+
+
+def get_version_service(db: Session = Depends(get_db)) -> VersionService:
+    return VersionService(db)
+
+
+def get_split_service(db: Session = Depends(get_db)) -> SplitService:
+    return SplitService(db)
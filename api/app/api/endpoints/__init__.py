@@ -7,9 +7,29 @@ This package contains all the FastAPI route handlers.
 from .health import router as health_router
 from .datasets import router as datasets_router
 from .labels import router as labels_router
+from .events import router as events_router
+from .jobs import router as jobs_router
+from .near_duplicates import router as near_duplicates_router
+from .annotations import router as annotations_router
+from .exports import router as exports_router
+from .imports import router as imports_router
+from .stats import router as stats_router
+from .snapshots import router as snapshots_router
+from .versions import router as versions_router
+from .splits import router as splits_router
 
 __all__ = [
     "health_router",
     "datasets_router",
-    "labels_router"
+    "labels_router",
+    "events_router",
+    "jobs_router",
+    "near_duplicates_router",
+    "annotations_router",
+    "exports_router",
+    "imports_router",
+    "stats_router",
+    "snapshots_router",
+    "versions_router",
+    "splits_router"
 ]
@@ -0,0 +1,195 @@
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, status
+from typing import Annotated, List
+
+from app.api.deps import get_annotation_service
+from app.services.annotation_service import AnnotationService
+from app.schema.annotation import (
+    Annotation,
+    AnnotationBatchRequest,
+    AnnotationBatchResult,
+    AnnotationBox,
+    AnnotationCreate,
+    AnnotationListResponse,
+    AnnotationRegionQuery,
+    AnnotationUpdate
+)
+
+router = APIRouter(tags=["annotations"])
+
+
+@router.post("/annotations", response_model=Annotation, status_code=status.HTTP_201_CREATED)
+def create_annotation(
+    annotation: AnnotationCreate,
+    service: AnnotationService = Depends(get_annotation_service)
+):
+    """Create one annotation (the label is linked to the image's dataset if needed)"""
+    db_annotation = service.create_annotation(annotation)
+
+    if db_annotation is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image not found"
+        )
+
+    return db_annotation
+
+
+@router.get("/annotations/{annotation_id}", response_model=Annotation)
+def get_annotation(
+    annotation_id: int = Path(..., gt=0, description="Annotation ID"),
+    service: AnnotationService = Depends(get_annotation_service)
+):
+    """Get a specific annotation by ID"""
+    annotation = service.get_annotation(annotation_id)
+
+    if annotation is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Annotation not found"
+        )
+
+    return annotation
+
+
+@router.patch("/annotations/{annotation_id}", response_model=Annotation)
+def update_annotation(
+    annotation_data: AnnotationUpdate,
+    annotation_id: int = Path(..., gt=0, description="Annotation ID"),
+    service: AnnotationService = Depends(get_annotation_service)
+):
+    """Update the box or label of an annotation"""
+    annotation = service.update_annotation(annotation_id, annotation_data)
+
+    if annotation is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Annotation not found"
+        )
+
+    return annotation
+
+
+@router.delete("/annotations/{annotation_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_annotation(
+    annotation_id: int = Path(..., gt=0, description="Annotation ID"),
+    service: AnnotationService = Depends(get_annotation_service)
+):
+    """Delete an annotation"""
+    success = service.delete_annotation(annotation_id)
+
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Annotation not found"
+        )
+
+
+@router.get("/images/{image_id}/annotations", response_model=List[Annotation])
+def get_image_annotations(
+    image_id: int = Path(..., gt=0, description="Image ID"),
+    service: AnnotationService = Depends(get_annotation_service)
+):
+    """Get the annotations of an image"""
+    annotations = service.get_image_annotations(image_id)
+
+    if annotations is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image not found"
+        )
+
+    return annotations
+
+
+@router.get("/images/{image_id}/annotations/search", response_model=AnnotationListResponse)
+def search_image_annotations(
+    filters: Annotated[AnnotationRegionQuery, Query()],
+    image_id: int = Path(..., gt=0, description="Image ID"),
+    service: AnnotationService = Depends(get_annotation_service)
+):
+    """
+    Find the boxes of an image in a region (xmin, ymin, xmax, ymax, in
+    pixels), optionally filtered by area, aspect ratio and label
+
+    Meant for large (satellite, tiled...) images: the region query uses a
+    spatial index instead of reading every box of the image.
+    """
+    result = service.search_annotations(filters, image_id=image_id)
+
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image not found"
+        )
+
+    return result
+
+
+@router.put("/images/{image_id}/annotations", response_model=List[Annotation])
+def replace_image_annotations(
+    boxes: List[AnnotationBox] = Body(..., description="Full annotation set of the image"),
+    image_id: int = Path(..., gt=0, description="Image ID"),
+    service: AnnotationService = Depends(get_annotation_service)
+):
+    """
+    Replace the annotations of an image: boxes with an id update that
+    annotation, the others are created, and annotations missing from the
+    list are deleted. An empty list clears the image.
+    """
+    annotations = service.replace_image_annotations(image_id, boxes)
+
+    if annotations is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image not found"
+        )
+
+    return annotations
+
+
+@router.put("/datasets/{dataset_id}/annotations", response_model=AnnotationBatchResult)
+def write_dataset_annotations(
+    batch: AnnotationBatchRequest,
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    service: AnnotationService = Depends(get_annotation_service)
+):
+    """
+    Write the boxes of many images of a dataset in one transaction
+
+    In replace mode, the boxes become the full annotation set of each listed
+    image; in upsert mode, annotations not listed are kept. Either all the
+    boxes are written or none: an unknown image, label or annotation ID
+    rejects the whole batch. Large batches (thousands of boxes) are loaded
+    with COPY.
+    """
+    result = service.write_annotations(dataset_id, batch.images, batch.mode)
+
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
+
+    return result
+
+
+@router.get("/datasets/{dataset_id}/annotations/search", response_model=AnnotationListResponse)
+def search_dataset_annotations(
+    filters: Annotated[AnnotationRegionQuery, Query()],
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    service: AnnotationService = Depends(get_annotation_service)
+):
+    """
+    Find boxes across the images of a dataset by region, area, aspect ratio
+    and label (e.g. every box under 16 px², or every box touching the first
+    256 px of its image), a page at a time
+    """
+    result = service.search_annotations(filters, dataset_id=dataset_id)
+
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
+
+    return result
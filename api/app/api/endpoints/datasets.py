@@ -1,13 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from typing import List, Optional
-from app.api.deps import get_dataset_service
+from app.api.deps import get_dataset_service, get_dataset_deletion_service
 from app.services.dataset_service import DatasetService
+from app.services.dataset_deletion_service import DatasetDeletionService
 from app.schema.dataset import (
     Dataset,
     DatasetCreate,
     DatasetUpdate,
     DatasetWithImages,
-    DatasetDetail
+    DatasetDetail,
+    DatasetDeletion
 )
 
 router = APIRouter(prefix="/datasets", tags=["datasets"])
@@ -34,17 +36,29 @@ def get_datasets(
     sort_by: str = Query(
         "id", description="Sort by: id, name, created_at, image_count"),
     sort_order: str = Query("desc", description="Sort order: asc, desc"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header of the previous page (skip is then ignored)"),
+    response: Response = None,
     service: DatasetService = Depends(get_dataset_service)
 ):
-    """Get all datasets with search, filtering and sorting"""
-    return service.get_datasets(
+    """
+    Get all datasets with search, filtering and sorting
+
+    The cursor of the next page, if any, is returned in the X-Next-Cursor header.
+    It is only valid with the sort_by and sort_order it was returned for.
+    """
+    result = service.get_datasets(
         skip=skip,
         limit=limit,
         search=search,
         label_name=label_name,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=cursor
     )
+    if result["next_cursor"]:
+        response.headers["X-Next-Cursor"] = result["next_cursor"]
+    return result["items"]
 
 
 @router.get("/{dataset_id}", response_model=DatasetDetail)
@@ -82,16 +96,41 @@ def update_dataset(
     return dataset
 
 
-@router.delete("/{dataset_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{dataset_id}", response_model=DatasetDeletion, status_code=status.HTTP_202_ACCEPTED)
 def delete_dataset(
     dataset_id: int,
-    service: DatasetService = Depends(get_dataset_service)
+    service: DatasetDeletionService = Depends(get_dataset_deletion_service)
 ):
-    """Delete a dataset"""
-    success = service.delete_dataset(dataset_id)
+    """
+    Delete a dataset asynchronously
 
-    if not success:
+    The dataset is hidden right away; its S3 objects, images and annotations
+    are then purged by a background job. Follow the progress with
+    GET /datasets/{dataset_id}/deletion (or GET /jobs/{job_id}).
+    """
+    deletion = service.start_deletion(dataset_id)
+
+    if not deletion:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Dataset not found"
         )
+
+    return deletion
+
+
+@router.get("/{dataset_id}/deletion", response_model=DatasetDeletion)
+def get_dataset_deletion(
+    dataset_id: int,
+    service: DatasetDeletionService = Depends(get_dataset_deletion_service)
+):
+    """Get the progress of the latest deletion of a dataset"""
+    deletion = service.get_deletion(dataset_id)
+
+    if not deletion:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset deletion not found"
+        )
+
+    return deletion
@@ -0,0 +1,49 @@
+import hmac
+
+from fastapi import APIRouter, Depends, HTTPException, Header, status
+from typing import Optional
+from urllib.parse import unquote_plus
+
+from app.api.deps import get_image_service
+from app.core.config import settings
+from app.services.image_service import ImageService
+from app.schema.event import S3EventNotification, S3EventAck
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+@router.post("/s3", response_model=S3EventAck)
+def s3_bucket_notification(
+    notification: S3EventNotification,
+    authorization: Optional[str] = Header(None),
+    service: ImageService = Depends(get_image_service)
+):
+    """
+    Webhook target for S3/MinIO bucket notifications
+
+    'ObjectCreated' records confirm the matching images (by s3_key) without
+    any client round trip or HEAD request. Other records are ignored.
+    If S3_WEBHOOK_TOKEN is set, the Authorization header must carry it.
+    """
+    # Constant-time comparison, so the token cannot be guessed from response times
+    token = (authorization or "").removeprefix("Bearer ")
+    if settings.S3_WEBHOOK_TOKEN and not hmac.compare_digest(
+        token.encode(), settings.S3_WEBHOOK_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid webhook token"
+        )
+
+    # Object keys are URL-encoded in notification records
+    created_objects = [
+        (unquote_plus(record.s3.object.key), record.s3.object.size)
+        for record in notification.records
+        if "ObjectCreated" in record.event_name
+        and record.s3.bucket.name == settings.MINIO_BUCKET
+    ]
+
+    confirmed_count = service.confirm_uploads_from_events(
+        created_objects) if created_objects else 0
+
+    return S3EventAck(received=len(created_objects), confirmed_count=confirmed_count)
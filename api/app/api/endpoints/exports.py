@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response, status
+from fastapi.responses import StreamingResponse
+
+from app.api.deps import get_export_service, get_job_service
+from app.services.export_service import EXPORT_FILES, ExportService, stream_export
+from app.services.job_service import JobService
+from app.schema.export import ExportFormat
+from app.schema.job import Job
+
+router = APIRouter(tags=["exports"])
+
+
+@router.get("/datasets/{dataset_id}/export", responses={202: {"model": Job}})
+def export_dataset(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    format: ExportFormat = Query(ExportFormat.COCO, description="Export format"),
+    background: bool = Query(
+        False, description="Write the export to S3 in a background job and return the job (202)"),
+    response: Response = None,
+    service: ExportService = Depends(get_export_service),
+    jobs: JobService = Depends(get_job_service)
+):
+    """
+    Export the annotations of a dataset for training
+
+    - coco: one COCO JSON file (bbox as [x, y, width, height], categories are the dataset labels)
+    - yolo: ZIP with classes.txt, data.yaml and labels/{image}.txt (normalized boxes)
+    - voc: ZIP with Annotations/{image}.xml (Pascal VOC)
+
+    Image files are named after the last part of their S3 key. The export is
+    streamed as it is read from the database, whatever the dataset size.
+    With background=true it is written to S3 by a job worker instead; the
+    job result holds a download URL (GET /jobs/{job_id}).
+    """
+    if service.get_dataset(dataset_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
+
+    if background:
+        response.status_code = 202
+        return Job.model_validate(jobs.submit(
+            "dataset.export", {"dataset_id": dataset_id, "format": format.value}))
+
+    return StreamingResponse(
+        stream_export(dataset_id, format),
+        media_type=EXPORT_FILES[format][1],
+        headers={"Content-Disposition":
+                 f'attachment; filename="{service.export_filename(dataset_id, format)}"'}
+    )
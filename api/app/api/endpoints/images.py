@@ -1,9 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, Query, Path, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from app.api.deps import get_db, get_image_service
+from app.api.deps import get_db, get_image_service, get_job_service
 from app.services.image_service import ImageService
+from app.services.job_service import JobService
+from app.schema.job import Job
 from app.model.image import ImageStatus
 from app.schema.image import (
     Image,
@@ -11,6 +13,8 @@ from app.schema.image import (
     ImageUploadBatchRequest,
     ImageUploadBatchResponse,
     ImageUploadResponse,
+    ImageUploadRequest,
+    ImageMultipartUploadResponse,
     ImageConfirmUploadRequest,
     ImageWithDownloadUrl,
     ImageListResponse,
@@ -33,29 +37,76 @@ def prepare_upload(
     1. Creates image records in DB with 'uploading' status
     2. Generates presigned URLs for direct upload to S3
     3. Returns upload URLs that expire in 1 hour
+
+    Files sent with their sha256 are not uploaded again if the dataset
+    already has the same content, or copied from another dataset that has
+    it by a background job (copy_job_id); they are listed in 'deduplicated'.
     """
-    uploads = service.prepare_upload(dataset_id, request.files)
+    if not service.dataset_accepts_uploads(dataset_id):
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    result = service.prepare_upload(dataset_id, request.files)
 
-    if not uploads:
+    if not result["uploads"] and not result["deduplicated"]:
         raise HTTPException(
             status_code=500, detail="Failed to prepare uploads")
 
-    return ImageUploadBatchResponse(uploads=uploads)
+    return ImageUploadBatchResponse(**result)
+
+
+@router.post("/datasets/{dataset_id}/images/prepare-multipart-upload", response_model=ImageMultipartUploadResponse)
+def prepare_multipart_upload(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    request: ImageUploadRequest = ...,
+    service: ImageService = Depends(get_image_service)
+):
+    """
+    Prepare a multipart upload for a large image
+
+    This endpoint:
+    1. Starts a multipart upload in S3
+    2. Creates the image record in DB with 'uploading' status
+    3. Returns presigned URLs for every part, to be uploaded in parallel
+
+    Once all parts are uploaded, call confirm-upload to complete the upload.
+    """
+    if not service.dataset_accepts_uploads(dataset_id):
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    session = service.prepare_multipart_upload(dataset_id, request)
+
+    if not session:
+        raise HTTPException(
+            status_code=500, detail="Failed to prepare multipart upload")
+
+    return session
 
 
 @router.post("/datasets/{dataset_id}/images/confirm-upload")
 def confirm_upload(
     dataset_id: int = Path(..., gt=0, description="Dataset ID"),
     request: ImageConfirmUploadRequest = ...,
-    service: ImageService = Depends(get_image_service)
+    background: bool = Query(
+        False, description="Run as a background job and return the job (202)"),
+    response: Response = None,
+    service: ImageService = Depends(get_image_service),
+    jobs: JobService = Depends(get_job_service)
 ):
     """
     Confirm successful uploads
 
     Updates image status from 'uploading' to 'uploaded' after verifying
-    that files exist in S3.
+    that files exist in S3 (HEAD requests run concurrently, see
+    S3_MAX_CONCURRENCY). With background=true the confirmation runs in a
+    job worker; follow it with GET /jobs/{job_id}.
     """
-    updated_count = service.confirm_upload(request.image_ids)
+    if background:
+        response.status_code = 202
+        return Job.model_validate(jobs.submit(
+            "images.confirm_upload",
+            {"image_ids": request.image_ids, "dataset_id": dataset_id}))
+
+    updated_count = service.confirm_upload(request.image_ids, dataset_id)
 
     return {
         "message": f"Successfully confirmed {updated_count} uploads",
@@ -72,14 +123,19 @@ def get_dataset_images(
                        description="Max number of records to return"),
     status: Optional[ImageStatus] = Query(
         None, description="Filter by status"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from next_cursor of the previous page (skip is then ignored)"),
+    split: Optional[str] = Query(None, description="Filter by training split"),
     service: ImageService = Depends(get_image_service)
 ):
     """
     Get all images for a specific dataset (without download URLs)
 
-    Returns paginated list with total count for pagination.
+    Returns paginated list with total count for pagination. Use next_cursor
+    to fetch the following page at constant cost.
     """
-    return service.get_images(skip=skip, limit=limit, dataset_id=dataset_id, status=status)
+    return service.get_images(skip=skip, limit=limit, dataset_id=dataset_id, status=status,
+                              cursor=cursor, split=split)
 
 
 @router.get("/datasets/{dataset_id}/images/with-urls", response_model=ImageWithUrlListResponse)
@@ -92,6 +148,9 @@ def get_dataset_images_with_urls(
         None, description="Filter by status"),
     expires_in: int = Query(3600, ge=60, le=604800,
                             description="URL expiration in seconds (default: 1h, max: 7 days)"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from next_cursor of the previous page (skip is then ignored)"),
+    split: Optional[str] = Query(None, description="Filter by training split"),
     service: ImageService = Depends(get_image_service)
 ):
     """
@@ -106,7 +165,9 @@ def get_dataset_images_with_urls(
         limit=limit,
         dataset_id=dataset_id,
         status=status,
-        expires_in=expires_in
+        expires_in=expires_in,
+        cursor=cursor,
+        split=split
     )
 
 
@@ -122,6 +183,37 @@ def get_image(
     return db_image
 
 
+@router.get("/images/{image_id}/multipart-upload", response_model=ImageMultipartUploadResponse)
+def get_multipart_upload(
+    image_id: int = Path(..., gt=0, description="Image ID"),
+    service: ImageService = Depends(get_image_service)
+):
+    """
+    Resume a multipart upload
+
+    Lists the parts already stored in S3 and returns fresh presigned URLs
+    for the missing ones only.
+    """
+    session = service.get_multipart_upload(image_id)
+    if not session:
+        raise HTTPException(
+            status_code=404, detail="No multipart upload in progress for this image")
+    return session
+
+
+@router.delete("/images/{image_id}/multipart-upload")
+def abort_multipart_upload(
+    image_id: int = Path(..., gt=0, description="Image ID"),
+    service: ImageService = Depends(get_image_service)
+):
+    """Abort a multipart upload in progress (the image is marked as error)"""
+    success = service.abort_multipart_upload(image_id)
+    if not success:
+        raise HTTPException(
+            status_code=404, detail="No multipart upload in progress for this image")
+    return {"message": "Multipart upload aborted successfully"}
+
+
 @router.get("/images/{image_id}/download-url")
 def get_download_url(
     image_id: int = Path(..., gt=0, description="Image ID"),
@@ -176,7 +268,11 @@ def delete_image(
 @router.delete("/datasets/{dataset_id}/images")
 def delete_all_dataset_images(
     dataset_id: int = Path(..., gt=0, description="Dataset ID"),
-    service: ImageService = Depends(get_image_service)
+    background: bool = Query(
+        False, description="Run as a background job and return the job (202)"),
+    response: Response = None,
+    service: ImageService = Depends(get_image_service),
+    jobs: JobService = Depends(get_job_service)
 ):
     """
     Delete ALL images for a specific dataset
@@ -184,7 +280,13 @@ def delete_all_dataset_images(
     ⚠️ WARNING: This will permanently delete all images from both DB and S3.
     This operation cannot be undone!
 
-    Returns statistics about the deletion operation.
+    Returns statistics about the deletion operation, or with background=true
+    the job running it (its result holds the statistics).
     """
+    if background:
+        response.status_code = 202
+        return Job.model_validate(jobs.submit(
+            "dataset.purge_images", {"dataset_id": dataset_id}))
+
     result = service.delete_all_dataset_images(dataset_id)
     return result
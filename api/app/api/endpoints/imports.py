@@ -0,0 +1,56 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, status
+
+from app.api.deps import get_import_service
+from app.services.import_service import ImportService
+from app.schema.coco_import import CocoImportRequest, CocoImportUploadUrl
+from app.schema.job import Job
+
+router = APIRouter(tags=["imports"])
+
+
+@router.post("/datasets/{dataset_id}/imports/coco/upload-url", response_model=CocoImportUploadUrl)
+def prepare_coco_upload(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    service: ImportService = Depends(get_import_service)
+):
+    """
+    Get a presigned URL to upload a COCO annotation file
+
+    PUT the file to upload_url, then start the import with its s3_key.
+    """
+    result = service.prepare_coco_upload(dataset_id)
+    if result is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
+    return CocoImportUploadUrl(**result)
+
+
+@router.post("/datasets/{dataset_id}/imports/coco", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+def import_coco(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    request: CocoImportRequest = ...,
+    service: ImportService = Depends(get_import_service)
+):
+    """
+    Import a COCO annotation file into a dataset, in a background job
+
+    Each COCO image becomes an image of the dataset whose S3 key is
+    image_prefix + file_name (the files are expected to be there already,
+    e.g. copied with the S3 tools), categories become labels (matched by
+    name) and bboxes become annotations, rounded to pixels. The file is
+    streamed, so its size is not limited by memory.
+
+    Images whose key already exists are skipped, so an import can be run
+    again safely. Imported images are 'uploading' until a follow-up job
+    finds their file in S3. Progress and the counts are in the job
+    (GET /jobs/{job_id}).
+    """
+    job = service.submit_coco_import(dataset_id, request.annotations_key, request.image_prefix)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
+    return Job.model_validate(job)
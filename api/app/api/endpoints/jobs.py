@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, status
+
+from app.api.deps import get_job_service
+from app.services.job_service import JobService
+from app.schema.job import Job
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}", response_model=Job)
+def get_job(
+    job_id: int = Path(..., gt=0, description="Job ID"),
+    service: JobService = Depends(get_job_service)
+):
+    """Get the status, progress and result of a background job"""
+    job = service.get_job(job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    return job
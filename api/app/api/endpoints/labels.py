@@ -26,10 +26,12 @@ def get_labels(
     limit: int = Query(100, ge=1, le=1000,
                        description="Number of labels to return"),
     search: Optional[str] = Query(None, description="Search in label name"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from next_cursor of the previous page (skip is then ignored)"),
     service: LabelService = Depends(get_label_service)
 ):
     """Get all labels with search and total count"""
-    return service.get_labels(skip=skip, limit=limit, search=search)
+    return service.get_labels(skip=skip, limit=limit, search=search, cursor=cursor)
 
 
 @router.delete("/{label_id}", status_code=status.HTTP_204_NO_CONTENT)
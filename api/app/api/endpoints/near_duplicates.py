@@ -0,0 +1,90 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from typing import List
+
+from app.api.deps import get_near_duplicate_service
+from app.services.near_duplicate_service import NearDuplicateService
+from app.schema.job import Job
+from app.schema.near_duplicate import NearDuplicate, NearDuplicateGroupListResponse
+
+router = APIRouter(tags=["near-duplicates"])
+
+
+@router.post("/datasets/{dataset_id}/near-duplicates", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+def compute_dataset_near_duplicates(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    max_distance: int = Query(4, ge=0, le=10,
+                              description="Max Hamming distance between the perceptual hashes of two images"),
+    service: NearDuplicateService = Depends(get_near_duplicate_service)
+):
+    """
+    Compute the groups of near-duplicate images of a dataset, in a background job
+
+    The groups are stored and listed with GET
+    /datasets/{dataset_id}/near-duplicates for the same max_distance. Nothing
+    is computed again while the dataset has not changed. Counts are in the
+    job result (GET /jobs/{job_id}).
+    """
+    job = service.submit_groups(dataset_id, max_distance)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
+    return Job.model_validate(job)
+
+
+@router.get("/datasets/{dataset_id}/near-duplicates", response_model=NearDuplicateGroupListResponse)
+def get_dataset_near_duplicates(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    max_distance: int = Query(4, ge=0, le=10,
+                              description="Max Hamming distance between the perceptual hashes of two images"),
+    skip: int = Query(0, ge=0, description="Number of groups to skip"),
+    limit: int = Query(100, ge=1, le=1000,
+                       description="Max number of groups to return"),
+    service: NearDuplicateService = Depends(get_near_duplicate_service)
+):
+    """
+    Get the groups of near-duplicate images of a dataset (resized or
+    re-encoded copies, burst shots...), largest first
+
+    Images are linked when their perceptual hashes are within max_distance,
+    and groups are the connected images. Only images whose thumbnail has been
+    generated have a hash. Groups are computed by POST
+    /datasets/{dataset_id}/near-duplicates and only read here: the list is
+    empty with a null computed_at until then, and up_to_date turns false
+    when images change afterwards.
+    """
+    groups = service.find_groups(dataset_id, max_distance, skip=skip, limit=limit)
+
+    if groups is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
+
+    return groups
+
+
+@router.get("/images/{image_id}/near-duplicates", response_model=List[NearDuplicate])
+def get_image_near_duplicates(
+    image_id: int = Path(..., gt=0, description="Image ID"),
+    max_distance: int = Query(4, ge=0, le=10,
+                              description="Max Hamming distance between the perceptual hashes"),
+    limit: int = Query(100, ge=1, le=1000,
+                       description="Max number of images to return"),
+    service: NearDuplicateService = Depends(get_near_duplicate_service)
+):
+    """
+    Get the images of the same dataset that look like an image, closest first
+
+    Empty while the image has no perceptual hash (thumbnail not generated yet).
+    """
+    matches = service.find_similar(image_id, max_distance, limit=limit)
+
+    if matches is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Image not found"
+        )
+
+    return matches
@@ -0,0 +1,52 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+
+from app.api.deps import get_job_service, get_snapshot_service
+from app.services.job_service import JobService
+from app.services.snapshot_service import SnapshotService
+from app.schema.job import Job
+from app.schema.snapshot import Snapshot, SnapshotFormat
+
+router = APIRouter(tags=["snapshots"])
+
+
+@router.post("/datasets/{dataset_id}/snapshots", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+def create_snapshot(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    format: SnapshotFormat = Query(SnapshotFormat.ARROW, description="File format of the parts"),
+    service: SnapshotService = Depends(get_snapshot_service),
+    jobs: JobService = Depends(get_job_service)
+):
+    """
+    Bring the columnar snapshot of a dataset up to date, in a background job
+
+    A snapshot holds one row per uploaded image (image_id, s3_key, width,
+    height, split, label_ids, boxes as [xmin, ymin, xmax, ymax]) divided into part
+    files by image ID range. Only the parts whose images or boxes changed
+    since the last snapshot are written again.
+
+    - arrow: uncompressed Arrow IPC files, to memory-map in data loaders
+    - parquet: zstd-compressed Parquet files
+    """
+    if service.get_dataset(dataset_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
+    return Job.model_validate(jobs.submit(
+        "dataset.snapshot", {"dataset_id": dataset_id, "format": format.value}))
+
+
+@router.get("/datasets/{dataset_id}/snapshots/{format}", response_model=Snapshot)
+def get_snapshot(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    format: SnapshotFormat = Path(..., description="File format of the parts"),
+    service: SnapshotService = Depends(get_snapshot_service)
+):
+    """Get the latest snapshot of a dataset, with download URLs for its parts"""
+    snapshot = service.get_snapshot(dataset_id, format)
+    if snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Snapshot not found"
+        )
+    return Snapshot(**snapshot)
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, status
+
+from app.api.deps import get_split_service
+from app.services.split_service import SplitService
+from app.schema.job import Job
+from app.schema.split import SplitRequest, SplitSummary
+
+router = APIRouter(tags=["splits"])
+
+
+@router.post("/datasets/{dataset_id}/splits", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+def assign_splits(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    request: SplitRequest = ...,
+    service: SplitService = Depends(get_split_service)
+):
+    """
+    Assign the uploaded images of a dataset to named splits, in a background job
+
+    Splits get their share of the images of every label (stratified on
+    the rarest label of each image). The same seed on the same data gives
+    the same splits. With group_by, images with the same content hash, or
+    near-duplicates, always land in the same split. The split of the
+    other images is cleared. Counts are in the job result
+    (GET /jobs/{job_id}); images are listed with
+    GET /datasets/{dataset_id}/images?split=...
+    """
+    job = service.submit_split(dataset_id, request)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
+    return Job.model_validate(job)
+
+
+@router.get("/datasets/{dataset_id}/splits", response_model=SplitSummary)
+def get_splits(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    service: SplitService = Depends(get_split_service)
+):
+    """Get the images, annotations and annotations per label of each split of a dataset"""
+    summary = service.get_summary(dataset_id)
+    if summary is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
+    return summary
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, status
+
+from app.api.deps import get_stats_service
+from app.services.stats_service import StatsService
+from app.schema.stats import DatasetStats
+
+router = APIRouter(tags=["stats"])
+
+
+@router.get("/datasets/{dataset_id}/stats", response_model=DatasetStats)
+def get_dataset_stats(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    service: StatsService = Depends(get_stats_service)
+):
+    """
+    Get the annotation statistics of a dataset, to check it before training
+
+    Class histogram (annotations and images per label), images without
+    annotation, and the distributions (quantiles and histogram) of boxes
+    per image, box area, box area relative to the image and aspect ratio.
+    Only uploaded images count. Statistics are computed once per change
+    of the dataset and then served from memory.
+    """
+    stats = service.get_stats(dataset_id)
+
+    if stats is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
+
+    return stats
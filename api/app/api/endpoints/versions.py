@@ -0,0 +1,195 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from typing import List, Optional
+
+from app.api.deps import get_job_service, get_version_service
+from app.services.job_service import JobService
+from app.services.version_service import VersionService
+from app.schema.dataset_version import (
+    DatasetVersion,
+    DatasetVersionCreate,
+    VersionAnnotationDiff,
+    VersionAnnotationListResponse,
+    VersionDiffSummary,
+    VersionedKind,
+    VersionImageDiff,
+    VersionImageListResponse,
+    VersionLabelDiff,
+    VersionLabelListResponse,
+)
+from app.schema.job import Job
+
+router = APIRouter(tags=["versions"])
+
+
+def _version_not_found():
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Version not found"
+    )
+
+
+@router.post("/datasets/{dataset_id}/versions", response_model=Job, status_code=status.HTTP_202_ACCEPTED)
+def create_version(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    request: DatasetVersionCreate = ...,
+    service: VersionService = Depends(get_version_service),
+    jobs: JobService = Depends(get_job_service)
+):
+    """
+    Record the current state of a dataset as a new immutable version, in a
+    background job
+
+    A version holds the uploaded images, the labels of the dataset and the
+    annotations of those images. Only what changed since the previous
+    version is stored. The job result holds the version number
+    (GET /jobs/{job_id}).
+    """
+    if service.get_dataset(dataset_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
+    return Job.model_validate(jobs.submit(
+        "dataset.version", {"dataset_id": dataset_id, "message": request.message}))
+
+
+@router.get("/datasets/{dataset_id}/versions", response_model=List[DatasetVersion])
+def get_versions(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    service: VersionService = Depends(get_version_service)
+):
+    """List the versions of a dataset, newest first"""
+    versions = service.get_versions(dataset_id)
+    if versions is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Dataset not found"
+        )
+    return versions
+
+
+@router.get("/datasets/{dataset_id}/versions/{number}", response_model=DatasetVersion)
+def get_version(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    number: int = Path(..., gt=0, description="Version number"),
+    service: VersionService = Depends(get_version_service)
+):
+    """Get a version of a dataset"""
+    version = service.get_version(dataset_id, number)
+    if version is None:
+        raise _version_not_found()
+    return version
+
+
+def _get_rows(service: VersionService, dataset_id: int, number: int, kind: VersionedKind,
+              limit: int, cursor: Optional[str]) -> dict:
+    result = service.get_rows(dataset_id, number, kind, limit=limit, cursor=cursor)
+    if result is None:
+        raise _version_not_found()
+    return result
+
+
+@router.get("/datasets/{dataset_id}/versions/{number}/images", response_model=VersionImageListResponse)
+def get_version_images(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    number: int = Path(..., gt=0, description="Version number"),
+    limit: int = Query(100, ge=1, le=1000, description="Max number of records to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from next_cursor of the previous page"),
+    service: VersionService = Depends(get_version_service)
+):
+    """List the images of a version, by ID"""
+    return _get_rows(service, dataset_id, number, VersionedKind.IMAGES, limit, cursor)
+
+
+@router.get("/datasets/{dataset_id}/versions/{number}/labels", response_model=VersionLabelListResponse)
+def get_version_labels(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    number: int = Path(..., gt=0, description="Version number"),
+    limit: int = Query(100, ge=1, le=1000, description="Max number of records to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from next_cursor of the previous page"),
+    service: VersionService = Depends(get_version_service)
+):
+    """List the labels of a version, by ID"""
+    return _get_rows(service, dataset_id, number, VersionedKind.LABELS, limit, cursor)
+
+
+@router.get("/datasets/{dataset_id}/versions/{number}/annotations", response_model=VersionAnnotationListResponse)
+def get_version_annotations(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    number: int = Path(..., gt=0, description="Version number"),
+    limit: int = Query(100, ge=1, le=1000, description="Max number of records to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from next_cursor of the previous page"),
+    service: VersionService = Depends(get_version_service)
+):
+    """List the annotations of a version, by ID"""
+    return _get_rows(service, dataset_id, number, VersionedKind.ANNOTATIONS, limit, cursor)
+
+
+@router.get("/datasets/{dataset_id}/versions/{from_number}/diff/{to_number}", response_model=VersionDiffSummary)
+def get_version_diff(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    from_number: int = Path(..., gt=0, description="Source version number"),
+    to_number: int = Path(..., gt=0, description="Target version number"),
+    service: VersionService = Depends(get_version_service)
+):
+    """
+    Count the images, labels and annotations added, removed and modified
+    from one version to another
+
+    Either version may be the older one. Only the changes between the two
+    versions are read, whatever the dataset size.
+    """
+    summary = service.get_diff_summary(dataset_id, from_number, to_number)
+    if summary is None:
+        raise _version_not_found()
+    return summary
+
+
+def _get_diff(service: VersionService, dataset_id: int, from_number: int, to_number: int,
+              kind: VersionedKind, limit: int, cursor: Optional[str]) -> dict:
+    result = service.get_diff(dataset_id, from_number, to_number, kind, limit=limit, cursor=cursor)
+    if result is None:
+        raise _version_not_found()
+    return result
+
+
+@router.get("/datasets/{dataset_id}/versions/{from_number}/diff/{to_number}/images",
+            response_model=VersionImageDiff)
+def get_version_image_diff(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    from_number: int = Path(..., gt=0, description="Source version number"),
+    to_number: int = Path(..., gt=0, description="Target version number"),
+    limit: int = Query(100, ge=1, le=1000, description="Max number of records to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from next_cursor of the previous page"),
+    service: VersionService = Depends(get_version_service)
+):
+    """List the images that differ between two versions, with their state in each"""
+    return _get_diff(service, dataset_id, from_number, to_number, VersionedKind.IMAGES, limit, cursor)
+
+
+@router.get("/datasets/{dataset_id}/versions/{from_number}/diff/{to_number}/labels",
+            response_model=VersionLabelDiff)
+def get_version_label_diff(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    from_number: int = Path(..., gt=0, description="Source version number"),
+    to_number: int = Path(..., gt=0, description="Target version number"),
+    limit: int = Query(100, ge=1, le=1000, description="Max number of records to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from next_cursor of the previous page"),
+    service: VersionService = Depends(get_version_service)
+):
+    """List the labels that differ between two versions, with their state in each"""
+    return _get_diff(service, dataset_id, from_number, to_number, VersionedKind.LABELS, limit, cursor)
+
+
+@router.get("/datasets/{dataset_id}/versions/{from_number}/diff/{to_number}/annotations",
+            response_model=VersionAnnotationDiff)
+def get_version_annotation_diff(
+    dataset_id: int = Path(..., gt=0, description="Dataset ID"),
+    from_number: int = Path(..., gt=0, description="Source version number"),
+    to_number: int = Path(..., gt=0, description="Target version number"),
+    limit: int = Query(100, ge=1, le=1000, description="Max number of records to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from next_cursor of the previous page"),
+    service: VersionService = Depends(get_version_service)
+):
+    """List the annotations that differ between two versions, with their state in each"""
+    return _get_diff(service, dataset_id, from_number, to_number, VersionedKind.ANNOTATIONS, limit, cursor)
@@ -3,6 +3,16 @@ from app.api.endpoints.health import router as health_router
 from app.api.endpoints.datasets import router as datasets_router
 from app.api.endpoints.labels import router as labels_router
 from app.api.endpoints.images import router as images_router
+from app.api.endpoints.events import router as events_router
+from app.api.endpoints.jobs import router as jobs_router
+from app.api.endpoints.near_duplicates import router as near_duplicates_router
+from app.api.endpoints.annotations import router as annotations_router
+from app.api.endpoints.exports import router as exports_router
+from app.api.endpoints.imports import router as imports_router
+from app.api.endpoints.stats import router as stats_router
+from app.api.endpoints.snapshots import router as snapshots_router
+from app.api.endpoints.versions import router as versions_router
+from app.api.endpoints.splits import router as splits_router
 
 # Router principal sans versioning
 api_router = APIRouter()
@@ -18,3 +28,33 @@ api_router.include_router(labels_router)
 
 # Include image endpoints
 api_router.include_router(images_router)
+
+# Include S3 event endpoints
+api_router.include_router(events_router)
+
+# Include background job endpoints
+api_router.include_router(jobs_router)
+
+# Include near-duplicate endpoints
+api_router.include_router(near_duplicates_router)
+
+# Include annotation endpoints
+api_router.include_router(annotations_router)
+
+# Include export endpoints
+api_router.include_router(exports_router)
+
+# Include import endpoints
+api_router.include_router(imports_router)
+
+# Include statistics endpoints
+api_router.include_router(stats_router)
+
+# Include snapshot endpoints
+api_router.include_router(snapshots_router)
+
+# Include dataset version endpoints
+api_router.include_router(versions_router)
+
+# Include split endpoints
+api_router.include_router(splits_router)
@@ -0,0 +1,5 @@
+"""
+Maintenance commands for LabelLoop API.
+
+Run them with `python -m app.commands.<command>`.
+"""
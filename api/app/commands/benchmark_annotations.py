@@ -0,0 +1,100 @@
+"""
+Measure the throughput of batch annotation writes, in boxes per second.
+
+Usage: python -m app.commands.benchmark_annotations [images] [boxes_per_image]
+Creates a temporary dataset of fake images (no S3 object) and one label,
+writes every box with a multi-row INSERT, then with COPY, then updates every
+box, and deletes everything it created. Defaults: 1000 images, 20 boxes.
+"""
+import random
+import sys
+import time
+import uuid
+
+from sqlalchemy import delete, insert, select
+
+from app.core.database import SessionLocal
+from app.model.annotation import Annotation
+from app.model.dataset import Dataset, dataset_labels
+from app.model.image import Image, ImageStatus
+from app.model.label import Label
+from app.schema.annotation import AnnotationBatchItem, AnnotationBox, AnnotationWriteMode
+from app.services import annotation_service
+from app.services.annotation_service import AnnotationService
+
+
+def random_box(label_id: int, annotation_id: int = None) -> AnnotationBox:
+    x, y = random.randint(0, 4000), random.randint(0, 3000)
+    return AnnotationBox(id=annotation_id, label_id=label_id, bbox_xmin=x, bbox_ymin=y,
+                         bbox_xmax=x + random.randint(1, 500), bbox_ymax=y + random.randint(1, 500))
+
+
+def run(service: AnnotationService, name: str, dataset_id: int, items: list, mode: AnnotationWriteMode) -> None:
+    boxes = sum(len(item.annotations) for item in items)
+    start = time.perf_counter()
+    result = service.write_annotations(dataset_id, items, mode)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<16} {boxes:>9} boxes in {elapsed:7.2f}s: {boxes / elapsed:>10.0f} boxes/s {result}")
+
+
+def main(argv: list[str]) -> None:
+    image_count = int(argv[0]) if argv else 1000
+    boxes_per_image = int(argv[1]) if len(argv) > 1 else 20
+    tag = uuid.uuid4().hex[:8]
+
+    db = SessionLocal()
+    dataset = Dataset(name=f"benchmark-annotations-{tag}")
+    label = Label(name=f"benchmark-annotations-{tag}")
+    db.add_all([dataset, label])
+    db.commit()
+    try:
+        db.execute(insert(Image), [{
+            "filename": f"{i}.jpg",
+            "s3_key": f"benchmark/{tag}/{i}.jpg",
+            "file_size": 0,
+            "mime_type": "image/jpeg",
+            "status": ImageStatus.UPLOADED,
+            "dataset_id": dataset.id
+        } for i in range(image_count)])
+        db.commit()
+        image_ids = db.execute(
+            select(Image.id).where(Image.dataset_id == dataset.id).order_by(Image.id)).scalars().all()
+
+        def new_items():
+            return [AnnotationBatchItem(image_id=image_id,
+                                        annotations=[random_box(label.id) for _ in range(boxes_per_image)])
+                    for image_id in image_ids]
+
+        service = AnnotationService(db)
+        threshold = annotation_service.ANNOTATION_COPY_THRESHOLD
+        try:
+            annotation_service.ANNOTATION_COPY_THRESHOLD = float("inf")
+            run(service, "replace (INSERT)", dataset.id, new_items(), AnnotationWriteMode.REPLACE)
+            annotation_service.ANNOTATION_COPY_THRESHOLD = 0
+            run(service, "replace (COPY)", dataset.id, new_items(), AnnotationWriteMode.REPLACE)
+        finally:
+            annotation_service.ANNOTATION_COPY_THRESHOLD = threshold
+
+        existing = {}
+        for annotation_id, image_id in db.execute(
+                select(Annotation.id, Annotation.image_id)
+                .where(Annotation.image_id.in_(image_ids))):
+            existing.setdefault(image_id, []).append(annotation_id)
+        run(service, "upsert (UPDATE)", dataset.id,
+            [AnnotationBatchItem(image_id=image_id,
+                                 annotations=[random_box(label.id, annotation_id) for annotation_id in ids])
+             for image_id, ids in existing.items()],
+            AnnotationWriteMode.UPSERT)
+    finally:
+        db.rollback()
+        db.execute(delete(Annotation).where(Annotation.label_id == label.id))
+        db.execute(delete(Image).where(Image.dataset_id == dataset.id))
+        db.execute(delete(dataset_labels).where(dataset_labels.c.dataset_id == dataset.id))
+        db.execute(delete(Dataset).where(Dataset.id == dataset.id))
+        db.execute(delete(Label).where(Label.id == label.id))
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,92 @@
+"""
+Measure the throughput of upload preparation, in files per second.
+
+Usage: python -m app.commands.benchmark_prepare_upload [files] [batch_size]
+Creates a temporary dataset, then prepares the same number of files with
+ImageService.prepare_upload (one INSERT, one presigning pass and one commit
+per batch) and with the per-row path it replaced (add, commit and refresh
+of every record, then a botocore presigned URL rewritten to the public
+endpoint), and deletes everything it created. Nothing is uploaded: only
+the records and the URLs are measured. Defaults: 1000 files, batches of 500.
+"""
+import sys
+import time
+import uuid
+from urllib.parse import urlparse, urlunparse
+
+from sqlalchemy import delete
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.s3 import s3_client
+from app.model.dataset import Dataset
+from app.model.image import Image, ImageStatus
+from app.schema.image import ImageUploadRequest
+from app.services.image_service import ImageService
+
+
+def prepare_per_row(service: ImageService, dataset_id: int, files: list[ImageUploadRequest]) -> list[dict]:
+    """The per-row preparation prepare_upload replaced, as a baseline"""
+    public_base = urlparse(settings.s3_public_endpoint_url) if settings.s3_public_endpoint_url else None
+    uploads = []
+    for file_info in files:
+        s3_key = service.generate_s3_key(dataset_id, file_info.filename)
+        image = Image(
+            filename=file_info.filename,
+            s3_key=s3_key,
+            file_size=file_info.file_size,
+            mime_type=file_info.mime_type,
+            status=ImageStatus.UPLOADING,
+            dataset_id=dataset_id
+        )
+        service.db.add(image)
+        service.db.commit()
+        service.db.refresh(image)
+
+        upload_url = s3_client.client.generate_presigned_url(
+            'put_object',
+            Params={'Bucket': settings.MINIO_BUCKET, 'Key': s3_key, 'ContentType': file_info.mime_type},
+            ExpiresIn=settings.PRESIGNED_UPLOAD_EXPIRES_IN,
+            HttpMethod='PUT'
+        )
+        if public_base:
+            upload_url = urlunparse(urlparse(upload_url)._replace(
+                scheme=public_base.scheme, netloc=public_base.netloc))
+        uploads.append({"image_id": image.id, "upload_url": upload_url, "s3_key": s3_key})
+    return uploads
+
+
+def run(name: str, prepare, files: list[ImageUploadRequest], batch_size: int) -> None:
+    start = time.perf_counter()
+    prepared = 0
+    for offset in range(0, len(files), batch_size):
+        prepared += len(prepare(files[offset:offset + batch_size]))
+    elapsed = time.perf_counter() - start
+    print(f"{name:<20} {prepared:>7} files in {elapsed:7.2f}s: {prepared / elapsed:>9.0f} files/s")
+
+
+def main(argv: list[str]) -> None:
+    file_count = int(argv[0]) if argv else 1000
+    batch_size = int(argv[1]) if len(argv) > 1 else 500
+    tag = uuid.uuid4().hex[:8]
+
+    db = SessionLocal()
+    dataset = Dataset(name=f"benchmark-prepare-upload-{tag}")
+    db.add(dataset)
+    db.commit()
+    try:
+        files = [ImageUploadRequest(filename=f"{tag}_{i}.jpg", file_size=1024 + i, mime_type="image/jpeg")
+                 for i in range(file_count)]
+        service = ImageService(db)
+        run("per row", lambda batch: prepare_per_row(service, dataset.id, batch), files, batch_size)
+        run("bulk", lambda batch: service.prepare_upload(dataset.id, batch)["uploads"], files, batch_size)
+    finally:
+        db.rollback()
+        db.execute(delete(Image).where(Image.dataset_id == dataset.id))
+        db.execute(delete(Dataset).where(Dataset.id == dataset.id))
+        db.commit()
+        db.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
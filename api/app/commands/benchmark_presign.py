@@ -0,0 +1,70 @@
+"""
+Measure the throughput of URL presigning, in URLs per second.
+
+Usage: python -m app.commands.benchmark_presign [urls]
+Signs the same keys for upload (PUT with Content-Type), download (GET) and
+multipart parts with the local SigV4Presigner batch path, and with the
+per-key botocore generate_presigned_url path it replaced, whose URLs were
+then rewritten to the public endpoint with urlparse. Only signing is
+measured: no request is sent. Default: 10000 URLs.
+"""
+import sys
+import time
+import uuid
+from urllib.parse import urlparse, urlunparse
+
+from app.core.config import settings
+from app.core.s3 import s3_client
+
+
+def botocore_urls(operation: str, s3_keys: list[str], params: dict, method: str) -> list[str]:
+    """The per-key botocore presigning path, as a baseline"""
+    public_base = urlparse(settings.s3_public_endpoint_url) if settings.s3_public_endpoint_url else None
+    urls = []
+    for s3_key in s3_keys:
+        url = s3_client.client.generate_presigned_url(
+            operation,
+            Params={'Bucket': settings.MINIO_BUCKET, 'Key': s3_key, **params},
+            ExpiresIn=3600,
+            HttpMethod=method
+        )
+        if public_base:
+            url = urlunparse(urlparse(url)._replace(scheme=public_base.scheme, netloc=public_base.netloc))
+        urls.append(url)
+    return urls
+
+
+def run(name: str, sign) -> float:
+    start = time.perf_counter()
+    count = len(sign())
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed
+    print(f"{name:<26} {count:>7} URLs in {elapsed:7.3f}s: {rate:>10.0f} URLs/s")
+    return rate
+
+
+def main(argv: list[str]) -> None:
+    url_count = int(argv[0]) if argv else 10000
+    tag = uuid.uuid4().hex[:8]
+    s3_keys = [f"datasets/0/images/{tag}_{i}.jpg" for i in range(url_count)]
+    part_numbers = list(range(1, url_count + 1))
+
+    for name, baseline, local in (
+        ("upload",
+         lambda: botocore_urls('put_object', s3_keys, {'ContentType': 'image/jpeg'}, 'PUT'),
+         lambda: s3_client.generate_presigned_upload_urls([(s3_key, 'image/jpeg') for s3_key in s3_keys])),
+        ("download",
+         lambda: botocore_urls('get_object', s3_keys, {}, 'GET'),
+         lambda: s3_client.generate_presigned_download_urls(s3_keys)),
+        ("multipart part",
+         lambda: [url for part_number in part_numbers for url in botocore_urls(
+             'upload_part', s3_keys[:1], {'UploadId': tag, 'PartNumber': part_number}, 'PUT')],
+         lambda: s3_client.generate_presigned_part_urls(s3_keys[0], tag, part_numbers)),
+    ):
+        baseline_rate = run(f"{name} (botocore)", baseline)
+        local_rate = run(f"{name} (SigV4)", local)
+        print(f"{name}: {local_rate / baseline_rate:.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,31 @@
+"""
+Generate the missing thumbnails, previews and perceptual hashes of uploaded
+images, e.g. images uploaded before these stages existed.
+
+Usage: python -m app.commands.generate_derivatives [--verify] [dataset_id ...]
+Without dataset IDs, every dataset is processed. With --verify, images whose
+derived files were removed from S3 are generated again.
+"""
+import sys
+from app.core.database import SessionLocal
+from app.services.image_service import ImageService
+
+
+def main(argv: list[str]) -> None:
+    verify = "--verify" in argv
+    dataset_ids = [int(arg) for arg in argv if arg != "--verify"] or [None]
+    db = SessionLocal()
+    try:
+        service = ImageService(db)
+        for dataset_id in dataset_ids:
+            if verify:
+                stats = service.verify_derivatives(dataset_id=dataset_id)
+                print(f"Dataset {dataset_id or 'all'}: {stats}")
+            stats = service.generate_derivatives(dataset_id=dataset_id)
+            print(f"Dataset {dataset_id or 'all'}: {stats}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
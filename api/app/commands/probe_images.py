@@ -0,0 +1,26 @@
+"""
+Fill width, height and real size of uploaded images that have no dimensions
+yet, e.g. images uploaded before the metadata extraction stage existed.
+
+Usage: python -m app.commands.probe_images [dataset_id ...]
+Without arguments, every dataset is probed.
+"""
+import sys
+from app.core.database import SessionLocal
+from app.services.image_service import ImageService
+
+
+def main(argv: list[str]) -> None:
+    dataset_ids = [int(arg) for arg in argv] or [None]
+    db = SessionLocal()
+    try:
+        service = ImageService(db)
+        for dataset_id in dataset_ids:
+            stats = service.probe_image_metadata(dataset_id=dataset_id)
+            print(f"Dataset {dataset_id or 'all'}: {stats}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,27 @@
+"""
+Settle images stuck in 'uploading' once, outside the periodic job.
+
+Usage: python -m app.commands.reap_uploads [error|delete]
+Without arguments, UPLOAD_REAPER_ACTION decides what happens to images
+whose file never landed.
+"""
+import sys
+from app.core.database import SessionLocal
+from app.services.image_service import ImageService
+
+
+def main(argv: list[str]) -> None:
+    action = argv[0] if argv else None
+    if action not in (None, "error", "delete"):
+        sys.exit("Action must be 'error' or 'delete'")
+
+    db = SessionLocal()
+    try:
+        stats = ImageService(db).reap_stale_uploads(action=action)
+        print(f"Stale upload reaper: {stats}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,23 @@
+"""
+Recompute the counter columns of datasets from scratch.
+
+Usage: python -m app.commands.recount_datasets [dataset_id ...]
+Without arguments, every dataset is recomputed.
+"""
+import sys
+from app.core.database import SessionLocal
+from app.services.dataset_counter_service import DatasetCounterService
+
+
+def main(argv: list[str]) -> None:
+    dataset_ids = [int(arg) for arg in argv]
+    db = SessionLocal()
+    try:
+        count = DatasetCounterService(db).recompute(dataset_ids or None)
+        print(f"Recomputed counters of {count} datasets")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,19 @@
+"""
+Run the background job workers.
+
+Usage: python -m app.commands.worker [processes]
+Without arguments, JOB_WORKER_PROCESSES processes are started. SIGINT or
+SIGTERM stops them once their current job is done.
+"""
+import sys
+from app.core.config import settings
+from app.jobs.worker import run_workers
+
+
+def main(argv: list[str]) -> None:
+    processes = int(argv[0]) if argv else settings.JOB_WORKER_PROCESSES
+    run_workers(processes)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
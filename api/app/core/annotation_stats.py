@@ -0,0 +1,183 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+# Columns of the rows given to StatsBuilder, one row per annotation and one
+# per image without annotation (label_id and box NULL)
+STATS_COLUMNS = ("image_id", "width", "height", "label_id", "xmin", "ymin", "xmax", "ymax")
+# Bytes of COPY output parsed at once
+STATS_PARSE_SIZE = 8 * 1024 * 1024
+# Quantiles reported for every distribution
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+# Lower edges of the histogram bins, the last bin being open-ended
+BOXES_PER_IMAGE_EDGES = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+BOX_AREA_EDGES = (0, *(4 ** power for power in range(1, 11)))
+RELATIVE_AREA_EDGES = (0, 0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1)
+ASPECT_RATIO_EDGES = (0, 1 / 8, 1 / 4, 1 / 2, 1, 2, 4, 8)
+# COCO object sizes: small below 32², large from 96²
+COCO_SMALL_AREA = 32 ** 2
+COCO_LARGE_AREA = 96 ** 2
+
+
+def distribution(values: np.ndarray, edges: Sequence[float]) -> dict:
+    """Count, min, max, mean, quantiles and histogram of values in one pass each"""
+    edges = np.asarray(edges, dtype=np.float64)
+    bins = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, None)
+    counts = np.bincount(bins, minlength=len(edges))
+    histogram = [{"min": float(low), "max": float(high) if high is not None else None, "count": int(count)}
+                 for low, high, count in zip(edges, [*edges[1:], None], counts)]
+    if not len(values):
+        return {"count": 0, "min": None, "max": None, "mean": None, "quantiles": {}, "histogram": histogram}
+    return {
+        "count": int(len(values)),
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "mean": float(values.mean()),
+        "quantiles": {f"p{round(q * 100)}": float(value)
+                      for q, value in zip(QUANTILES, np.quantile(values, QUANTILES))},
+        "histogram": histogram
+    }
+
+
+class StatsBuilder:
+    """
+    Annotation statistics of a dataset computed with NumPy. Rows arrive as
+    the text output of a COPY ... TO STDOUT (the builder is the file it is
+    written to), are parsed every STATS_PARSE_SIZE bytes and kept as compact
+    column arrays (about 32 bytes per annotation); every count, histogram
+    and quantile is then computed in vectorized passes over the columns.
+    """
+
+    def __init__(self):
+        self._pending: list[bytes] = []
+        self._pending_size = 0
+        self._image_ids: list[np.ndarray] = []
+        self._sizes: list[np.ndarray] = []
+        self._labels: list[np.ndarray] = []
+        self._boxes: list[np.ndarray] = []
+
+    def write(self, data: bytes) -> None:
+        """File interface for COPY: tab-separated STATS_COLUMNS rows, NULLs as \\N"""
+        self._pending.append(data)
+        self._pending_size += len(data)
+        if self._pending_size >= STATS_PARSE_SIZE:
+            self._parse()
+
+    def _parse(self) -> None:
+        """Parse the complete rows received so far into a block of columns"""
+        text = b"".join(self._pending)
+        end = text.rfind(b"\n") + 1
+        self._pending = [text[end:]] if end < len(text) else []
+        self._pending_size = len(text) - end
+        if not end:
+            return
+        # Stored values are never negative: -1 stands for NULL
+        block = np.fromstring(text[:end].replace(b"\\N", b"-1"), dtype=np.int64, sep=" ")
+        self.add(block.reshape(-1, len(STATS_COLUMNS)))
+
+    def add(self, block: np.ndarray) -> None:
+        """Add a block of STATS_COLUMNS rows (-1 for NULL)"""
+        self._image_ids.append(block[:, 0].astype(np.int32))
+        # Label IDs are positive: 0 marks an image without annotation
+        self._labels.append(np.maximum(block[:, 3], 0).astype(np.int32))
+        sizes = block[:, 1:3].astype(np.float32)
+        sizes[sizes < 0] = np.nan
+        self._sizes.append(sizes)
+        boxes = block[:, 4:].astype(np.float32)
+        boxes[boxes < 0] = np.nan
+        self._boxes.append(boxes)
+
+    def _column(self, batches: list[np.ndarray], dtype, width: int = 0) -> np.ndarray:
+        if batches:
+            return np.concatenate(batches)
+        return np.empty((0, width) if width else 0, dtype=dtype)
+
+    def compute(self) -> dict:
+        """
+        Statistics of the rows added so far: image and annotation counts,
+        per-class annotation and image counts, and the distributions of
+        boxes per image, box area (px²), box area relative to the image,
+        and aspect ratio (width / height)
+        """
+        self._parse()
+        image_ids = self._column(self._image_ids, np.int32)
+        sizes = self._column(self._sizes, np.float32, 2)
+        labels = self._column(self._labels, np.int32)
+        boxes = self._column(self._boxes, np.float32, 4)
+
+        annotated = labels > 0
+        images, image_index = np.unique(image_ids, return_inverse=True)
+        boxes_per_image = np.bincount(image_index[annotated], minlength=len(images))
+        image_sizes = np.zeros((len(images), 2), dtype=np.float32)
+        image_sizes[image_index] = sizes
+
+        # Classes: annotations per label, and images per label from the
+        # distinct (label, image) pairs
+        labels, image_index = labels[annotated], image_index[annotated]
+        class_ids, class_counts = np.unique(labels, return_counts=True)
+        pairs = np.unique(labels.astype(np.int64) << 32 | image_index)
+        class_images = np.bincount(np.searchsorted(class_ids, pairs >> 32), minlength=len(class_ids))
+
+        # Geometry of the complete boxes
+        boxes, sizes = boxes[annotated], sizes[annotated]
+        complete = ~np.isnan(boxes).any(axis=1)
+        boxes, sizes = boxes[complete].astype(np.float64), sizes[complete].astype(np.float64)
+        widths, heights = boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1]
+        areas = widths * heights
+        image_areas = sizes[:, 0] * sizes[:, 1]
+        # NaN (unknown image size) compares false
+        sized = image_areas > 0
+        flat = heights > 0
+
+        return {
+            "image_count": int(len(images)),
+            "annotated_image_count": int(np.count_nonzero(boxes_per_image)),
+            "unannotated_image_count": int(len(images) - np.count_nonzero(boxes_per_image)),
+            "unsized_image_count": int(np.count_nonzero(~(image_sizes[:, 0] * image_sizes[:, 1] > 0))),
+            "annotation_count": int(len(labels)),
+            "incomplete_box_count": int(len(labels) - len(boxes)),
+            "classes": [{"label_id": int(label_id), "annotation_count": int(count), "image_count": int(image_count)}
+                        for label_id, count, image_count in zip(class_ids, class_counts, class_images)],
+            "coco_sizes": {
+                "small": int(np.count_nonzero(areas < COCO_SMALL_AREA)),
+                "medium": int(np.count_nonzero((areas >= COCO_SMALL_AREA) & (areas < COCO_LARGE_AREA))),
+                "large": int(np.count_nonzero(areas >= COCO_LARGE_AREA))
+            },
+            "boxes_per_image": distribution(boxes_per_image, BOXES_PER_IMAGE_EDGES),
+            "box_area": distribution(areas, BOX_AREA_EDGES),
+            "relative_box_area": distribution(areas[sized] / image_areas[sized], RELATIVE_AREA_EDGES),
+            "aspect_ratio": distribution(widths[flat] / heights[flat], ASPECT_RATIO_EDGES)
+        }
+
+
+class StatsCache:
+    """
+    Thread-safe LRU cache of the statistics of the most recently used
+    datasets, each valid as long as the dataset's modification key is the
+    one it was computed for
+    """
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._entries: OrderedDict[int, tuple[Any, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, dataset_id: int, key: Any) -> Optional[dict]:
+        """Cached statistics of a dataset, or None if missing or computed for another key"""
+        with self._lock:
+            entry = self._entries.get(dataset_id)
+            if entry is None or entry[0] != key:
+                return None
+            self._entries.move_to_end(dataset_id)
+            return entry[1]
+
+    def put(self, dataset_id: int, key: Any, stats: dict) -> None:
+        if self._max_size <= 0:
+            return
+        with self._lock:
+            self._entries[dataset_id] = (key, stats)
+            self._entries.move_to_end(dataset_id)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
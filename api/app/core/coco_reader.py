@@ -0,0 +1,107 @@
+import codecs
+import json
+import re
+from typing import Iterable, Iterator
+
+# Top-level COCO arrays whose elements are handed out one by one
+COCO_SECTIONS = ("images", "annotations", "categories")
+# Largest single JSON value (one image, annotation...) accepted before the
+# input is considered invalid, so a broken file cannot be buffered whole
+MAX_VALUE_SIZE = 64 * 1024 * 1024
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class CocoReader:
+    """
+    Incremental reader of a COCO JSON document given as byte chunks: only
+    the current element of the images, annotations and categories arrays is
+    decoded at a time, so memory does not depend on the file size.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+        self.bytes_read = 0
+
+    def _fill(self) -> None:
+        """Append the next chunk to the unread part of the buffer"""
+        if self._eof:
+            raise ValueError("Unexpected end of COCO file")
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            text = self._decoder.decode(b"", final=True)
+        else:
+            self.bytes_read += len(chunk)
+            text = self._decoder.decode(chunk)
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        if len(self._buffer) > MAX_VALUE_SIZE:
+            raise ValueError(f"Invalid COCO file near byte {self.bytes_read}")
+
+    def _peek(self) -> str:
+        """Next non-whitespace character, without consuming it ('' at the end)"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or self._eof:
+                return self._buffer[self._pos:self._pos + 1]
+            self._fill()
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise ValueError(f"Expected '{char}' in COCO file near byte {self.bytes_read}")
+        self._pos += 1
+
+    def _value(self):
+        """Decode the next JSON value, reading more input until it is complete"""
+        self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+                # A number cut at the end of the buffer would decode too early
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise ValueError(f"Invalid JSON in COCO file near byte {self.bytes_read}")
+            self._fill()
+
+    def __iter__(self) -> Iterator[tuple[str, dict]]:
+        """
+        (section, element) for each element of the images, annotations and
+        categories arrays, in file order; other top-level keys are skipped
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if key in COCO_SECTIONS and self._peek() == "[":
+                self._pos += 1
+                if self._peek() == "]":
+                    self._pos += 1
+                else:
+                    while True:
+                        yield key, self._value()
+                        separator = self._peek()
+                        self._pos += 1
+                        if separator == "]":
+                            break
+                        if separator != ",":
+                            raise ValueError(f"Expected ',' or ']' in COCO file near byte {self.bytes_read}")
+            else:
+                self._value()
+
+            separator = self._peek()
+            self._pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(f"Expected ',' or '}}' in COCO file near byte {self.bytes_read}")
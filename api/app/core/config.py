@@ -22,6 +22,85 @@ class Settings:
     MINIO_PUBLIC_SECURE: bool = os.getenv(
         "MINIO_PUBLIC_SECURE", "False").lower() == "true"
 
+    # Lifetime of presigned upload URLs (seconds)
+    PRESIGNED_UPLOAD_EXPIRES_IN: int = int(
+        os.getenv("PRESIGNED_UPLOAD_EXPIRES_IN", "3600"))
+    # Presigned download URL cache: max entries (0 disables it) and the safety
+    # margin (seconds) before expiry after which a cached URL is re-signed
+    PRESIGNED_URL_CACHE_SIZE: int = int(
+        os.getenv("PRESIGNED_URL_CACHE_SIZE", "100000"))
+    PRESIGNED_URL_CACHE_MARGIN: int = int(
+        os.getenv("PRESIGNED_URL_CACHE_MARGIN", "300"))
+    # Max concurrent S3 requests for batch operations (HEAD checks, ...)
+    S3_MAX_CONCURRENCY: int = int(os.getenv("S3_MAX_CONCURRENCY", "16"))
+    # Part size for multipart uploads (bytes, S3 minimum is 5 MiB)
+    MULTIPART_PART_SIZE: int = int(
+        os.getenv("MULTIPART_PART_SIZE", str(16 * 1024 * 1024)))
+    # Optional shared secret expected in the Authorization header of bucket notifications
+    S3_WEBHOOK_TOKEN: str = os.getenv("S3_WEBHOOK_TOKEN", "")
+
+    # Background jobs: worker processes, idle polling interval (seconds),
+    # attempts per job, base retry delay (seconds, doubled on each attempt),
+    # delay (seconds) without heartbeat after which a running job is requeued
+    # and interval (seconds) of the heartbeats of a running job
+    JOB_WORKER_PROCESSES: int = int(os.getenv("JOB_WORKER_PROCESSES", "2"))
+    JOB_POLL_INTERVAL: float = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+    JOB_MAX_ATTEMPTS: int = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+    JOB_RETRY_BACKOFF: int = int(os.getenv("JOB_RETRY_BACKOFF", "10"))
+    JOB_HEARTBEAT_TIMEOUT: int = int(
+        os.getenv("JOB_HEARTBEAT_TIMEOUT", "600"))
+    JOB_HEARTBEAT_INTERVAL: int = int(
+        os.getenv("JOB_HEARTBEAT_INTERVAL", "60"))
+
+    # Stale upload reaper: run interval (seconds), delay (seconds) after the
+    # presigned URL expiry before an 'uploading' image is reaped, max age
+    # (seconds) of multipart uploads (resumable, so kept longer) and what to do
+    # with images whose file never landed: "error" (flag) or "delete"
+    UPLOAD_REAPER_INTERVAL: int = int(
+        os.getenv("UPLOAD_REAPER_INTERVAL", "600"))
+    UPLOAD_REAPER_GRACE: int = int(os.getenv("UPLOAD_REAPER_GRACE", "300"))
+    MULTIPART_UPLOAD_MAX_AGE: int = int(
+        os.getenv("MULTIPART_UPLOAD_MAX_AGE", str(24 * 3600)))
+    UPLOAD_REAPER_ACTION: str = os.getenv("UPLOAD_REAPER_ACTION", "error")
+
+    # Image header probing: bytes fetched per ranged GET when reading the
+    # headers of a file to find its dimensions
+    IMAGE_PROBE_BYTES: int = int(os.getenv("IMAGE_PROBE_BYTES", "2048"))
+
+    # Thumbnails and previews: processes rendering them in each job worker
+    # (0 = one per CPU), WebP quality, max size (bytes) of the originals
+    # they are rendered from and max total size (bytes) of the originals held
+    # in memory at once (a larger original is rendered on its own)
+    DERIVATIVE_PROCESSES: int = int(os.getenv("DERIVATIVE_PROCESSES", "0"))
+    DERIVATIVE_QUALITY: int = int(os.getenv("DERIVATIVE_QUALITY", "80"))
+    DERIVATIVE_MAX_SOURCE_BYTES: int = int(
+        os.getenv("DERIVATIVE_MAX_SOURCE_BYTES", str(200 * 1024 * 1024)))
+    DERIVATIVE_BATCH_BYTES: int = int(
+        os.getenv("DERIVATIVE_BATCH_BYTES", str(256 * 1024 * 1024)))
+
+    # Near-duplicate detection: number of datasets whose perceptual hash index
+    # is kept in memory by each API process, and how long (seconds) an index
+    # is reused before being rebuilt from the database
+    NEAR_DUPLICATE_INDEX_CACHE_SIZE: int = int(
+        os.getenv("NEAR_DUPLICATE_INDEX_CACHE_SIZE", "4"))
+    NEAR_DUPLICATE_INDEX_TTL: int = int(
+        os.getenv("NEAR_DUPLICATE_INDEX_TTL", "300"))
+
+    # Annotation statistics: max number of datasets whose statistics are
+    # kept in memory by each API process (reused until the dataset changes)
+    DATASET_STATS_CACHE_SIZE: int = int(
+        os.getenv("DATASET_STATS_CACHE_SIZE", "64"))
+
+    # Annotation exports: rows fetched per server-side cursor round trip, and
+    # lifetime (seconds) of the download URL of a background export
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "5000"))
+    EXPORT_DOWNLOAD_EXPIRES_IN: int = int(
+        os.getenv("EXPORT_DOWNLOAD_EXPIRES_IN", str(24 * 3600)))
+
+    # Dataset snapshots: width of the image ID range stored in each part
+    # file (a part is only rewritten when its images or annotations change)
+    SNAPSHOT_PART_IMAGES: int = int(os.getenv("SNAPSHOT_PART_IMAGES", "100000"))
+
     @property
     def database_url(self) -> str:
         return self.DATABASE_URL
@@ -1,6 +1,10 @@
+import csv
+import io
+from typing import Iterable, Sequence
+
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from .config import settings
 
 # Configuration de la base de données PostgreSQL
@@ -12,6 +16,38 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
+
+def copy_rows(db: Session, table: str, columns: Sequence[str], rows: Iterable[tuple]) -> None:
+    """
+    Bulk load rows into a table with COPY, in the session's transaction (no
+    commit). Empty strings and None are loaded as NULL, omitted columns get
+    their defaults.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+    finally:
+        cursor.close()
+
+
+def copy_query(db: Session, query, file) -> None:
+    """
+    Write the rows of a SELECT to a file-like object with COPY ... TO STDOUT
+    (text format: tab-separated, NULL as \\N), in the session's transaction.
+    Parameters are rendered inline, so the query must only hold trusted values.
+    """
+    sql = query.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY ({sql}) TO STDOUT", file)
+    finally:
+        cursor.close()
+
+
 # Fonction pour obtenir une session de base de données
 
 
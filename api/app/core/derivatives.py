@@ -0,0 +1,83 @@
+import io
+from typing import Optional
+
+from PIL import Image, ImageOps
+
+# Derived objects stored next to each original: name -> max side in pixels,
+# from the largest to the smallest level of the pyramid
+DERIVATIVE_SIZES = {
+    "preview": 1024,
+    "thumb": 256,
+}
+DERIVATIVE_CONTENT_TYPE = "image/webp"
+
+
+def derivative_key(s3_key: str, name: str) -> str:
+    """
+    S3 key of a derived image
+    Format: {s3_key}.{name}.webp
+    """
+    return f"{s3_key}.{name}.webp"
+
+
+def derivative_keys(s3_key: str) -> list[str]:
+    """S3 keys of all the derived images of a file"""
+    return [derivative_key(s3_key, name) for name in DERIVATIVE_SIZES]
+
+
+def render_derivatives(data: bytes, sizes: dict[str, int], quality: int) -> Optional[tuple[dict[str, bytes], int]]:
+    """
+    Render the WebP derivatives of an image file and its perceptual hash
+
+    The image is decoded once (JPEGs directly at a reduced scale) and each
+    level is downscaled from the previous one; the hash is computed on the
+    smallest level. Runs in worker processes, so only takes and returns
+    plain values.
+
+    Returns (dict mapping derivative names to WebP bytes, 64-bit dHash), or
+    None if the file cannot be decoded
+    """
+    levels = sorted(sizes.items(), key=lambda level: level[1], reverse=True)
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            largest = levels[0][1]
+            image.draft(None, (largest, largest))
+            image = ImageOps.exif_transpose(image)
+            image = _to_rgb(image)
+
+            derivatives = {}
+            for name, size in levels:
+                image.thumbnail((size, size), Image.Resampling.LANCZOS)
+                buffer = io.BytesIO()
+                image.save(buffer, "WEBP", quality=quality)
+                derivatives[name] = buffer.getvalue()
+            return derivatives, dhash(image)
+    except (OSError, ValueError, SyntaxError, Image.DecompressionBombError):
+        # Unknown format, truncated or corrupted file, oversized image
+        return None
+
+
+def dhash(image: Image.Image) -> int:
+    """
+    64-bit difference hash: one bit per horizontal gradient of a 9x8
+    grayscale version of the image. Resized or re-encoded copies get hashes
+    within a small Hamming distance.
+    """
+    pixels = image.convert("L").resize((9, 8), Image.Resampling.LANCZOS).tobytes()
+    value = 0
+    for row in range(0, 72, 9):
+        for col in range(row, row + 8):
+            value = value << 1 | (pixels[col] > pixels[col + 1])
+    return value
+
+
+def _to_rgb(image: Image.Image) -> Image.Image:
+    """Convert to RGB, or RGBA for images with transparency"""
+    if image.mode in ("RGB", "RGBA"):
+        return image
+    if image.mode in ("I", "I;16", "I;16B", "I;16L", "F"):
+        # 16-bit and float images (e.g. satellite tiles): keep the 8 high bits
+        return image.convert("I").point(lambda value: value / 256).convert("L").convert("RGB")
+    if image.mode in ("LA", "PA") or (image.mode == "P" and "transparency" in image.info):
+        return image.convert("RGBA")
+    return image.convert("RGB")
@@ -0,0 +1,166 @@
+import json
+import struct
+import tempfile
+import time
+import zlib
+from typing import Iterable, Iterator, Optional
+from xml.etree import ElementTree
+
+# Buffered output is handed out in chunks of at least this size
+STREAM_CHUNK_SIZE = 64 * 1024
+# Size of the ZIP central directory kept in memory before spilling to disk
+ZIP_DIRECTORY_MEMORY = 1024 * 1024
+# Offsets and counts from which ZIP needs its ZIP64 extension
+ZIP64_LIMIT = 0xFFFFFFFF
+# General purpose flag: file names are UTF-8
+ZIP_UTF8_FLAG = 0x0800
+
+
+def export_name(s3_key: str) -> str:
+    """File name of an image in exports: the unique '{uuid}_{filename}' part of its key"""
+    return s3_key.rsplit("/", 1)[-1]
+
+
+def coco_image(image_id: int, name: str, width: Optional[int], height: Optional[int]) -> dict:
+    return {"id": image_id, "file_name": name, "width": width, "height": height}
+
+
+def coco_annotation(annotation_id: int, image_id: int, label_id: int, box: tuple) -> dict:
+    """COCO annotation of an (xmin, ymin, xmax, ymax) box: bbox is [x, y, width, height]"""
+    xmin, ymin, xmax, ymax = box
+    width, height = xmax - xmin, ymax - ymin
+    return {
+        "id": annotation_id,
+        "image_id": image_id,
+        "category_id": label_id,
+        "bbox": [xmin, ymin, width, height],
+        "area": width * height,
+        "iscrowd": 0,
+        "segmentation": []
+    }
+
+
+def coco_stream(header: dict, images: Iterable[list[dict]], annotations: Iterable[list[dict]]) -> Iterator[bytes]:
+    """
+    COCO JSON document written piece by piece: the header keys (info,
+    categories...), then the images and annotations, each given as batches
+    of dicts. One batch is in memory at a time.
+    """
+    yield json.dumps(header)[:-1].encode()
+    for key, batches in (("images", images), ("annotations", annotations)):
+        yield f', "{key}": ['.encode()
+        separator = ""
+        for batch in batches:
+            if batch:
+                yield (separator + ", ".join(json.dumps(item) for item in batch)).encode()
+                separator = ", "
+        yield b"]"
+    yield b"}"
+
+
+def yolo_labels(boxes: list[tuple], classes: dict[int, int], width: int, height: int) -> str:
+    """
+    YOLO label file of an image: one 'class x_center y_center width height'
+    line per (label_id, xmin, ymin, xmax, ymax) box, normalized to the image size
+    """
+    lines = []
+    for label_id, xmin, ymin, xmax, ymax in boxes:
+        lines.append(
+            f"{classes[label_id]} {(xmin + xmax) / 2 / width:.6f} {(ymin + ymax) / 2 / height:.6f} "
+            f"{(xmax - xmin) / width:.6f} {(ymax - ymin) / height:.6f}\n")
+    return "".join(lines)
+
+
+def yolo_data_yaml(names: list[str]) -> str:
+    """Ultralytics data.yaml listing the class names (JSON strings are valid YAML)"""
+    return "names:\n" + "".join(f"  {index}: {json.dumps(name)}\n" for index, name in enumerate(names))
+
+
+def voc_xml(name: str, width: Optional[int], height: Optional[int], boxes: list[tuple], names: dict[int, str]) -> str:
+    """Pascal VOC annotation of an image from its (label_id, xmin, ymin, xmax, ymax) boxes"""
+    root = ElementTree.Element("annotation")
+    ElementTree.SubElement(root, "folder").text = "images"
+    ElementTree.SubElement(root, "filename").text = name
+    if width is not None and height is not None:
+        size = ElementTree.SubElement(root, "size")
+        ElementTree.SubElement(size, "width").text = str(width)
+        ElementTree.SubElement(size, "height").text = str(height)
+        ElementTree.SubElement(size, "depth").text = "3"
+    ElementTree.SubElement(root, "segmented").text = "0"
+    for label_id, xmin, ymin, xmax, ymax in boxes:
+        obj = ElementTree.SubElement(root, "object")
+        ElementTree.SubElement(obj, "name").text = names[label_id]
+        ElementTree.SubElement(obj, "pose").text = "Unspecified"
+        ElementTree.SubElement(obj, "truncated").text = "0"
+        ElementTree.SubElement(obj, "difficult").text = "0"
+        bndbox = ElementTree.SubElement(obj, "bndbox")
+        for tag, value in (("xmin", xmin), ("ymin", ymin), ("xmax", xmax), ("ymax", ymax)):
+            ElementTree.SubElement(bndbox, tag).text = str(value)
+    return ElementTree.tostring(root, encoding="unicode")
+
+
+def _dos_time(moment: time.struct_time) -> tuple[int, int]:
+    """MS-DOS (time, date) fields of a ZIP entry"""
+    return (moment.tm_hour << 11 | moment.tm_min << 5 | moment.tm_sec // 2,
+            (moment.tm_year - 1980) << 9 | moment.tm_mon << 5 | moment.tm_mday)
+
+
+def zip_stream(files: Iterable[tuple[str, str]]) -> Iterator[bytes]:
+    """
+    ZIP archive of (name, text) files written as it goes, in constant memory:
+    output is handed out every STREAM_CHUNK_SIZE bytes and the central
+    directory (one record per file, written last) is spooled to a temporary
+    file. ZIP64 records are added past 65535 files or 4 GiB.
+    """
+    dos_time, dos_date = _dos_time(time.localtime())
+    directory = tempfile.SpooledTemporaryFile(max_size=ZIP_DIRECTORY_MEMORY)
+    buffer = bytearray()
+    offset = 0
+    count = 0
+    try:
+        for name, text in files:
+            name_bytes = name.encode()
+            data = text.encode()
+            compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+            compressed = compressor.compress(data) + compressor.flush()
+            crc = zlib.crc32(data)
+
+            # Small files: only the offset of the local header can need ZIP64
+            extra = struct.pack("<HHQ", 1, 8, offset) if offset >= ZIP64_LIMIT else b""
+            directory.write(struct.pack(
+                "<IHHHHHHIIIHHHHHII", 0x02014b50, 45, 45 if extra else 20, ZIP_UTF8_FLAG,
+                zlib.DEFLATED, dos_time, dos_date, crc, len(compressed), len(data),
+                len(name_bytes), len(extra), 0, 0, 0, 0o644 << 16,
+                0xFFFFFFFF if extra else offset) + name_bytes + extra)
+            header = struct.pack(
+                "<IHHHHHIIIHH", 0x04034b50, 20, ZIP_UTF8_FLAG, zlib.DEFLATED,
+                dos_time, dos_date, crc, len(compressed), len(data), len(name_bytes), 0)
+            buffer += header + name_bytes + compressed
+            offset += len(header) + len(name_bytes) + len(compressed)
+            count += 1
+            if len(buffer) >= STREAM_CHUNK_SIZE:
+                yield bytes(buffer)
+                buffer.clear()
+
+        if buffer:
+            yield bytes(buffer)
+        directory_size = directory.tell()
+        directory.seek(0)
+        while chunk := directory.read(STREAM_CHUNK_SIZE):
+            yield chunk
+
+        if count >= 0xFFFF or offset >= ZIP64_LIMIT or directory_size >= ZIP64_LIMIT:
+            # ZIP64 end record and its locator, then a classic end record
+            # whose fields point readers to them
+            yield struct.pack(
+                "<IQHHIIQQQQ", 0x06064b50, 44, 45, 45, 0, 0,
+                count, count, directory_size, offset)
+            yield struct.pack("<IIQI", 0x07064b50, 0, offset + directory_size, 1)
+            yield struct.pack(
+                "<IHHHHIIH", 0x06054b50, 0, 0, 0xFFFF, 0xFFFF,
+                0xFFFFFFFF, 0xFFFFFFFF, 0)
+        else:
+            yield struct.pack(
+                "<IHHHHIIH", 0x06054b50, 0, 0, count, count, directory_size, offset, 0)
+    finally:
+        directory.close()
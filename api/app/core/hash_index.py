@@ -0,0 +1,200 @@
+import threading
+import time
+from collections import OrderedDict
+from itertools import combinations
+from typing import Iterator, Optional
+
+import numpy as np
+
+# 64-bit hashes are indexed as 4 chunks of 16 bits
+CHUNK_BITS = 16
+CHUNK_COUNT = 64 // CHUNK_BITS
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+# Max number of candidate pairs compared at once when listing all pairs
+PAIR_BATCH_SIZE = 4_000_000
+
+
+def to_signed(value: int) -> int:
+    """Unsigned 64-bit hash to the signed value stored in a BIGINT column"""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def to_unsigned(value: int) -> int:
+    """Signed BIGINT column value back to the unsigned 64-bit hash"""
+    return value & 0xFFFFFFFFFFFFFFFF
+
+
+def _flip_masks(radius: int) -> list[int]:
+    """Every chunk mask with at most radius bits set (0 included)"""
+    return [sum(1 << bit for bit in bits)
+            for count in range(radius + 1)
+            for bits in combinations(range(CHUNK_BITS), count)]
+
+
+class HashIndex:
+    """
+    Multi-index hashing over the 64-bit perceptual hashes of a set of images:
+    finds hashes within a Hamming distance without comparing every pair.
+
+    Hashes are split into 4 chunks of 16 bits, each sorted once. Two hashes
+    within distance k have at least one chunk within distance k // 4
+    (pigeonhole), so only hashes whose chunk equals one of the few variants
+    of a chunk are compared. Identical hashes are stored once.
+    """
+
+    def __init__(self, ids: np.ndarray, hashes: np.ndarray):
+        self.ids = ids
+        # Distinct hashes, and the position of each image's hash among them
+        self.hashes, self.hash_of = np.unique(hashes, return_inverse=True)
+        self.chunks = [((self.hashes >> np.uint64(CHUNK_BITS * chunk)) & np.uint64(CHUNK_MASK)).astype(np.uint32)
+                       for chunk in range(CHUNK_COUNT)]
+        self.orders = [np.argsort(chunk, kind="stable") for chunk in self.chunks]
+        self.sorted_chunks = [chunk[order] for chunk, order in zip(self.chunks, self.orders)]
+        # Images grouped by hash: image_order[starts[h]:starts[h + 1]]
+        self.image_order = np.argsort(self.hash_of, kind="stable")
+        self.image_starts = np.searchsorted(
+            self.hash_of[self.image_order], np.arange(len(self.hashes) + 1))
+        self._groups: dict[int, list[np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _images_of(self, hash_index: int) -> np.ndarray:
+        """IDs of the images having a distinct hash"""
+        start, stop = self.image_starts[hash_index], self.image_starts[hash_index + 1]
+        return self.ids[self.image_order[start:stop]]
+
+    def query(self, value: int, max_distance: int) -> list[tuple[int, int]]:
+        """
+        Images whose hash is within max_distance of value
+
+        Returns list of (image ID, distance), closest first
+        """
+        if not len(self.hashes):
+            return []
+
+        candidates = []
+        for chunk, (order, sorted_chunk) in enumerate(zip(self.orders, self.sorted_chunks)):
+            part = (value >> (CHUNK_BITS * chunk)) & CHUNK_MASK
+            for mask in _flip_masks(max_distance // CHUNK_COUNT):
+                target = np.uint32(part ^ mask)
+                start = np.searchsorted(sorted_chunk, target, "left")
+                stop = np.searchsorted(sorted_chunk, target, "right")
+                candidates.append(order[start:stop])
+        candidates = np.unique(np.concatenate(candidates))
+
+        distances = np.bitwise_count(self.hashes[candidates] ^ np.uint64(value))
+        close = np.argsort(distances, kind="stable")
+        return [(int(image_id), int(distances[i]))
+                for i in close if distances[i] <= max_distance
+                for image_id in self._images_of(candidates[i])]
+
+    def pairs(self, max_distance: int) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """
+        Every pair of distinct hashes within max_distance, as batches of
+        (positions, positions) arrays into the distinct hashes, each pair once
+        """
+        radius = max_distance // CHUNK_COUNT
+        for chunk, (order, sorted_chunk) in enumerate(zip(self.orders, self.sorted_chunks)):
+            for mask in _flip_masks(radius):
+                # Hashes whose chunk equals chunk XOR mask of each hash; with
+                # a mask, only from the lower chunk so each pair comes once
+                targets = sorted_chunk ^ np.uint32(mask)
+                starts = np.searchsorted(sorted_chunk, targets, "left")
+                counts = np.searchsorted(sorted_chunk, targets, "right") - starts
+                if mask:
+                    counts[sorted_chunk > targets] = 0
+
+                # Expand the candidates in slices of at most PAIR_BATCH_SIZE pairs
+                bounds = np.searchsorted(
+                    np.cumsum(counts), np.arange(PAIR_BATCH_SIZE, counts.sum(), PAIR_BATCH_SIZE))
+                for rows in np.split(np.arange(len(counts)), np.unique(bounds)):
+                    row_counts = counts[rows]
+                    total = row_counts.sum()
+                    if not total:
+                        continue
+                    offsets = np.arange(total) - np.repeat(np.cumsum(row_counts) - row_counts, row_counts)
+                    left = np.repeat(order[rows], row_counts)
+                    right = order[np.repeat(starts[rows], row_counts) + offsets]
+
+                    if not mask:
+                        keep = left < right
+                        left, right = left[keep], right[keep]
+                    keep = np.bitwise_count(self.hashes[left] ^ self.hashes[right]) <= max_distance
+                    # A pair is reported by the first chunk where it is within the radius
+                    for earlier in self.chunks[:chunk]:
+                        keep &= np.bitwise_count(earlier[left] ^ earlier[right]) > radius
+                    if keep.any():
+                        yield left[keep], right[keep]
+
+    def groups(self, max_distance: int) -> list[np.ndarray]:
+        """
+        Groups of near-duplicate images: connected components of the images
+        within max_distance of each other, largest first (memoized)
+
+        Returns list of arrays of image IDs, each with at least two images
+        """
+        if max_distance in self._groups:
+            return self._groups[max_distance]
+
+        # Label propagation with pointer jumping over the pairs of hashes
+        labels = np.arange(len(self.hashes))
+        pairs = list(self.pairs(max_distance))
+        if pairs:
+            left = np.concatenate([pair[0] for pair in pairs])
+            right = np.concatenate([pair[1] for pair in pairs])
+            while True:
+                lowest = np.minimum(labels[left], labels[right])
+                updated = labels.copy()
+                np.minimum.at(updated, left, lowest)
+                np.minimum.at(updated, right, lowest)
+                updated = updated[updated]
+                if np.array_equal(updated, labels):
+                    break
+                labels = updated
+
+        # Images with identical hashes share their hash's label
+        image_labels = labels[self.hash_of]
+        order = np.argsort(image_labels, kind="stable")
+        boundaries = np.flatnonzero(np.diff(image_labels[order])) + 1
+        groups = [np.sort(self.ids[members]) for members in np.split(order, boundaries)
+                  if len(members) > 1]
+        groups.sort(key=len, reverse=True)
+
+        self._groups[max_distance] = groups
+        return groups
+
+
+class HashIndexCache:
+    """
+    Thread-safe LRU cache of the hash indexes of the most recently used
+    datasets, each kept for a fixed time-to-live
+    """
+
+    def __init__(self, max_size: int, ttl: int):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._entries: OrderedDict[int, tuple[HashIndex, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, dataset_id: int) -> Optional[HashIndex]:
+        """Cached index of a dataset, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(dataset_id)
+            if entry is None:
+                return None
+            index, built_at = entry
+            if time.time() - built_at > self._ttl:
+                del self._entries[dataset_id]
+                return None
+            self._entries.move_to_end(dataset_id)
+            return index
+
+    def put(self, dataset_id: int, index: HashIndex) -> None:
+        if self._max_size <= 0:
+            return
+        with self._lock:
+            self._entries[dataset_id] = (index, time.time())
+            self._entries.move_to_end(dataset_id)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
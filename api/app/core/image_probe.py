@@ -0,0 +1,158 @@
+import struct
+from typing import Optional, Tuple
+
+# JPEG start-of-frame markers (all SOFn except DHT, JPG and DAC)
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                    0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def image_dimensions(head: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read (width, height) from the first bytes of a JPEG, PNG, WebP, GIF or
+    TIFF file, without decoding it
+
+    Returns None if the format is unknown or the dimensions are not within
+    the given bytes: a JPEG with large EXIF/ICC blocks (continue at
+    jpeg_resume_offset() with jpeg_dimensions_at()), a TIFF whose first IFD
+    is stored further in the file (read it at tiff_ifd_offset() and use
+    tiff_dimensions()).
+    """
+    try:
+        if head.startswith(b"\x89PNG\r\n\x1a\n"):
+            return _png_dimensions(head)
+        if head.startswith(b"\xff\xd8"):
+            return _jpeg_scan(head, 2)[0]
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            return _webp_dimensions(head)
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", head[6:10])
+        if head[:4] in (b"II*\x00", b"MM\x00*"):
+            return _tiff_dimensions(head)
+    except struct.error:
+        # Header truncated
+        return None
+    return None
+
+
+def jpeg_resume_offset(head: bytes) -> Optional[int]:
+    """
+    File offset of the first JPEG marker segment that does not fit in head,
+    or None if head is not a JPEG header (or a broken one)
+    """
+    if not head.startswith(b"\xff\xd8"):
+        return None
+    return _jpeg_scan(head, 2)[1]
+
+
+def jpeg_dimensions_at(chunk: bytes, offset: int) -> Tuple[Optional[Tuple[int, int]], Optional[int]]:
+    """
+    Continue a JPEG marker scan on bytes read at a file offset where a
+    marker segment starts
+
+    Large segments (EXIF, ICC profiles) are skipped using their length, so
+    only a few bytes around each marker are needed.
+
+    Returns ((width, height), None) once the frame header is found, or
+    (None, offset to continue at), or (None, None) if the file is broken
+    """
+    dimensions, index = _jpeg_scan(chunk, 0)
+    return dimensions, None if index is None else offset + index
+
+
+def _png_dimensions(head: bytes) -> Optional[Tuple[int, int]]:
+    # The IHDR chunk always comes first
+    if head[12:16] != b"IHDR":
+        return None
+    return struct.unpack(">II", head[16:24])
+
+
+def _jpeg_scan(data: bytes, i: int) -> Tuple[Optional[Tuple[int, int]], Optional[int]]:
+    """Scan marker segments from index i: (dimensions, None) or (None, index to resume at)"""
+    while True:
+        if i + 4 > len(data):
+            return None, i
+        if data[i] != 0xFF:
+            return None, None
+        marker = data[i + 1]
+        # Fill bytes, and standalone markers without a length
+        if marker == 0xFF:
+            i += 1
+            continue
+        if marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:
+            i += 2
+            continue
+        if marker in JPEG_SOF_MARKERS:
+            if i + 9 > len(data):
+                return None, i
+            height, width = struct.unpack(">HH", data[i + 5:i + 9])
+            return (width, height), None
+        if marker == 0xDA:
+            # Start of scan without any frame header
+            return None, None
+        (length,) = struct.unpack(">H", data[i + 2:i + 4])
+        i += 2 + length
+
+
+def _webp_dimensions(head: bytes) -> Optional[Tuple[int, int]]:
+    chunk = head[12:16]
+    if chunk == b"VP8 ":
+        # Lossy: 14-bit sizes after the 0x9d012a start code of the key frame
+        if head[23:26] != b"\x9d\x01\x2a":
+            return None
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L":
+        # Lossless: 14-bit sizes minus one, packed after the 0x2f signature
+        if head[20] != 0x2F:
+            return None
+        (bits,) = struct.unpack("<I", head[21:25])
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        # Extended: 24-bit canvas sizes minus one
+        width = int.from_bytes(head[24:27], "little") + 1
+        height = int.from_bytes(head[27:30], "little") + 1
+        return width, height
+    return None
+
+
+def tiff_ifd_offset(head: bytes) -> Optional[int]:
+    """Offset of the first IFD of a TIFF file, or None if head is not a TIFF header"""
+    if head[:4] not in (b"II*\x00", b"MM\x00*"):
+        return None
+    (offset,) = struct.unpack(_tiff_endian(head) + "I", head[4:8])
+    return offset
+
+
+def tiff_dimensions(head: bytes, ifd: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read (width, height) from the first IFD of a TIFF file, given the file
+    header and the bytes starting at the IFD offset
+    """
+    try:
+        return _tiff_ifd_dimensions(_tiff_endian(head), ifd)
+    except struct.error:
+        return None
+
+
+def _tiff_endian(head: bytes) -> str:
+    return "<" if head[:2] == b"II" else ">"
+
+
+def _tiff_dimensions(head: bytes) -> Optional[Tuple[int, int]]:
+    return _tiff_ifd_dimensions(_tiff_endian(head), head[tiff_ifd_offset(head):])
+
+
+def _tiff_ifd_dimensions(endian: str, ifd: bytes) -> Optional[Tuple[int, int]]:
+    (count,) = struct.unpack(endian + "H", ifd[:2])
+
+    tags = {}
+    for entry in range(2, 2 + 12 * count, 12):
+        tag, kind = struct.unpack(endian + "HH", ifd[entry:entry + 4])
+        if tag in (256, 257):
+            # ImageWidth / ImageLength, stored as SHORT (3) or LONG (4)
+            fmt = "H" if kind == 3 else "I"
+            (tags[tag],) = struct.unpack(
+                endian + fmt, ifd[entry + 8:entry + 8 + struct.calcsize(fmt)])
+            if len(tags) == 2:
+                return tags[256], tags[257]
+    return None
@@ -0,0 +1,37 @@
+import base64
+import json
+from typing import Any
+from fastapi import HTTPException, status
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of the last row of a page into an opaque cursor token
+
+    Values must be JSON serializable (datetimes are encoded as ISO strings).
+    """
+    payload = json.dumps(
+        [value.isoformat() if hasattr(value, "isoformat") else value for value in values],
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    """
+    Decode a cursor token back into its sort key values
+
+    Raises a 400 error if the token is malformed or has the wrong number of values.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, UnicodeDecodeError):
+        values = None
+
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+    return values
@@ -1,13 +1,222 @@
 import boto3
+import hashlib
+import hmac
+import threading
+import time
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
-from typing import Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Callable, Iterator, Optional
+from urllib.parse import quote, urlparse
 from .config import settings
 
+# MinIO doesn't care about region, but SigV4 signatures include it
+S3_REGION = 'us-east-1'
+# S3 limit on the number of keys of a DeleteObjects request
+S3_DELETE_BATCH_SIZE = 1000
+
+
+def _canonical_query(query: dict[str, str]) -> str:
+    """SigV4 canonical query string: URI-encoded parameters sorted by name"""
+    return '&'.join(
+        f"{quote(name, safe='-_.~')}={quote(value, safe='-_.~')}"
+        for name, value in sorted(query.items())
+    )
+
+
+class SigV4Presigner:
+    """
+    Local AWS Signature V4 query-string presigner for path-style S3 URLs.
+
+    The signing key is derived once per (date, region, service) and cached,
+    and URLs are built directly against the given endpoint, so signing a key
+    costs a single SHA-256 and HMAC instead of a full botocore request build.
+    """
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        bucket_name: str,
+        access_key: str,
+        secret_key: str,
+        region: str = S3_REGION,
+        service: str = 's3'
+    ):
+        endpoint = urlparse(endpoint_url)
+        self._base_url = f"{endpoint.scheme}://{endpoint.netloc}"
+        self._host = endpoint.netloc
+        self._bucket_name = bucket_name
+        self._access_key = access_key
+        self._secret_key = secret_key
+        self._region = region
+        self._service = service
+        self._signing_keys: dict[tuple[str, str, str], bytes] = {}
+
+    def _signing_key(self, date_stamp: str) -> bytes:
+        """SigV4 signing key for a day, derived once and cached"""
+        cache_key = (date_stamp, self._region, self._service)
+        signing_key = self._signing_keys.get(cache_key)
+        if signing_key is None:
+            signing_key = f"AWS4{self._secret_key}".encode()
+            for part in (date_stamp, self._region, self._service, 'aws4_request'):
+                signing_key = hmac.new(
+                    signing_key, part.encode(), hashlib.sha256).digest()
+            # Keys of previous days are never used again
+            self._signing_keys = {cache_key: signing_key}
+        return signing_key
+
+    def presign(
+        self,
+        s3_key: str,
+        method: str = 'GET',
+        expires_in: int = 3600,
+        headers: Optional[dict[str, str]] = None
+    ) -> str:
+        """Presign a single S3 key, see presign_many"""
+        return self.presign_many([s3_key], method, expires_in, headers)[0]
+
+    def presign_many(
+        self,
+        s3_keys: list[str],
+        method: str = 'GET',
+        expires_in: int = 3600,
+        headers: Optional[dict[str, str]] = None,
+        now: Optional[datetime] = None,
+        queries: Optional[list[dict[str, str]]] = None
+    ) -> list[str]:
+        """
+        Presign a batch of S3 keys sharing the same method, expiration and headers
+
+        Args:
+            s3_keys: The S3 keys (paths) to sign
+            method: HTTP method the URLs are valid for
+            expires_in: URL expiration time in seconds (max: 7 days)
+            headers: Extra headers the client must send (e.g. content-type)
+            now: Signing time (default: current time)
+            queries: Extra query parameters of each URL, in the same order
+                as s3_keys (e.g. partNumber and uploadId of a multipart part)
+
+        Returns:
+            Presigned URLs, in the same order as s3_keys
+        """
+        now = now or datetime.now(timezone.utc)
+        amz_date = now.strftime('%Y%m%dT%H%M%SZ')
+        date_stamp = amz_date[:8]
+        scope = f"{date_stamp}/{self._region}/{self._service}/aws4_request"
+        signing_key = self._signing_key(date_stamp)
+
+        signed = {'host': self._host}
+        for name, value in (headers or {}).items():
+            signed[name.lower()] = value.strip()
+        signed_headers = ';'.join(sorted(signed))
+        canonical_headers = ''.join(
+            f"{name}:{signed[name]}\n" for name in sorted(signed))
+
+        query = {
+            'X-Amz-Algorithm': 'AWS4-HMAC-SHA256',
+            'X-Amz-Credential': f"{self._access_key}/{scope}",
+            'X-Amz-Date': amz_date,
+            'X-Amz-Expires': str(expires_in),
+            'X-Amz-SignedHeaders': signed_headers,
+        }
+        canonical_query = _canonical_query(query)
+
+        # Everything but the path (and the extra query parameters) is shared
+        # by the whole batch
+        request_prefix = f"{method}\n"
+        request_suffix = f"\n{canonical_query}\n{canonical_headers}\n{signed_headers}\nUNSIGNED-PAYLOAD"
+        string_to_sign_prefix = f"AWS4-HMAC-SHA256\n{amz_date}\n{scope}\n"
+
+        urls = []
+        for index, s3_key in enumerate(s3_keys):
+            path = f"/{self._bucket_name}/{quote(s3_key, safe='/-_.~')}"
+            if queries and queries[index]:
+                canonical_query = _canonical_query({**query, **queries[index]})
+                request_suffix = f"\n{canonical_query}\n{canonical_headers}\n{signed_headers}\nUNSIGNED-PAYLOAD"
+            canonical_request = request_prefix + path + request_suffix
+            string_to_sign = string_to_sign_prefix + \
+                hashlib.sha256(canonical_request.encode()).hexdigest()
+            signature = hmac.new(
+                signing_key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+            urls.append(
+                f"{self._base_url}{path}?{canonical_query}&X-Amz-Signature={signature}")
+        return urls
+
+
+class PresignedUrlCache:
+    """
+    Bounded in-process LRU cache of presigned download URLs.
+
+    Entries are keyed by (s3_key, expires_in) and the same URL is served until
+    it gets within the safety margin of its expiry, so browsers and proxies
+    see a stable URL and can cache the image bytes.
+    """
+
+    def __init__(self, max_size: int, margin: int):
+        self._max_size = max_size
+        self._margin = margin
+        self._entries: OrderedDict[tuple[str, int], tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_many(self, s3_keys: list[str], expires_in: int, now: float) -> dict[str, tuple[str, float]]:
+        """
+        Look up cached URLs that are still valid for long enough
+
+        Returns:
+            Dict mapping each cached S3 key to (url, expires_at timestamp)
+        """
+        # Never require more than half of the URL lifetime to be left
+        margin = min(self._margin, expires_in // 2)
+        found = {}
+        with self._lock:
+            for s3_key in s3_keys:
+                entry = self._entries.get((s3_key, expires_in))
+                if entry is not None and entry[1] - now > margin:
+                    self._entries.move_to_end((s3_key, expires_in))
+                    found[s3_key] = entry
+                    self.hits += 1
+                else:
+                    self.misses += 1
+        return found
+
+    def put_many(self, urls: dict[str, str], expires_in: int, expires_at: float) -> None:
+        """Store freshly signed URLs, evicting the least recently used ones"""
+        if self._max_size <= 0:
+            return
+        with self._lock:
+            for s3_key, url in urls.items():
+                self._entries[(s3_key, expires_in)] = (url, expires_at)
+                self._entries.move_to_end((s3_key, expires_in))
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        """Cache size and hit/miss/eviction counters"""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self._max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
 
 class S3Client:
     def __init__(self):
         self._client: Optional[boto3.client] = None
+        self._presigner: Optional[SigV4Presigner] = None
         self._bucket_name = settings.MINIO_BUCKET
+        self.url_cache = PresignedUrlCache(
+            max_size=settings.PRESIGNED_URL_CACHE_SIZE,
+            margin=settings.PRESIGNED_URL_CACHE_MARGIN
+        )
 
     @property
     def client(self) -> boto3.client:
@@ -18,10 +227,25 @@ class S3Client:
                 endpoint_url=settings.s3_endpoint_url,
                 aws_access_key_id=settings.MINIO_ACCESS_KEY,
                 aws_secret_access_key=settings.MINIO_SECRET_KEY,
-                region_name='us-east-1'  # MinIO doesn't care about region
+                region_name=S3_REGION,
+                # Allow one pooled connection per concurrent batch worker
+                config=Config(max_pool_connections=settings.S3_MAX_CONCURRENCY)
             )
         return self._client
 
+    @property
+    def presigner(self) -> SigV4Presigner:
+        """Lazy initialization of the local presigner, signing against the
+        public endpoint (if configured) so the browser can reach MinIO"""
+        if self._presigner is None:
+            self._presigner = SigV4Presigner(
+                endpoint_url=settings.s3_public_endpoint_url or settings.s3_endpoint_url,
+                bucket_name=self._bucket_name,
+                access_key=settings.MINIO_ACCESS_KEY,
+                secret_key=settings.MINIO_SECRET_KEY
+            )
+        return self._presigner
+
     def is_configured(self) -> bool:
         """Check if S3 configuration is complete"""
         return all([
@@ -82,30 +306,229 @@ class S3Client:
         Returns:
             Presigned URL string or None if failed
         """
+        return self.generate_presigned_upload_urls([(s3_key, content_type)], expires_in)[s3_key]
+
+    def generate_presigned_upload_urls(
+        self,
+        files: list[tuple[str, str]],
+        expires_in: int = 3600,
+        checksums: Optional[dict[str, str]] = None
+    ) -> dict[str, Optional[str]]:
+        """
+        Generate presigned upload URLs for a batch of files in one pass
+
+        The Content-Type header is part of the signature, so the client must
+        send the same MIME type when uploading. So is the x-amz-checksum-sha256
+        header of files with a checksum: S3 then rejects any other content.
+
+        Args:
+            files: List of (s3_key, content_type) tuples
+            expires_in: URL expiration time in seconds (default: 1 hour)
+            checksums: Optional dict mapping S3 keys to the base64 SHA-256 of their content
+
+        Returns:
+            Dict mapping each S3 key to its presigned URL, or None if signing failed
+        """
+        checksums = checksums or {}
+        keys_by_headers: dict[tuple[str, Optional[str]], list[str]] = {}
+        for s3_key, content_type in files:
+            keys_by_headers.setdefault(
+                (content_type, checksums.get(s3_key)), []).append(s3_key)
+
+        urls: dict[str, Optional[str]] = {}
+        for (content_type, checksum), s3_keys in keys_by_headers.items():
+            headers = {'content-type': content_type}
+            if checksum:
+                headers['x-amz-checksum-sha256'] = checksum
+            try:
+                presigned_urls = self.presigner.presign_many(
+                    s3_keys,
+                    method='PUT',
+                    expires_in=expires_in,
+                    headers=headers
+                )
+                urls.update(zip(s3_keys, presigned_urls))
+            except Exception as e:
+                print(f"Error generating presigned upload URLs: {e}")
+                urls.update(dict.fromkeys(s3_keys))
+        return urls
+
+    def create_multipart_upload(self, s3_key: str, content_type: str) -> Optional[str]:
+        """
+        Start a multipart upload
+
+        Args:
+            s3_key: The S3 key (path) where the file will be stored
+            content_type: MIME type of the file
+
+        Returns:
+            Upload ID string or None if failed
+        """
         try:
-            presigned_url = self.client.generate_presigned_url(
-                'put_object',
-                Params={
-                    'Bucket': self._bucket_name,
-                    'Key': s3_key,
-                    'ContentType': content_type
-                },
-                ExpiresIn=expires_in,
-                HttpMethod='PUT'
+            response = self.client.create_multipart_upload(
+                Bucket=self._bucket_name,
+                Key=s3_key,
+                ContentType=content_type
             )
-            # If a public endpoint is configured, rewrite the hostname so the browser can reach MinIO
-            public_base = settings.s3_public_endpoint_url
-            if public_base:
-                from urllib.parse import urlparse, urlunparse
-                u = urlparse(presigned_url)
-                pub = urlparse(public_base)
-                u = u._replace(scheme=pub.scheme, netloc=pub.netloc)
-                presigned_url = urlunparse(u)
-            return presigned_url
+            return response['UploadId']
         except Exception as e:
-            print(f"Error generating presigned upload URL: {e}")
+            print(f"Error creating multipart upload: {e}")
             return None
 
+    def generate_presigned_part_urls(
+        self,
+        s3_key: str,
+        upload_id: str,
+        part_numbers: list[int],
+        expires_in: int = 3600
+    ) -> dict[int, Optional[str]]:
+        """
+        Generate presigned URLs for uploading parts of a multipart upload
+
+        Args:
+            s3_key: The S3 key (path) of the multipart upload
+            upload_id: The multipart upload ID
+            part_numbers: Part numbers to sign (1-based)
+            expires_in: URL expiration time in seconds (default: 1 hour)
+
+        Returns:
+            Dict mapping each part number to its presigned URL, or None if signing failed
+        """
+        part_numbers = list(part_numbers)
+        try:
+            presigned_urls = self.presigner.presign_many(
+                [s3_key] * len(part_numbers),
+                method='PUT',
+                expires_in=expires_in,
+                queries=[{'partNumber': str(part_number), 'uploadId': upload_id}
+                         for part_number in part_numbers]
+            )
+            return dict(zip(part_numbers, presigned_urls))
+        except Exception as e:
+            print(f"Error generating presigned part URLs: {e}")
+            return dict.fromkeys(part_numbers)
+
+    def list_parts(self, s3_key: str, upload_id: str) -> Optional[list[dict]]:
+        """
+        List the parts already uploaded for a multipart upload
+
+        Args:
+            s3_key: The S3 key (path) of the multipart upload
+            upload_id: The multipart upload ID
+
+        Returns:
+            List of dicts with part_number, etag and size, or None if the upload does not exist
+        """
+        try:
+            parts = []
+            paginator = self.client.get_paginator('list_parts')
+            for page in paginator.paginate(Bucket=self._bucket_name, Key=s3_key, UploadId=upload_id):
+                for part in page.get('Parts', []):
+                    parts.append({
+                        "part_number": part['PartNumber'],
+                        "etag": part['ETag'],
+                        "size": part['Size']
+                    })
+            return parts
+        except ClientError:
+            return None
+
+    def complete_multipart_upload(self, s3_key: str, upload_id: str, part_count: int) -> bool:
+        """
+        Complete a multipart upload from the parts stored in S3
+
+        Args:
+            s3_key: The S3 key (path) of the multipart upload
+            upload_id: The multipart upload ID
+            part_count: Expected number of parts; the upload is only completed
+                once parts 1..part_count are all stored
+
+        Returns:
+            True if successful, False otherwise
+        """
+        parts = self.list_parts(s3_key, upload_id)
+        if not parts or {part['part_number'] for part in parts} != set(range(1, part_count + 1)):
+            return False
+
+        try:
+            self.client.complete_multipart_upload(
+                Bucket=self._bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                MultipartUpload={'Parts': [
+                    {'PartNumber': part['part_number'], 'ETag': part['etag']}
+                    for part in parts
+                ]}
+            )
+            return True
+        except ClientError as e:
+            print(f"Error completing multipart upload: {e}")
+            return False
+
+    def complete_multipart_uploads(
+        self,
+        uploads: list[tuple[str, str, int]],
+        max_workers: Optional[int] = None
+    ) -> dict[str, bool]:
+        """
+        Complete many multipart uploads concurrently on a bounded thread pool
+
+        Args:
+            uploads: List of (s3_key, upload_id, part_count) tuples
+            max_workers: Max concurrent requests (default: S3_MAX_CONCURRENCY)
+
+        Returns:
+            Dict mapping each S3 key to True if its upload was completed
+        """
+        if not uploads:
+            return {}
+
+        max_workers = max_workers or settings.S3_MAX_CONCURRENCY
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(uploads))) as executor:
+            results = executor.map(
+                lambda upload: self.complete_multipart_upload(*upload), uploads)
+            return {upload[0]: completed for upload, completed in zip(uploads, results)}
+
+    def abort_multipart_upload(self, s3_key: str, upload_id: str) -> bool:
+        """
+        Abort a multipart upload and free its stored parts
+
+        Args:
+            s3_key: The S3 key (path) of the multipart upload
+            upload_id: The multipart upload ID
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self.client.abort_multipart_upload(
+                Bucket=self._bucket_name, Key=s3_key, UploadId=upload_id)
+            return True
+        except Exception as e:
+            print(f"Error aborting multipart upload: {e}")
+            return False
+
+    def abort_multipart_uploads(self, prefix: str) -> int:
+        """
+        Abort every unfinished multipart upload under a prefix
+
+        Args:
+            prefix: The S3 key prefix of the uploads to abort
+
+        Returns:
+            Number of uploads aborted
+        """
+        aborted = 0
+        try:
+            paginator = self.client.get_paginator("list_multipart_uploads")
+            for page in paginator.paginate(Bucket=self._bucket_name, Prefix=prefix):
+                for upload in page.get("Uploads", []):
+                    if self.abort_multipart_upload(upload["Key"], upload["UploadId"]):
+                        aborted += 1
+        except ClientError as e:
+            print(f"Error listing multipart uploads: {e}")
+        return aborted
+
     def _ensure_bucket_cors(self) -> None:
         """Ensure permissive CORS on the bucket for local dev usage.
         Allows common methods and all origins/headers. Idempotent.
@@ -149,27 +572,56 @@ class S3Client:
         Returns:
             Presigned URL string or None if failed
         """
+        return self.generate_presigned_download_urls([s3_key], expires_in)[s3_key]
+
+    def generate_presigned_download_urls(self, s3_keys: list[str], expires_in: int = 3600) -> dict[str, Optional[str]]:
+        """
+        Generate presigned download URLs for a batch of files in one pass
+
+        Args:
+            s3_keys: The S3 keys (paths) of the files to download
+            expires_in: URL expiration time in seconds (default: 1 hour)
+
+        Returns:
+            Dict mapping each S3 key to its presigned URL, or None if signing failed
+        """
         try:
-            presigned_url = self.client.generate_presigned_url(
-                'get_object',
-                Params={
-                    'Bucket': self._bucket_name,
-                    'Key': s3_key
-                },
-                ExpiresIn=expires_in
-            )
-            # If a public endpoint is configured, rewrite the hostname so the browser can reach MinIO
-            public_base = settings.s3_public_endpoint_url
-            if public_base:
-                from urllib.parse import urlparse, urlunparse
-                u = urlparse(presigned_url)
-                pub = urlparse(public_base)
-                u = u._replace(scheme=pub.scheme, netloc=pub.netloc)
-                presigned_url = urlunparse(u)
-            return presigned_url
+            presigned_urls = self.presigner.presign_many(
+                s3_keys, method='GET', expires_in=expires_in)
+            return dict(zip(s3_keys, presigned_urls))
         except Exception as e:
-            print(f"Error generating presigned download URL: {e}")
-            return None
+            print(f"Error generating presigned download URLs: {e}")
+            return dict.fromkeys(s3_keys)
+
+    def generate_cached_download_urls(self, s3_keys: list[str], expires_in: int = 3600) -> dict[str, tuple[str, int]]:
+        """
+        Presigned download URLs for a batch of files, reusing cached URLs
+
+        Cached URLs are returned until they get close to expiry; only the
+        missing keys are signed, in one batch.
+
+        Args:
+            s3_keys: The S3 keys (paths) of the files to download
+            expires_in: Requested URL lifetime in seconds (default: 1 hour)
+
+        Returns:
+            Dict mapping each S3 key to (url, remaining lifetime in seconds);
+            keys whose URL could not be signed are left out
+        """
+        now = time.time()
+        cached = self.url_cache.get_many(s3_keys, expires_in, now)
+
+        missing = [s3_key for s3_key in s3_keys if s3_key not in cached]
+        if missing:
+            signed = {s3_key: url for s3_key, url
+                      in self.generate_presigned_download_urls(missing, expires_in).items()
+                      if url}
+            self.url_cache.put_many(signed, expires_in, now + expires_in)
+            cached.update((s3_key, (url, now + expires_in))
+                          for s3_key, url in signed.items())
+
+        return {s3_key: (url, int(expires_at - now))
+                for s3_key, (url, expires_at) in cached.items()}
 
     def delete_file(self, s3_key: str) -> bool:
         """
@@ -188,6 +640,61 @@ class S3Client:
             print(f"Error deleting file from S3: {e}")
             return False
 
+    def delete_files(self, s3_keys: list[str], max_workers: Optional[int] = None) -> dict[str, str]:
+        """
+        Delete many files with DeleteObjects requests of up to 1000 keys,
+        sent concurrently on a bounded thread pool
+
+        Args:
+            s3_keys: The S3 keys (paths) of the files to delete
+            max_workers: Max concurrent requests (default: S3_MAX_CONCURRENCY)
+
+        Returns:
+            Dict mapping each S3 key that could not be deleted to its error message
+        """
+        if not s3_keys:
+            return {}
+
+        chunks = [s3_keys[i:i + S3_DELETE_BATCH_SIZE]
+                  for i in range(0, len(s3_keys), S3_DELETE_BATCH_SIZE)]
+        max_workers = max_workers or settings.S3_MAX_CONCURRENCY
+        errors = {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            for chunk_errors in executor.map(self._delete_chunk, chunks):
+                errors.update(chunk_errors)
+        return errors
+
+    def iter_key_pages(self, prefix: str):
+        """
+        List the files under a prefix, one page (up to 1000 keys) at a time
+
+        Args:
+            prefix: The S3 key prefix to list
+
+        Yields:
+            Lists of S3 keys
+        """
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self._bucket_name, Prefix=prefix):
+            keys = [obj["Key"] for obj in page.get("Contents", [])]
+            if keys:
+                yield keys
+
+    def _delete_chunk(self, s3_keys: list[str]) -> dict[str, str]:
+        """Delete up to 1000 files with one DeleteObjects request, returning per-key errors"""
+        try:
+            response = self.client.delete_objects(
+                Bucket=self._bucket_name,
+                Delete={"Objects": [{"Key": s3_key} for s3_key in s3_keys],
+                        "Quiet": True}
+            )
+        except Exception as e:
+            print(f"Error deleting files from S3: {e}")
+            return {s3_key: str(e) for s3_key in s3_keys}
+
+        return {error["Key"]: f"{error.get('Code')}: {error.get('Message')}"
+                for error in response.get("Errors", [])}
+
     def file_exists(self, s3_key: str) -> bool:
         """
         Check if a file exists in S3
@@ -204,6 +711,254 @@ class S3Client:
         except ClientError:
             return False
 
+    def head_objects(self, s3_keys: list[str], max_workers: Optional[int] = None) -> dict[str, Optional[int]]:
+        """
+        Check many files concurrently with HEAD requests on a bounded thread pool
+
+        Args:
+            s3_keys: The S3 keys (paths) to check
+            max_workers: Max concurrent requests (default: S3_MAX_CONCURRENCY)
+
+        Returns:
+            Dict mapping each S3 key to its size in bytes, or None if it does not exist
+        """
+        if not s3_keys:
+            return {}
+
+        max_workers = max_workers or settings.S3_MAX_CONCURRENCY
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(s3_keys))) as executor:
+            sizes = executor.map(self._content_length, s3_keys)
+            return dict(zip(s3_keys, sizes))
+
+    def read_ranges(
+        self,
+        ranges: list[tuple[str, int, int]],
+        max_workers: Optional[int] = None
+    ) -> dict[tuple[str, int, int], Optional[tuple[bytes, int]]]:
+        """
+        Read byte ranges of many files with concurrent ranged GET requests
+
+        Args:
+            ranges: (s3_key, start, length) tuples
+            max_workers: Max concurrent requests (default: S3_MAX_CONCURRENCY)
+
+        Returns:
+            Dict mapping each range to (bytes read, total file size), or None
+            if the file does not exist
+        """
+        if not ranges:
+            return {}
+
+        max_workers = max_workers or settings.S3_MAX_CONCURRENCY
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(ranges))) as executor:
+            results = executor.map(lambda r: self._read_range(*r), ranges)
+            return dict(zip(ranges, results))
+
+    def _read_range(self, s3_key: str, start: int, length: int) -> Optional[tuple[bytes, int]]:
+        """Bytes [start, start + length) of a file and its total size, or None if it does not exist"""
+        try:
+            response = self.client.get_object(
+                Bucket=self._bucket_name, Key=s3_key,
+                Range=f"bytes={start}-{start + length - 1}")
+            data = response["Body"].read()
+        except ClientError:
+            return None
+
+        # "bytes 0-65535/1234567"
+        content_range = response.get("ContentRange")
+        size = int(content_range.rsplit("/", 1)[1]) if content_range \
+            else response.get("ContentLength", len(data))
+        return data, size
+
+    def copy_files(self, copies: list[tuple[str, str]], max_workers: Optional[int] = None) -> dict[str, str]:
+        """
+        Copy many files inside the bucket concurrently, without transferring
+        them through the API (multipart copy for files over 5 GB)
+
+        Args:
+            copies: (source S3 key, destination S3 key) tuples
+            max_workers: Max concurrent copies (default: S3_MAX_CONCURRENCY)
+
+        Returns:
+            Dict mapping each destination key that could not be written to its error message
+        """
+        if not copies:
+            return {}
+
+        def copy(pair):
+            source, destination = pair
+            try:
+                self.client.copy(
+                    {"Bucket": self._bucket_name, "Key": source},
+                    self._bucket_name, destination)
+                return None
+            except Exception as e:
+                print(f"Error copying file in S3: {e}")
+                return str(e)
+
+        max_workers = max_workers or settings.S3_MAX_CONCURRENCY
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(copies))) as executor:
+            errors = executor.map(copy, copies)
+            return {destination: error for (_, destination), error in zip(copies, errors) if error}
+
+    def download_files(self, s3_keys: list[str], max_workers: Optional[int] = None) -> dict[str, Optional[bytes]]:
+        """
+        Download many files concurrently on a bounded thread pool
+
+        Args:
+            s3_keys: The S3 keys (paths) of the files to download
+            max_workers: Max concurrent requests (default: S3_MAX_CONCURRENCY)
+
+        Returns:
+            Dict mapping each S3 key to the file content, or None if it does not exist
+        """
+        if not s3_keys:
+            return {}
+
+        max_workers = max_workers or settings.S3_MAX_CONCURRENCY
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(s3_keys))) as executor:
+            contents = executor.map(self._download_file, s3_keys)
+            return dict(zip(s3_keys, contents))
+
+    def _download_file(self, s3_key: str) -> Optional[bytes]:
+        """Content of a file, or None if it does not exist"""
+        try:
+            response = self.client.get_object(Bucket=self._bucket_name, Key=s3_key)
+            return response["Body"].read()
+        except ClientError:
+            return None
+
+    def open_stream(self, s3_key: str, chunk_size: int = 1024 * 1024) -> Optional[tuple[int, Iterator[bytes]]]:
+        """
+        Read a file as a stream of chunks, without loading it whole
+
+        Args:
+            s3_key: The S3 key (path) of the file
+            chunk_size: Size of the chunks in bytes (default: 1 MiB)
+
+        Returns:
+            (file size, chunks) or None if the file does not exist
+        """
+        try:
+            response = self.client.get_object(Bucket=self._bucket_name, Key=s3_key)
+            return response["ContentLength"], response["Body"].iter_chunks(chunk_size)
+        except ClientError:
+            return None
+
+    def upload_files(
+        self,
+        files: dict[str, bytes],
+        content_type: str,
+        cache_control: Optional[str] = None,
+        max_workers: Optional[int] = None
+    ) -> dict[str, str]:
+        """
+        Upload many files concurrently on a bounded thread pool
+
+        Args:
+            files: Dict mapping S3 keys to file contents
+            content_type: MIME type of the files
+            cache_control: Optional Cache-Control header served with the files
+            max_workers: Max concurrent requests (default: S3_MAX_CONCURRENCY)
+
+        Returns:
+            Dict mapping each S3 key that could not be uploaded to its error message
+        """
+        if not files:
+            return {}
+
+        extra = {"CacheControl": cache_control} if cache_control else {}
+
+        def upload(item):
+            s3_key, body = item
+            try:
+                self.client.put_object(
+                    Bucket=self._bucket_name, Key=s3_key, Body=body,
+                    ContentType=content_type, **extra)
+                return None
+            except Exception as e:
+                print(f"Error uploading file to S3: {e}")
+                return str(e)
+
+        max_workers = max_workers or settings.S3_MAX_CONCURRENCY
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(files))) as executor:
+            errors = executor.map(upload, files.items())
+            return {s3_key: error for s3_key, error in zip(files, errors) if error}
+
+    def upload_stream(
+        self,
+        s3_key: str,
+        chunks: Iterator[bytes],
+        content_type: str,
+        on_part: Optional[Callable[[int, int], None]] = None
+    ) -> Optional[int]:
+        """
+        Upload a file produced as a stream of chunks with a multipart upload,
+        holding at most one part (MULTIPART_PART_SIZE) in memory
+
+        Args:
+            s3_key: The S3 key (path) where the file will be stored
+            chunks: The file contents, in order
+            content_type: MIME type of the file
+            on_part: Optional callback (part count, bytes uploaded) after each part
+
+        Returns:
+            Size of the file in bytes, or None if the upload failed (it is
+            aborted; errors raised by chunks propagate after the abort)
+        """
+        upload_id = self.create_multipart_upload(s3_key, content_type)
+        if upload_id is None:
+            return None
+
+        parts = []
+        size = 0
+        buffer = bytearray()
+
+        def upload_part(data: bytes) -> None:
+            nonlocal size
+            response = self.client.upload_part(
+                Bucket=self._bucket_name, Key=s3_key, UploadId=upload_id,
+                PartNumber=len(parts) + 1, Body=data)
+            parts.append({'PartNumber': len(parts) + 1, 'ETag': response['ETag']})
+            size += len(data)
+            if on_part:
+                on_part(len(parts), size)
+
+        try:
+            for chunk in chunks:
+                buffer += chunk
+                if len(buffer) >= settings.MULTIPART_PART_SIZE:
+                    upload_part(bytes(buffer))
+                    buffer.clear()
+            # The last part may be smaller than the S3 minimum, and is needed
+            # even when empty since an upload has at least one part
+            if buffer or not parts:
+                upload_part(bytes(buffer))
+
+            self.client.complete_multipart_upload(
+                Bucket=self._bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                MultipartUpload={'Parts': parts}
+            )
+            return size
+        except ClientError as e:
+            print(f"Error uploading stream to S3: {e}")
+            self.abort_multipart_upload(s3_key, upload_id)
+            return None
+        except BaseException:
+            self.abort_multipart_upload(s3_key, upload_id)
+            raise
+
+    def _content_length(self, s3_key: str) -> Optional[int]:
+        """Size of a file in bytes from a HEAD request, or None if it does not exist"""
+        try:
+            response = self.client.head_object(
+                Bucket=self._bucket_name, Key=s3_key)
+            return response.get('ContentLength')
+        except ClientError:
+            return None
+
 
 # Global S3 client instance
 s3_client = S3Client()
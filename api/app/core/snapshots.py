@@ -0,0 +1,86 @@
+from typing import Iterator
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Bumped when the layout of the parts changes, so every part is rewritten
+SNAPSHOT_VERSION = 2
+
+# One row per uploaded image, its boxes as (xmin, ymin, xmax, ymax) in
+# annotation ID order, label_ids[i] being the label of boxes[i]
+SNAPSHOT_SCHEMA = pa.schema([
+    pa.field("image_id", pa.int32(), nullable=False),
+    pa.field("s3_key", pa.string(), nullable=False),
+    pa.field("width", pa.int32()),
+    pa.field("height", pa.int32()),
+    pa.field("split", pa.string()),
+    pa.field("label_ids", pa.list_(pa.int32()), nullable=False),
+    pa.field("boxes", pa.list_(pa.list_(pa.int32(), 4)), nullable=False),
+])
+
+
+def snapshot_batch(images: list[tuple], boxes: np.ndarray) -> pa.RecordBatch:
+    """
+    Record batch of images given as (image_id, s3_key, width, height, split) rows
+    in ID order and their boxes as an (n, 6) array of (image_id, label_id,
+    xmin, ymin, xmax, ymax) rows sorted by image: list columns are built
+    from offsets, without a Python object per box
+    """
+    image_ids = np.fromiter((image[0] for image in images), dtype=np.int32, count=len(images))
+    offsets = np.searchsorted(boxes[:, 0], image_ids).astype(np.int32)
+    offsets = np.append(offsets, np.int32(len(boxes)))
+    coordinates = pa.FixedSizeListArray.from_arrays(
+        pa.array(boxes[:, 2:].astype(np.int32).ravel()), 4)
+    return pa.RecordBatch.from_arrays([
+        pa.array(image_ids),
+        pa.array([image[1] for image in images], pa.string()),
+        pa.array([image[2] for image in images], pa.int32()),
+        pa.array([image[3] for image in images], pa.int32()),
+        pa.array([image[4] for image in images], pa.string()),
+        pa.ListArray.from_arrays(pa.array(offsets), pa.array(boxes[:, 1].astype(np.int32))),
+        pa.ListArray.from_arrays(pa.array(offsets), coordinates),
+    ], schema=SNAPSHOT_SCHEMA)
+
+
+def write_arrow(batches: Iterator[pa.RecordBatch]) -> pa.Buffer:
+    """
+    Arrow IPC file of record batches, uncompressed so it can be
+    memory-mapped and its columns read without copies
+    """
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, SNAPSHOT_SCHEMA) as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+    return sink.getvalue()
+
+
+def write_parquet(batches: Iterator[pa.RecordBatch]) -> pa.Buffer:
+    """Parquet file of record batches (zstd), one row group per batch"""
+    sink = pa.BufferOutputStream()
+    with pq.ParquetWriter(sink, SNAPSHOT_SCHEMA, compression="zstd") as writer:
+        for batch in batches:
+            writer.write_batch(batch)
+    return sink.getvalue()
+
+
+def open_arrow_part(path: str) -> pa.ipc.RecordBatchFileReader:
+    """Memory-map a downloaded Arrow part: its batches are views on the file"""
+    return pa.ipc.open_file(pa.memory_map(path, "r"))
+
+
+def batch_columns(batch: pa.RecordBatch) -> dict:
+    """
+    Zero-copy NumPy views of the columns of a snapshot batch, for data
+    loaders: the boxes and labels of image i are boxes[offsets[i]:offsets[i + 1]]
+    and label_ids[offsets[i]:offsets[i + 1]]. s3_keys stays an Arrow array.
+    """
+    boxes = batch.column("boxes")
+    offsets = boxes.offsets.to_numpy(zero_copy_only=True)
+    return {
+        "image_ids": batch.column("image_id").to_numpy(zero_copy_only=True),
+        "s3_keys": batch.column("s3_key"),
+        "offsets": offsets - offsets[0] if offsets[0] else offsets,
+        "label_ids": batch.column("label_ids").flatten().to_numpy(zero_copy_only=True),
+        "boxes": boxes.flatten().flatten().to_numpy(zero_copy_only=True).reshape(-1, 4),
+    }
@@ -0,0 +1,77 @@
+from typing import Sequence
+
+import numpy as np
+
+# SplitMix64 constants
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+def seeded_uniform(keys: np.ndarray, seed: int) -> np.ndarray:
+    """
+    Uniform values in [0, 1) that depend only on each key and the seed
+    (SplitMix64), so an item keeps its draw whatever else is in the dataset
+    """
+    with np.errstate(over="ignore"):
+        z = keys.astype(np.uint64) + np.uint64(seed % 2 ** 64) * _GOLDEN + _GOLDEN
+        z = (z ^ (z >> np.uint64(30))) * _MIX_1
+        z = (z ^ (z >> np.uint64(27))) * _MIX_2
+        z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) / 2.0 ** 53
+
+
+def assign_splits(
+    group_keys: np.ndarray,
+    group_sizes: np.ndarray,
+    group_labels: np.ndarray,
+    ratios: Sequence[float],
+    seed: int
+) -> np.ndarray:
+    """
+    Split index of every group of images, stratified by label
+
+    Args:
+        group_keys: Stable integer key of each group (e.g. its lowest image ID)
+        group_sizes: Number of images of each group
+        group_labels: (n, 2) array of distinct (group position, label_id) pairs
+        ratios: Target share of the images for each split
+        seed: Seed of the draws
+
+    Each group joins the stratum of its rarest label (the label found in the
+    fewest groups), groups without annotations a stratum of their own. In a
+    stratum, groups are shuffled by a seeded draw on their key, laid end to
+    end by image count, and cut at the cumulative ratios from a seeded
+    random start (systematic sampling): every split gets its share of the
+    images of every stratum, to within one group, and small strata go to
+    each split with a probability equal to its ratio.
+    """
+    count = len(group_keys)
+    strata = np.zeros(count, dtype=np.int64)
+    if len(group_labels):
+        label_ids, label_index = np.unique(group_labels[:, 1], return_inverse=True)
+        frequency = np.bincount(label_index)
+        # First pair of each group by (frequency, label ID): its rarest label
+        order = np.lexsort((group_labels[:, 1], frequency[label_index], group_labels[:, 0]))
+        groups = group_labels[order, 0]
+        first = order[np.r_[True, groups[1:] != groups[:-1]]]
+        strata[group_labels[first, 0]] = group_labels[first, 1]
+
+    order = np.lexsort((seeded_uniform(group_keys, seed), strata))
+    sorted_strata = strata[order]
+    sizes = group_sizes[order].astype(np.float64)
+    starts = np.r_[True, sorted_strata[1:] != sorted_strata[:-1]] if count else np.empty(0, dtype=bool)
+    stratum = np.cumsum(starts) - 1
+
+    # Middle of each group along its stratum, as a share of the stratum's
+    # images, shifted by the stratum's random start
+    before = np.cumsum(sizes) - sizes
+    before -= before[starts][stratum]
+    totals = np.bincount(stratum, weights=sizes)
+    offsets = seeded_uniform(sorted_strata[starts], seed + 1)
+    position = ((before + sizes / 2) / totals[stratum] + offsets[stratum]) % 1.0
+
+    bounds = np.cumsum(ratios) / np.sum(ratios)
+    result = np.empty(count, dtype=np.int64)
+    result[order] = np.minimum(np.searchsorted(bounds, position, side="right"), len(ratios) - 1)
+    return result
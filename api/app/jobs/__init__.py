@@ -0,0 +1,18 @@
+"""
+Background jobs for LabelLoop API.
+
+Handlers are registered by kind with @job_handler and run by the worker
+processes (python -m app.commands.worker), which claim jobs from the jobs
+table. Queue a job with JobService.enqueue(kind, payload).
+"""
+
+from .registry import JobContext, get_handler, job_handler, run_job, schedule_periodic_jobs
+from . import handlers  # noqa: F401 (registers the handlers)
+
+__all__ = [
+    "JobContext",
+    "get_handler",
+    "job_handler",
+    "run_job",
+    "schedule_periodic_jobs"
+]
@@ -0,0 +1,146 @@
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.jobs.registry import JobContext, job_handler
+from app.model.dataset_deletion import DeletionStatus
+from app.schema.export import ExportFormat
+from app.schema.snapshot import SnapshotFormat
+from app.schema.split import SplitRequest
+from app.services.dataset_deletion_service import DatasetDeletionService
+from app.services.export_service import ExportService
+from app.services.image_service import ImageService
+from app.services.import_service import ImportService
+from app.services.near_duplicate_service import NearDuplicateService
+from app.services.snapshot_service import write_snapshot
+from app.services.split_service import write_splits
+from app.services.version_service import write_version
+
+
+@job_handler("dataset.delete")
+def delete_dataset(ctx: JobContext) -> dict:
+    """Purge the S3 objects and rows of a dataset being deleted"""
+    deletion = DatasetDeletionService(ctx.db).run_deletion(
+        ctx.payload["deletion_id"], on_progress=ctx.progress)
+    if not deletion:
+        raise ValueError(f"Dataset deletion {ctx.payload['deletion_id']} not found")
+
+    result = {
+        "dataset_id": deletion.dataset_id,
+        "rows_deleted": deletion.rows_deleted,
+        "objects_deleted": deletion.objects_deleted,
+        "error_count": deletion.error_count,
+    }
+    if deletion.status == DeletionStatus.FAILED:
+        raise RuntimeError(deletion.last_error or "Dataset deletion failed")
+    return result
+
+
+@job_handler("dataset.purge_images")
+def purge_dataset_images(ctx: JobContext) -> dict:
+    """Delete all images of a dataset (from DB and S3)"""
+    return ImageService(ctx.db).delete_all_dataset_images(ctx.payload["dataset_id"])
+
+
+@job_handler("dataset.export")
+def export_dataset(ctx: JobContext) -> dict:
+    """Write an annotation export of a dataset to S3"""
+    return ExportService(ctx.db).export_to_s3(
+        ctx.payload["dataset_id"],
+        ExportFormat(ctx.payload["format"]),
+        on_progress=ctx.progress
+    )
+
+
+@job_handler("dataset.import_coco")
+def import_coco(ctx: JobContext) -> dict:
+    """Import the images and annotations of a COCO file stored in S3"""
+    # The import runs in its own session: progress updates commit ctx.db,
+    # which would end the import transaction and drop its staging tables
+    db = SessionLocal()
+    try:
+        return ImportService(db).import_coco(
+            ctx.payload["dataset_id"],
+            ctx.payload["annotations_key"],
+            ctx.payload["image_prefix"],
+            on_progress=ctx.progress
+        )
+    finally:
+        db.close()
+
+
+@job_handler("dataset.snapshot")
+def snapshot_dataset(ctx: JobContext) -> dict:
+    """Bring the columnar snapshot of a dataset up to date in S3"""
+    return write_snapshot(
+        ctx.payload["dataset_id"],
+        SnapshotFormat(ctx.payload["format"]),
+        on_progress=ctx.progress
+    )
+
+
+@job_handler("dataset.version")
+def version_dataset(ctx: JobContext) -> dict:
+    """Record the current state of a dataset as a new version"""
+    return write_version(
+        ctx.payload["dataset_id"],
+        ctx.payload["message"],
+        on_progress=ctx.progress
+    )
+
+
+@job_handler("dataset.split")
+def split_dataset(ctx: JobContext) -> dict:
+    """Assign the images of a dataset to train/val/test splits"""
+    payload = dict(ctx.payload)
+    dataset_id = payload.pop("dataset_id")
+    return write_splits(dataset_id, SplitRequest(**payload), on_progress=ctx.progress)
+
+
+@job_handler("dataset.near_duplicates")
+def group_near_duplicates(ctx: JobContext) -> dict:
+    """Compute and store the groups of near-duplicate images of a dataset"""
+    # No progress updates: they commit ctx.db, which would release the
+    # advisory lock serializing the runs for the dataset and distance
+    return NearDuplicateService(ctx.db).compute_groups(
+        ctx.payload["dataset_id"], ctx.payload["max_distance"])
+
+
+@job_handler("images.confirm_upload")
+def confirm_upload(ctx: JobContext) -> dict:
+    """Confirm a batch of uploads"""
+    image_ids = ctx.payload["image_ids"]
+    updated_count = ImageService(ctx.db).confirm_upload(
+        image_ids, ctx.payload.get("dataset_id"))
+    return {"updated_count": updated_count, "total_requested": len(image_ids)}
+
+
+@job_handler("images.copy_content")
+def copy_image_content(ctx: JobContext) -> dict:
+    """Copy deduplicated content from another dataset and confirm the images"""
+    return ImageService(ctx.db).copy_stored_content(ctx.payload["image_ids"])
+
+
+@job_handler("images.reap_stale_uploads", every=settings.UPLOAD_REAPER_INTERVAL)
+def reap_stale_uploads(ctx: JobContext) -> dict:
+    """Promote, flag or delete images stuck in 'uploading'"""
+    return ImageService(ctx.db).reap_stale_uploads(
+        action=ctx.payload.get("action"), on_progress=ctx.progress)
+
+
+@job_handler("images.probe_metadata")
+def probe_image_metadata(ctx: JobContext) -> dict:
+    """Fill width, height and real size of uploaded images from their headers"""
+    return ImageService(ctx.db).probe_image_metadata(
+        image_ids=ctx.payload.get("image_ids"),
+        dataset_id=ctx.payload.get("dataset_id"),
+        on_progress=ctx.progress
+    )
+
+
+@job_handler("images.generate_derivatives")
+def generate_image_derivatives(ctx: JobContext) -> dict:
+    """Render the thumbnail and preview of uploaded images"""
+    return ImageService(ctx.db).generate_derivatives(
+        image_ids=ctx.payload.get("image_ids"),
+        dataset_id=ctx.payload.get("dataset_id"),
+        on_progress=ctx.progress
+    )
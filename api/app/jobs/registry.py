@@ -0,0 +1,106 @@
+from sqlalchemy.orm import Session
+from typing import Callable, Dict, Optional
+import threading
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.model.job import Job
+from app.services.job_service import JobService
+
+_handlers: Dict[str, Callable[["JobContext"], Optional[dict]]] = {}
+# Interval (seconds) of the periodic job kinds
+_periodic: Dict[str, int] = {}
+
+
+class JobContext:
+    """What a handler gets to run a job: the DB session, the payload and a progress reporter"""
+
+    def __init__(self, db: Session, job: Job):
+        self.db = db
+        self.job = job
+        self.payload = job.payload or {}
+
+    def progress(self, **values) -> None:
+        """Publish progress values on the job (commits the session)"""
+        JobService(self.db).set_progress(self.job, **values)
+
+
+def job_handler(kind: str, every: Optional[int] = None):
+    """
+    Register the decorated function as the handler of a job kind
+
+    With every (seconds), the workers also queue the job periodically.
+    """
+    def register(handler):
+        _handlers[kind] = handler
+        if every:
+            _periodic[kind] = every
+        return handler
+    return register
+
+
+def get_handler(kind: str) -> Optional[Callable[[JobContext], Optional[dict]]]:
+    """Get the handler registered for a job kind"""
+    return _handlers.get(kind)
+
+
+def schedule_periodic_jobs(db: Session) -> None:
+    """Queue the next run of every periodic job kind that has none pending"""
+    jobs = JobService(db)
+    for kind, interval in _periodic.items():
+        jobs.schedule_periodic(kind, interval)
+
+
+def _send_heartbeats(job_id: int, worker_id: str, stop: threading.Event) -> None:
+    """
+    Refresh the heartbeat of a running job every JOB_HEARTBEAT_INTERVAL
+    seconds until stop is set, with a session of its own: a handler that
+    reports no progress for a while is not taken for a dead worker
+    """
+    db = SessionLocal()
+    try:
+        while not stop.wait(settings.JOB_HEARTBEAT_INTERVAL):
+            try:
+                if not JobService(db).heartbeat(job_id, worker_id):
+                    return
+            except Exception as e:
+                db.rollback()
+                print(f"Error refreshing heartbeat of job {job_id}: {e}")
+    finally:
+        db.close()
+
+
+def run_job(db: Session, job: Job) -> None:
+    """
+    Run a claimed job and record its outcome
+
+    The handler's return value becomes the job result; any exception is a
+    failed attempt, retried with backoff while attempts remain. The outcome
+    is only recorded while the job is still held by this worker.
+    """
+    jobs = JobService(db)
+    # Read now: once the handler commits, the job row may be reloaded
+    # after another worker claimed it
+    worker_id = job.locked_by
+    handler = get_handler(job.kind)
+    if handler is None:
+        jobs.fail(job, worker_id, f"No handler for job kind '{job.kind}'", retry=False)
+        return
+
+    stop = threading.Event()
+    heartbeats = threading.Thread(target=_send_heartbeats, args=(job.id, worker_id, stop), daemon=True)
+    heartbeats.start()
+    try:
+        result = handler(JobContext(db, job))
+    except Exception as e:
+        db.rollback()
+        print(f"Error running job {job.id} ({job.kind}): {e}")
+        recorded = jobs.fail(job, worker_id, str(e) or e.__class__.__name__)
+    else:
+        recorded = jobs.succeed(job, worker_id, result)
+    finally:
+        stop.set()
+        heartbeats.join()
+
+    if not recorded:
+        print(f"Job {job.id} ({job.kind}) was taken over by another worker, outcome dropped")
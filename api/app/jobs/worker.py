@@ -0,0 +1,78 @@
+import multiprocessing
+import os
+import signal
+import socket
+import time
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.jobs.registry import run_job, schedule_periodic_jobs
+from app.services.job_service import JobService
+
+# How often each worker requeues running jobs without heartbeat and
+# queues the periodic jobs (seconds)
+MAINTENANCE_INTERVAL = 60
+
+
+def work(stop_event, parent_pid: int) -> None:
+    """
+    Worker process loop: claim and run jobs until stop_event is set (or the
+    parent process is gone)
+
+    The current job is always finished before stopping.
+    """
+    # Connections inherited from the parent process must not be reused
+    engine.dispose(close=False)
+    # Only the parent reacts to signals, it then sets stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    db = SessionLocal()
+    jobs = JobService(db)
+    last_maintenance = 0.0
+    try:
+        while not stop_event.is_set() and os.getppid() == parent_pid:
+            if time.monotonic() - last_maintenance > MAINTENANCE_INTERVAL:
+                jobs.requeue_stale()
+                schedule_periodic_jobs(db)
+                last_maintenance = time.monotonic()
+
+            job = jobs.claim(worker_id)
+            if not job:
+                stop_event.wait(settings.JOB_POLL_INTERVAL)
+                continue
+
+            run_job(db, job)
+    finally:
+        db.close()
+
+
+def run_workers(processes: int) -> None:
+    """Run worker processes until SIGINT/SIGTERM, restarting any that dies"""
+    stop_event = multiprocessing.Event()
+
+    def stop(signum, frame):
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    def start():
+        process = multiprocessing.Process(
+            target=work, args=(stop_event, os.getpid()))
+        process.start()
+        return process
+
+    workers = [start() for _ in range(processes)]
+    print(f"Started {processes} job workers")
+    while not stop_event.is_set():
+        stop_event.wait(1)
+        for i, process in enumerate(workers):
+            if not process.is_alive() and not stop_event.is_set():
+                print(f"Job worker {process.pid} exited ({process.exitcode}), restarting it")
+                workers[i] = start()
+
+    for process in workers:
+        process.join()
+    print("Job workers stopped")
@@ -3,7 +3,8 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.router import api_router
 from app.core.database import engine
-from app.model import Annotation, Dataset, Image, Label
+from app.model import (Annotation, Dataset, DatasetDeletion, DatasetVersion, Image, Job, Label,
+                       NearDuplicateGrouping)
 
 
 # Créer les tables de base de données
@@ -11,6 +12,10 @@ Dataset.metadata.create_all(bind=engine)
 Image.metadata.create_all(bind=engine)
 Label.metadata.create_all(bind=engine)
 Annotation.metadata.create_all(bind=engine)
+DatasetDeletion.metadata.create_all(bind=engine)
+Job.metadata.create_all(bind=engine)
+DatasetVersion.metadata.create_all(bind=engine)
+NearDuplicateGrouping.metadata.create_all(bind=engine)
 
 
 app = FastAPI(
@@ -32,6 +37,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(api_router)
@@ -2,5 +2,11 @@ from .dataset import Dataset
 from .image import Image
 from .label import Label
 from .annotation import Annotation
+from .dataset_deletion import DatasetDeletion
+from .job import Job
+from .dataset_version import DatasetVersion, VersionImage, VersionLabel, VersionAnnotation
+from .near_duplicate import NearDuplicateGrouping, NearDuplicateGroup
 
-__all__ = ["Dataset", "Image", "Label", "Annotation"]
+__all__ = ["Dataset", "Image", "Label", "Annotation", "DatasetDeletion", "Job",
+           "DatasetVersion", "VersionImage", "VersionLabel", "VersionAnnotation",
+           "NearDuplicateGrouping", "NearDuplicateGroup"]
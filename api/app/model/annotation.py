@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -28,3 +28,17 @@ class Annotation(Base):
 
     # Relation vers Label (many-to-one)
     label_obj = relationship("Label", back_populates="annotations")
+
+
+# Boîte PostgreSQL (type box) d'une annotation, NULL si une coordonnée manque.
+# Les requêtes spatiales doivent utiliser cette expression telle quelle pour
+# profiter des index ci-dessous.
+annotation_box = func.box(
+    func.point(Annotation.bbox_xmin, Annotation.bbox_ymin),
+    func.point(Annotation.bbox_xmax, Annotation.bbox_ymax))
+
+# Boîtes qui recoupent ou sont contenues dans une région (&&, <@) ; SP-GiST
+# (quadtree de boîtes) coûte moins cher en écriture que GiST
+Index("ix_annotations_box", annotation_box, postgresql_using="spgist")
+# Filtres par surface (petites ou grandes boîtes)
+Index("ix_annotations_box_area", func.area(annotation_box))
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Table, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, Table, ForeignKey, Index, Enum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+import enum
 
 
 # Table de liaison many-to-many entre datasets et labels
@@ -13,17 +14,46 @@ dataset_labels = Table(
 )
 
 
+class DatasetStatus(str, enum.Enum):
+    """Dataset lifecycle status"""
+    ACTIVE = "active"
+    DELETING = "deleting"
+
+
 class Dataset(Base):
     __tablename__ = "datasets"
+    __table_args__ = (
+        # Keyset pagination on the sortable columns
+        Index("ix_datasets_name_id", "name", "id"),
+        Index("ix_datasets_created_at_id", "created_at", "id"),
+        Index("ix_datasets_image_count_id", "image_count", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
     description = Column(Text, nullable=True)
+    # Un dataset en cours de suppression est masqué des listes et du détail
+    status = Column(Enum(DatasetStatus), nullable=False,
+                    default=DatasetStatus.ACTIVE, server_default=DatasetStatus.ACTIVE.name)
     created_at = Column(DateTime(timezone=True),
                         server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(
     ), onupdate=func.now(), nullable=False)
 
+    # Compteurs maintenus par les écritures sur images, annotations et labels
+    # (voir DatasetCounterService, recalculables avec app.commands.recount_datasets)
+    image_count = Column(Integer, nullable=False, default=0, server_default="0")
+    uploading_count = Column(Integer, nullable=False,
+                             default=0, server_default="0")
+    uploaded_count = Column(Integer, nullable=False,
+                            default=0, server_default="0")
+    error_count = Column(Integer, nullable=False, default=0, server_default="0")
+    annotation_count = Column(Integer, nullable=False,
+                              default=0, server_default="0")
+    label_count = Column(Integer, nullable=False, default=0, server_default="0")
+    total_bytes = Column(BigInteger, nullable=False,
+                         default=0, server_default="0")
+
     # Relation vers Image (one-to-many)
     images = relationship("Image", back_populates="dataset",
                           cascade="all, delete-orphan")
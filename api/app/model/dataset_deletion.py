@@ -0,0 +1,35 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+import enum
+
+
+class DeletionStatus(str, enum.Enum):
+    """Dataset deletion status"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class DatasetDeletion(Base):
+    __tablename__ = "dataset_deletions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Pas de clé étrangère : la ligne survit à la suppression du dataset
+    dataset_id = Column(Integer, nullable=False, index=True)
+    dataset_name = Column(String(255), nullable=False)
+    status = Column(Enum(DeletionStatus), nullable=False,
+                    default=DeletionStatus.PENDING)
+    # Job qui exécute la suppression (voir app.jobs)
+    job_id = Column(Integer, ForeignKey("jobs.id"), nullable=True)
+    image_total = Column(Integer, nullable=False, default=0)
+    rows_deleted = Column(Integer, nullable=False, default=0)
+    objects_deleted = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True),
+                        server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(
+    ), onupdate=func.now(), nullable=False)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,96 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, Index, UniqueConstraint, text
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class DatasetVersion(Base):
+    __tablename__ = "dataset_versions"
+    __table_args__ = (
+        UniqueConstraint("dataset_id", "number", name="uq_dataset_versions_dataset_id_number"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    dataset_id = Column(Integer, ForeignKey("datasets.id"), nullable=False, index=True)
+    # Numéro de version dans le dataset : 1, 2, 3...
+    number = Column(Integer, nullable=False)
+    message = Column(Text, nullable=True)
+    # Contenu de la version et nombre de lignes changées depuis la précédente
+    image_count = Column(Integer, nullable=False, default=0)
+    label_count = Column(Integer, nullable=False, default=0)
+    annotation_count = Column(Integer, nullable=False, default=0)
+    change_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True),
+                        server_default=func.now(), nullable=False)
+
+
+# Les tables version_* enregistrent les différences entre versions : une ligne
+# par état d'une image, d'un label ou d'une annotation, valable des versions
+# added_in (incluse) à removed_in (exclue, NULL tant qu'il est toujours
+# courant). Une version n'écrit que les lignes qui ont changé ; l'état d'une
+# version v est l'ensemble des lignes telles que added_in <= v < removed_in,
+# et le diff entre deux versions ne lit que les lignes ajoutées ou fermées
+# entre elles (index sur added_in et removed_in). Pas de clé étrangère vers
+# les images, labels et annotations : les versions leur survivent.
+
+class VersionImage(Base):
+    __tablename__ = "version_images"
+    __table_args__ = (
+        Index("ix_version_images_dataset_id_image_id", "dataset_id", "image_id"),
+        Index("ix_version_images_dataset_id_added_in", "dataset_id", "added_in"),
+        Index("ix_version_images_dataset_id_removed_in", "dataset_id", "removed_in"),
+        # Un seul état courant par image
+        Index("uq_version_images_current", "dataset_id", "image_id", unique=True,
+              postgresql_where=text("removed_in IS NULL")),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    dataset_id = Column(Integer, ForeignKey("datasets.id"), nullable=False)
+    image_id = Column(Integer, nullable=False)
+    filename = Column(String(255), nullable=False)
+    s3_key = Column(String(500), nullable=False)
+    width = Column(Integer, nullable=True)
+    height = Column(Integer, nullable=True)
+    content_sha256 = Column(String(64), nullable=True)
+    added_in = Column(Integer, nullable=False)
+    removed_in = Column(Integer, nullable=True)
+
+
+class VersionLabel(Base):
+    __tablename__ = "version_labels"
+    __table_args__ = (
+        Index("ix_version_labels_dataset_id_label_id", "dataset_id", "label_id"),
+        Index("ix_version_labels_dataset_id_added_in", "dataset_id", "added_in"),
+        Index("ix_version_labels_dataset_id_removed_in", "dataset_id", "removed_in"),
+        Index("uq_version_labels_current", "dataset_id", "label_id", unique=True,
+              postgresql_where=text("removed_in IS NULL")),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    dataset_id = Column(Integer, ForeignKey("datasets.id"), nullable=False)
+    label_id = Column(Integer, nullable=False)
+    name = Column(String(255), nullable=False)
+    added_in = Column(Integer, nullable=False)
+    removed_in = Column(Integer, nullable=True)
+
+
+class VersionAnnotation(Base):
+    __tablename__ = "version_annotations"
+    __table_args__ = (
+        Index("ix_version_annotations_dataset_id_annotation_id", "dataset_id", "annotation_id"),
+        Index("ix_version_annotations_dataset_id_added_in", "dataset_id", "added_in"),
+        Index("ix_version_annotations_dataset_id_removed_in", "dataset_id", "removed_in"),
+        Index("uq_version_annotations_current", "dataset_id", "annotation_id", unique=True,
+              postgresql_where=text("removed_in IS NULL")),
+    )
+
+    id = Column(BigInteger, primary_key=True)
+    dataset_id = Column(Integer, ForeignKey("datasets.id"), nullable=False)
+    annotation_id = Column(Integer, nullable=False)
+    image_id = Column(Integer, nullable=False)
+    label_id = Column(Integer, nullable=False)
+    bbox_xmin = Column(Integer, nullable=True)
+    bbox_ymin = Column(Integer, nullable=True)
+    bbox_xmax = Column(Integer, nullable=True)
+    bbox_ymax = Column(Integer, nullable=True)
+    added_in = Column(Integer, nullable=False)
+    removed_in = Column(Integer, nullable=True)
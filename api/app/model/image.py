@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Enum, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -12,18 +12,48 @@ class ImageStatus(str, enum.Enum):
     ERROR = "error"
 
 
+class DerivativeStatus(str, enum.Enum):
+    """Generation status of the thumbnail and preview of an image"""
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+
+
 class Image(Base):
     __tablename__ = "images"
+    __table_args__ = (
+        # Keyset pagination of a dataset's images, optionally filtered by status
+        Index("ix_images_dataset_id_id", "dataset_id", "id"),
+        Index("ix_images_dataset_id_status_id", "dataset_id", "status", "id"),
+        # Images of a split of a dataset
+        Index("ix_images_dataset_id_split_id", "dataset_id", "split", "id"),
+        # Stale upload reaper: oldest 'uploading' rows only
+        Index("ix_images_uploading_created_at", "created_at",
+              postgresql_where=text("status = 'UPLOADING'")),
+        # Content deduplication: equality lookups only
+        Index("ix_images_content_sha256", "content_sha256",
+              postgresql_using="hash"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     filename = Column(String(255), nullable=False)
     s3_key = Column(String(500), nullable=False, unique=True, index=True)
-    file_size = Column(Integer, nullable=False)
+    file_size = Column(BigInteger, nullable=False)
     mime_type = Column(String(100), nullable=False)
     width = Column(Integer, nullable=True)
     height = Column(Integer, nullable=True)
     status = Column(Enum(ImageStatus), nullable=False,
                     default=ImageStatus.UPLOADING)
+    content_sha256 = Column(String(64), nullable=True,
+                            comment="SHA-256 of the content (hex), enforced by S3 at upload time")
+    upload_id = Column(String(255), nullable=True,
+                       comment="S3 multipart upload ID while a multipart upload is in progress")
+    derivative_status = Column(Enum(DerivativeStatus), nullable=True,
+                               comment="Thumbnail/preview generation status, NULL until requested")
+    dhash = Column(BigInteger, nullable=True,
+                   comment="64-bit perceptual difference hash (signed), for near-duplicate detection")
+    split = Column(String(50), nullable=True,
+                   comment="Training split (e.g. train, val, test), set by SplitService")
     dataset_id = Column(Integer, ForeignKey(
         "datasets.id"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True),
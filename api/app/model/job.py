@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, JSON, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+import enum
+
+
+class JobStatus(str, enum.Enum):
+    """Background job status"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Les workers réclament le prochain job prêt : status = queued ORDER BY run_at
+        Index("ix_jobs_status_run_at", "status", "run_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(100), nullable=False, index=True)
+    payload = Column(JSON, nullable=False, default=dict)
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.QUEUED)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=1)
+    # Date à partir de laquelle le job peut être réclamé (backoff entre les tentatives)
+    run_at = Column(DateTime(timezone=True),
+                    server_default=func.now(), nullable=False)
+    locked_by = Column(String(255), nullable=True)
+    # Rafraîchi pendant l'exécution : un job running sans heartbeat récent est repris
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    progress = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True),
+                        server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(
+    ), onupdate=func.now(), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class NearDuplicateGrouping(Base):
+    __tablename__ = "near_duplicate_groupings"
+    __table_args__ = (
+        UniqueConstraint("dataset_id", "max_distance",
+                         name="uq_near_duplicate_groupings_dataset_id_max_distance"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    dataset_id = Column(Integer, ForeignKey("datasets.id"), nullable=False)
+    max_distance = Column(Integer, nullable=False)
+    # updated_at du dataset lu avant les hashes : les groupes sont à jour tant
+    # qu'il n'a pas changé
+    dataset_updated_at = Column(DateTime(timezone=True), nullable=False)
+    hashed_count = Column(Integer, nullable=False, default=0)
+    group_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True),
+                        server_default=func.now(), nullable=False)
+
+
+class NearDuplicateGroup(Base):
+    __tablename__ = "near_duplicate_groups"
+
+    # Groupes d'un calcul, du plus gros (rank 0) au plus petit : une page est
+    # lue directement sur la clé primaire (grouping_id, rank)
+    grouping_id = Column(Integer, ForeignKey("near_duplicate_groupings.id"), primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    image_ids = Column(ARRAY(Integer), nullable=False)
@@ -15,6 +15,8 @@ from .dataset import (
     DatasetWithImages,
     DatasetWithLabels,
     DatasetDetail,
+    DatasetDeletion,
+    DeletionStatus,
 )
 
 # Image schemas
@@ -30,6 +32,10 @@ from .image import (
     ImageUploadResponse,
     ImageUploadBatchRequest,
     ImageUploadBatchResponse,
+    ImageDeduplicated,
+    ImageUploadPart,
+    ImageUploadedPart,
+    ImageMultipartUploadResponse,
     ImageConfirmUploadRequest,
     ImageListResponse,
     ImageWithUrlListResponse,
@@ -54,6 +60,93 @@ from .annotation import (
     AnnotationWithImage,
     AnnotationWithLabel,
     AnnotationWithImageAndLabel,
+    AnnotationBox,
+    AnnotationWriteMode,
+    AnnotationBatchItem,
+    AnnotationBatchRequest,
+    AnnotationBatchResult,
+    BoxRelation,
+    AnnotationRegionQuery,
+    AnnotationListResponse,
+)
+
+# Event schemas
+from .event import (
+    S3EventNotification,
+    S3EventRecord,
+    S3EventAck,
+)
+
+# Job schemas
+from .job import (
+    JobStatus,
+    Job,
+)
+
+# Near-duplicate schemas
+from .near_duplicate import (
+    NearDuplicate,
+    NearDuplicateGroup,
+    NearDuplicateGroupListResponse,
+)
+
+# Export schemas
+from .export import (
+    ExportFormat,
+)
+
+# Import schemas
+from .coco_import import (
+    CocoImportUploadUrl,
+    CocoImportRequest,
+)
+
+# Statistics schemas
+from .stats import (
+    HistogramBin,
+    Distribution,
+    ClassStats,
+    CocoSizes,
+    DatasetStats,
+)
+
+# Snapshot schemas
+from .snapshot import (
+    SnapshotFormat,
+    SnapshotLabel,
+    SnapshotPart,
+    Snapshot,
+)
+
+# Dataset version schemas
+from .dataset_version import (
+    DatasetVersionCreate,
+    DatasetVersion,
+    VersionedKind,
+    VersionImage,
+    VersionLabel,
+    VersionAnnotation,
+    VersionImageListResponse,
+    VersionLabelListResponse,
+    VersionAnnotationListResponse,
+    ChangeType,
+    ChangeCounts,
+    VersionDiffSummary,
+    VersionImageChange,
+    VersionLabelChange,
+    VersionAnnotationChange,
+    VersionImageDiff,
+    VersionLabelDiff,
+    VersionAnnotationDiff,
+)
+
+# Split schemas
+from .split import (
+    SplitGrouping,
+    SplitRequest,
+    SplitClassCount,
+    SplitCount,
+    SplitSummary,
 )
 
 # Update forward references for all schemas
@@ -81,6 +174,8 @@ __all__ = [
     "DatasetWithImages",
     "DatasetWithLabels",
     "DatasetDetail",
+    "DatasetDeletion",
+    "DeletionStatus",
     # Image
     "ImageBase",
     "ImageCreate",
@@ -93,6 +188,10 @@ __all__ = [
     "ImageUploadResponse",
     "ImageUploadBatchRequest",
     "ImageUploadBatchResponse",
+    "ImageDeduplicated",
+    "ImageUploadPart",
+    "ImageUploadedPart",
+    "ImageMultipartUploadResponse",
     "ImageConfirmUploadRequest",
     "ImageListResponse",
     "ImageWithUrlListResponse",
@@ -111,4 +210,64 @@ __all__ = [
     "AnnotationWithImage",
     "AnnotationWithLabel",
     "AnnotationWithImageAndLabel",
+    "AnnotationBox",
+    "AnnotationWriteMode",
+    "AnnotationBatchItem",
+    "AnnotationBatchRequest",
+    "AnnotationBatchResult",
+    "BoxRelation",
+    "AnnotationRegionQuery",
+    "AnnotationListResponse",
+    # Event
+    "S3EventNotification",
+    "S3EventRecord",
+    "S3EventAck",
+    # Job
+    "JobStatus",
+    "Job",
+    # Near-duplicate
+    "NearDuplicate",
+    "NearDuplicateGroup",
+    "NearDuplicateGroupListResponse",
+    # Export
+    "ExportFormat",
+    # Import
+    "CocoImportUploadUrl",
+    "CocoImportRequest",
+    # Statistics
+    "HistogramBin",
+    "Distribution",
+    "ClassStats",
+    "CocoSizes",
+    "DatasetStats",
+    # Snapshot
+    "SnapshotFormat",
+    "SnapshotLabel",
+    "SnapshotPart",
+    "Snapshot",
+    # Dataset version
+    "DatasetVersionCreate",
+    "DatasetVersion",
+    "VersionedKind",
+    "VersionImage",
+    "VersionLabel",
+    "VersionAnnotation",
+    "VersionImageListResponse",
+    "VersionLabelListResponse",
+    "VersionAnnotationListResponse",
+    "ChangeType",
+    "ChangeCounts",
+    "VersionDiffSummary",
+    "VersionImageChange",
+    "VersionLabelChange",
+    "VersionAnnotationChange",
+    "VersionImageDiff",
+    "VersionLabelDiff",
+    "VersionAnnotationDiff",
+    # Split
+    "SplitGrouping",
+    "SplitRequest",
+    "SplitClassCount",
+    "SplitCount",
+    "SplitSummary",
 ]
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
+from enum import Enum
 
 
 class AnnotationBase(BaseModel):
@@ -32,6 +33,45 @@ class AnnotationUpdate(BaseModel):
     label_id: Optional[int] = Field(None, gt=0)
 
 
+class AnnotationBox(AnnotationBase):
+    """Schema for one box of the annotation set of an image"""
+    id: Optional[int] = Field(
+        None, gt=0, description="ID of the existing annotation to update, none to create one")
+    label_id: int = Field(..., gt=0,
+                          description="ID of the label for this annotation")
+
+
+class AnnotationWriteMode(str, Enum):
+    """How a batch of boxes is applied to the annotations of its images"""
+    REPLACE = "replace"
+    UPSERT = "upsert"
+
+
+class AnnotationBatchItem(BaseModel):
+    """Schema for the boxes of one image in a batch"""
+    image_id: int = Field(..., gt=0, description="Image ID")
+    annotations: List[AnnotationBox] = Field(...,
+                                             description="Boxes of the image")
+
+
+class AnnotationBatchRequest(BaseModel):
+    """Schema for writing the boxes of many images at once"""
+    mode: AnnotationWriteMode = Field(
+        default=AnnotationWriteMode.REPLACE,
+        description="replace: the boxes become the full set of each image (others are deleted); "
+                    "upsert: boxes with an id are updated, the others created, the rest kept")
+    images: List[AnnotationBatchItem] = Field(...,
+                                              description="Boxes by image")
+
+
+class AnnotationBatchResult(BaseModel):
+    """Schema for the outcome of a batch write"""
+    images: int = Field(..., description="Number of images written")
+    created: int = Field(..., description="Number of annotations created")
+    updated: int = Field(..., description="Number of annotations updated")
+    deleted: int = Field(..., description="Number of annotations deleted")
+
+
 class Annotation(AnnotationBase):
     """Schema for annotation response"""
     id: int = Field(..., description="Annotation ID")
@@ -68,3 +108,35 @@ class AnnotationWithImageAndLabel(Annotation):
 
     class Config:
         from_attributes = True
+
+
+class BoxRelation(str, Enum):
+    """How boxes must relate to the region of a search"""
+    INTERSECTS = "intersects"
+    WITHIN = "within"
+
+
+class AnnotationRegionQuery(BaseModel):
+    """Query parameters of a box search (region, size and shape filters)"""
+    xmin: Optional[int] = Field(None, description="Region x minimum")
+    ymin: Optional[int] = Field(None, description="Region y minimum")
+    xmax: Optional[int] = Field(None, description="Region x maximum")
+    ymax: Optional[int] = Field(None, description="Region y maximum")
+    relation: BoxRelation = Field(
+        BoxRelation.INTERSECTS,
+        description="intersects: boxes overlapping the region (edges included); "
+                    "within: boxes entirely inside it")
+    min_area: Optional[float] = Field(None, ge=0, description="Minimum box area in px²")
+    max_area: Optional[float] = Field(None, ge=0, description="Maximum box area in px²")
+    min_aspect: Optional[float] = Field(None, ge=0, description="Minimum width / height ratio")
+    max_aspect: Optional[float] = Field(None, ge=0, description="Maximum width / height ratio")
+    label_id: Optional[int] = Field(None, gt=0, description="Filter by label")
+    limit: int = Field(100, ge=1, le=1000, description="Max number of records to return")
+    cursor: Optional[str] = Field(None, description="Cursor from next_cursor of the previous page")
+
+
+class AnnotationListResponse(BaseModel):
+    """Schema for a page of box search results"""
+    items: List[Annotation] = Field(..., description="Matching annotations, ordered by ID")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page, null on the last page")
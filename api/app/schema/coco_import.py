@@ -0,0 +1,19 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class CocoImportUploadUrl(BaseModel):
+    """Schema for the presigned URL to upload a COCO annotation file to"""
+    s3_key: str = Field(..., description="S3 key of the annotation file, to pass to the import")
+    upload_url: str = Field(..., description="Presigned PUT URL (files up to 5 GB)")
+    expires_in: int = Field(..., description="URL lifetime in seconds")
+
+
+class CocoImportRequest(BaseModel):
+    """Schema for importing a COCO annotation file into a dataset"""
+    annotations_key: str = Field(..., min_length=1, max_length=1024,
+                                 description="S3 key of the COCO JSON file, under datasets/{dataset_id}/")
+    image_prefix: Optional[str] = Field(
+        None, max_length=400,
+        description="S3 prefix prepended to each file_name to get the image key "
+                    "(default: datasets/{dataset_id}/images/)")
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
+from enum import Enum
 
 
 class DatasetBase(BaseModel):
@@ -30,6 +31,10 @@ class Dataset(DatasetBase):
     updated_at: datetime = Field(..., description="Last update timestamp")
     image_count: int = Field(
         default=0, description="Number of images in dataset")
+    annotation_count: int = Field(
+        default=0, description="Number of annotations in dataset")
+    label_count: int = Field(
+        default=0, description="Number of labels linked to dataset")
 
     class Config:
         from_attributes = True
@@ -61,7 +66,47 @@ class DatasetDetail(BaseModel):
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
     image_count: int = Field(..., description="Number of images in dataset")
+    uploading_count: int = Field(...,
+                                 description="Number of images being uploaded")
+    uploaded_count: int = Field(...,
+                                description="Number of uploaded images")
+    error_count: int = Field(...,
+                             description="Number of images in error")
     annotation_count: int = Field(...,
                                   description="Number of annotations in dataset")
     label_count: int = Field(...,
                              description="Number of labels linked to dataset")
+    total_bytes: int = Field(...,
+                             description="Total size of the dataset images in bytes")
+
+
+class DeletionStatus(str, Enum):
+    """Dataset deletion status"""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class DatasetDeletion(BaseModel):
+    """Schema for the progress of a dataset deletion"""
+    id: int = Field(..., description="Deletion ID")
+    dataset_id: int = Field(..., description="ID of the deleted dataset")
+    dataset_name: str = Field(..., description="Name of the deleted dataset")
+    status: DeletionStatus = Field(..., description="Deletion status")
+    job_id: Optional[int] = Field(
+        None, description="ID of the background job running the deletion")
+    image_total: int = Field(...,
+                             description="Number of images when the deletion started")
+    rows_deleted: int = Field(..., description="Number of image rows deleted")
+    objects_deleted: int = Field(...,
+                                 description="Number of S3 objects deleted")
+    error_count: int = Field(..., description="Number of errors")
+    last_error: Optional[str] = Field(None, description="Last error message")
+    created_at: datetime = Field(..., description="Creation timestamp")
+    updated_at: datetime = Field(..., description="Last update timestamp")
+    completed_at: Optional[datetime] = Field(
+        None, description="End timestamp")
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,158 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+from enum import Enum
+
+
+class DatasetVersionCreate(BaseModel):
+    """Schema for creating a dataset version"""
+    message: Optional[str] = Field(None, description="What changed, or what the version is for")
+
+
+class DatasetVersion(BaseModel):
+    """Schema for dataset version response"""
+    id: int = Field(..., description="Version ID")
+    dataset_id: int = Field(..., description="Dataset ID")
+    number: int = Field(..., description="Version number in the dataset (1, 2, ...)")
+    message: Optional[str] = Field(None, description="Version message")
+    image_count: int = Field(..., description="Number of uploaded images in the version")
+    label_count: int = Field(..., description="Number of labels of the dataset in the version")
+    annotation_count: int = Field(..., description="Number of annotations in the version")
+    change_count: int = Field(...,
+                              description="Number of image, label and annotation states changed since the previous version")
+    created_at: datetime = Field(..., description="Creation timestamp")
+
+    class Config:
+        from_attributes = True
+
+
+class VersionedKind(str, Enum):
+    """Kind of rows recorded in dataset versions"""
+    IMAGES = "images"
+    LABELS = "labels"
+    ANNOTATIONS = "annotations"
+
+
+class VersionImage(BaseModel):
+    """Schema for an image as recorded in a version"""
+    image_id: int = Field(..., description="Image ID")
+    filename: str = Field(..., description="Original filename")
+    s3_key: str = Field(..., description="S3 key")
+    width: Optional[int] = Field(None, description="Width in pixels")
+    height: Optional[int] = Field(None, description="Height in pixels")
+    content_sha256: Optional[str] = Field(None, description="SHA-256 of the content")
+
+    class Config:
+        from_attributes = True
+
+
+class VersionLabel(BaseModel):
+    """Schema for a label as recorded in a version"""
+    label_id: int = Field(..., description="Label ID")
+    name: str = Field(..., description="Label name")
+
+    class Config:
+        from_attributes = True
+
+
+class VersionAnnotation(BaseModel):
+    """Schema for an annotation as recorded in a version"""
+    annotation_id: int = Field(..., description="Annotation ID")
+    image_id: int = Field(..., description="Image ID")
+    label_id: int = Field(..., description="Label ID")
+    bbox_xmin: Optional[int] = Field(None, description="Bounding box x minimum")
+    bbox_ymin: Optional[int] = Field(None, description="Bounding box y minimum")
+    bbox_xmax: Optional[int] = Field(None, description="Bounding box x maximum")
+    bbox_ymax: Optional[int] = Field(None, description="Bounding box y maximum")
+
+    class Config:
+        from_attributes = True
+
+
+class VersionImageListResponse(BaseModel):
+    """Schema for paginated images of a version"""
+    items: List[VersionImage] = Field(..., description="Images, by ID")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page, null on the last page")
+
+
+class VersionLabelListResponse(BaseModel):
+    """Schema for paginated labels of a version"""
+    items: List[VersionLabel] = Field(..., description="Labels, by ID")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page, null on the last page")
+
+
+class VersionAnnotationListResponse(BaseModel):
+    """Schema for paginated annotations of a version"""
+    items: List[VersionAnnotation] = Field(..., description="Annotations, by ID")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page, null on the last page")
+
+
+class ChangeType(str, Enum):
+    """How a row changed between two versions"""
+    ADDED = "added"
+    REMOVED = "removed"
+    MODIFIED = "modified"
+
+
+class ChangeCounts(BaseModel):
+    """Schema for the number of rows of one kind changed between two versions"""
+    added: int = Field(..., description="Rows only in the target version")
+    removed: int = Field(..., description="Rows only in the source version")
+    modified: int = Field(..., description="Rows in both versions with different values")
+
+
+class VersionDiffSummary(BaseModel):
+    """Schema for the changes between two versions of a dataset"""
+    from_version: int = Field(..., description="Source version number")
+    to_version: int = Field(..., description="Target version number")
+    images: ChangeCounts = Field(..., description="Image changes")
+    labels: ChangeCounts = Field(..., description="Label changes")
+    annotations: ChangeCounts = Field(..., description="Annotation changes")
+
+
+class VersionImageChange(BaseModel):
+    """Schema for an image changed between two versions"""
+    id: int = Field(..., description="Image ID")
+    change: ChangeType = Field(..., description="Type of change")
+    before: Optional[VersionImage] = Field(None, description="State in the source version")
+    after: Optional[VersionImage] = Field(None, description="State in the target version")
+
+
+class VersionLabelChange(BaseModel):
+    """Schema for a label changed between two versions"""
+    id: int = Field(..., description="Label ID")
+    change: ChangeType = Field(..., description="Type of change")
+    before: Optional[VersionLabel] = Field(None, description="State in the source version")
+    after: Optional[VersionLabel] = Field(None, description="State in the target version")
+
+
+class VersionAnnotationChange(BaseModel):
+    """Schema for an annotation changed between two versions"""
+    id: int = Field(..., description="Annotation ID")
+    change: ChangeType = Field(..., description="Type of change")
+    before: Optional[VersionAnnotation] = Field(None, description="State in the source version")
+    after: Optional[VersionAnnotation] = Field(None, description="State in the target version")
+
+
+class VersionImageDiff(BaseModel):
+    """Schema for paginated image changes between two versions"""
+    items: List[VersionImageChange] = Field(..., description="Changes, by image ID")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page, null on the last page")
+
+
+class VersionLabelDiff(BaseModel):
+    """Schema for paginated label changes between two versions"""
+    items: List[VersionLabelChange] = Field(..., description="Changes, by label ID")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page, null on the last page")
+
+
+class VersionAnnotationDiff(BaseModel):
+    """Schema for paginated annotation changes between two versions"""
+    items: List[VersionAnnotationChange] = Field(..., description="Changes, by annotation ID")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page, null on the last page")
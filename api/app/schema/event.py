@@ -0,0 +1,39 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+
+class S3EventBucket(BaseModel):
+    """Bucket part of an S3 event record"""
+    name: str = Field(..., description="Bucket name")
+
+
+class S3EventObject(BaseModel):
+    """Object part of an S3 event record"""
+    key: str = Field(..., description="URL-encoded object key")
+    size: Optional[int] = Field(None, description="Object size in bytes")
+
+
+class S3EventEntity(BaseModel):
+    """S3 entity of an event record"""
+    bucket: S3EventBucket
+    object: S3EventObject
+
+
+class S3EventRecord(BaseModel):
+    """Single record of an S3/MinIO bucket notification"""
+    event_name: str = Field(..., alias="eventName",
+                            description="Event name, e.g. s3:ObjectCreated:Put")
+    s3: S3EventEntity
+
+
+class S3EventNotification(BaseModel):
+    """S3/MinIO bucket notification payload (webhook target)"""
+    records: List[S3EventRecord] = Field(
+        default_factory=list, alias="Records", description="Event records")
+
+
+class S3EventAck(BaseModel):
+    """Schema for bucket notification acknowledgement"""
+    received: int = Field(..., description="Number of ObjectCreated records received")
+    confirmed_count: int = Field(...,
+                                 description="Number of images switched to 'uploaded'")
@@ -0,0 +1,8 @@
+from enum import Enum
+
+
+class ExportFormat(str, Enum):
+    """Annotation export format"""
+    COCO = "coco"
+    YOLO = "yolo"
+    VOC = "voc"
@@ -8,9 +8,18 @@ class ComponentHealth(BaseModel):
     latency_ms: Optional[float] = None
 
 
+class CacheStats(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+
+
 class Health(BaseModel):
     status: Literal["ok", "degraded"]
     components: Dict[str, ComponentHealth]
+    download_url_cache: CacheStats
 
 
 class DBHealth(ComponentHealth):
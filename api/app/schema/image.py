@@ -44,6 +44,7 @@ class Image(ImageBase):
     """Schema for image response"""
     id: int = Field(..., description="Image ID")
     dataset_id: int = Field(..., description="Dataset ID")
+    split: Optional[str] = Field(None, description="Training split, if assigned")
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
 
@@ -67,6 +68,9 @@ class ImageUploadRequest(BaseModel):
                           description="Original filename")
     file_size: int = Field(..., gt=0, description="File size in bytes")
     mime_type: str = Field(..., description="MIME type of the image")
+    sha256: Optional[str] = Field(
+        None, pattern="^[0-9a-f]{64}$",
+        description="SHA-256 of the file content (lowercase hex), enables deduplication")
 
 
 class ImageUploadResponse(BaseModel):
@@ -76,6 +80,19 @@ class ImageUploadResponse(BaseModel):
     s3_key: str = Field(..., description="S3 key where file will be stored")
     expires_in: int = Field(
         default=3600, description="URL expiration time in seconds")
+    checksum_sha256: Optional[str] = Field(
+        None, description="Value to send in the x-amz-checksum-sha256 header of the upload "
+                          "(signed, S3 rejects content that does not match sha256)")
+
+
+class ImageDeduplicated(BaseModel):
+    """Schema for a file that does not need to be uploaded"""
+    filename: str = Field(..., description="Original filename")
+    sha256: str = Field(..., description="SHA-256 of the file content")
+    image_id: int = Field(..., description="Image holding this content in the dataset")
+    copy_job_id: Optional[int] = Field(
+        None, description="Job copying the same content from another dataset (the image stays "
+                          "'uploading' until it is done), null if the dataset already had it")
 
 
 class ImageUploadBatchRequest(BaseModel):
@@ -88,6 +105,37 @@ class ImageUploadBatchResponse(BaseModel):
     """Schema for batch image upload response"""
     uploads: List[ImageUploadResponse] = Field(
         ..., description="List of upload URLs")
+    deduplicated: List[ImageDeduplicated] = Field(
+        default_factory=list, description="Files skipped because their content is already stored")
+
+
+class ImageUploadPart(BaseModel):
+    """Schema for a presigned URL of one part of a multipart upload"""
+    part_number: int = Field(..., ge=1, description="Part number (1-based)")
+    upload_url: str = Field(..., description="Presigned URL for uploading the part")
+
+
+class ImageUploadedPart(BaseModel):
+    """Schema for a part already stored in S3"""
+    part_number: int = Field(..., ge=1, description="Part number (1-based)")
+    etag: str = Field(..., description="ETag returned by S3 for the part")
+    size: int = Field(..., description="Part size in bytes")
+
+
+class ImageMultipartUploadResponse(BaseModel):
+    """Schema for a multipart upload session with presigned part URLs"""
+    image_id: int = Field(..., description="Created image ID")
+    s3_key: str = Field(..., description="S3 key where file will be stored")
+    upload_id: str = Field(..., description="S3 multipart upload ID")
+    part_size: int = Field(...,
+                           description="Size of every part except the last one, in bytes")
+    part_count: int = Field(..., description="Total number of parts")
+    parts: List[ImageUploadPart] = Field(
+        ..., description="Presigned URLs for the parts still to upload")
+    uploaded_parts: List[ImageUploadedPart] = Field(
+        default_factory=list, description="Parts already stored in S3")
+    expires_in: int = Field(
+        default=3600, description="URL expiration time in seconds")
 
 
 class ImageConfirmUploadRequest(BaseModel):
@@ -102,6 +150,10 @@ class ImageWithDownloadUrl(Image):
         None, description="Presigned URL for downloading the image")
     url_expires_in: Optional[int] = Field(
         None, description="URL expiration time in seconds")
+    thumbnail_url: Optional[str] = Field(
+        None, description="Presigned URL of the thumbnail (WebP, 256px), null until generated")
+    preview_url: Optional[str] = Field(
+        None, description="Presigned URL of the preview (WebP, 1024px), null until generated")
 
     class Config:
         from_attributes = True
@@ -111,6 +163,8 @@ class ImageListResponse(BaseModel):
     """Schema for paginated image list response"""
     total: int = Field(..., description="Total number of images")
     items: List[Image] = Field(..., description="List of images")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page, null on the last page")
 
 
 class ImageWithUrlListResponse(BaseModel):
@@ -118,3 +172,5 @@ class ImageWithUrlListResponse(BaseModel):
     total: int = Field(..., description="Total number of images")
     items: List[ImageWithDownloadUrl] = Field(
         ..., description="List of images with download URLs")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page, null on the last page")
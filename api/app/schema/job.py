@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Any, Dict
+from datetime import datetime
+from enum import Enum
+
+
+class JobStatus(str, Enum):
+    """Background job status"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class Job(BaseModel):
+    """Schema for background job response"""
+    id: int = Field(..., description="Job ID")
+    kind: str = Field(..., description="Job kind (e.g. dataset.delete)")
+    status: JobStatus = Field(..., description="Job status")
+    attempts: int = Field(..., description="Number of attempts started")
+    max_attempts: int = Field(..., description="Max number of attempts")
+    run_at: datetime = Field(...,
+                             description="Time from which the job can run (next retry if queued)")
+    progress: Optional[Dict[str, Any]] = Field(
+        None, description="Progress values published by the job")
+    result: Optional[Dict[str, Any]] = Field(
+        None, description="Result payload once succeeded")
+    last_error: Optional[str] = Field(
+        None, description="Error of the last failed attempt")
+    created_at: datetime = Field(..., description="Creation timestamp")
+    updated_at: datetime = Field(..., description="Last update timestamp")
+    finished_at: Optional[datetime] = Field(
+        None, description="End timestamp")
+
+    class Config:
+        from_attributes = True
@@ -6,6 +6,8 @@ class LabelListResponse(BaseModel):
     """Schema for paginated label list response"""
     total: int = Field(..., description="Total number of labels")
     items: List["Label"] = Field(..., description="List of labels")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor of the next page, null on the last page")
 
 
 class LabelBase(BaseModel):
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import List, Optional
+
+
+class NearDuplicate(BaseModel):
+    """Schema for an image close to a reference image"""
+    image_id: int = Field(..., description="Image ID")
+    distance: int = Field(...,
+                          description="Hamming distance between the perceptual hashes (0-64)")
+
+
+class NearDuplicateGroup(BaseModel):
+    """Schema for a group of near-duplicate images"""
+    image_ids: List[int] = Field(...,
+                                 description="IDs of the images of the group, ascending")
+
+
+class NearDuplicateGroupListResponse(BaseModel):
+    """Schema for paginated near-duplicate groups of a dataset"""
+    max_distance: int = Field(...,
+                              description="Max Hamming distance between two linked images")
+    hashed_count: int = Field(...,
+                              description="Number of uploaded images with a perceptual hash")
+    total: int = Field(..., description="Total number of groups")
+    items: List[NearDuplicateGroup] = Field(...,
+                                            description="Groups, largest first")
+    computed_at: Optional[datetime] = Field(None,
+                                            description="When the groups were computed, null if never")
+    up_to_date: bool = Field(...,
+                             description="False if the dataset changed since the groups were computed")
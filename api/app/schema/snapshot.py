@@ -0,0 +1,38 @@
+from pydantic import BaseModel, Field
+from typing import List
+from datetime import datetime
+from enum import Enum
+
+
+class SnapshotFormat(str, Enum):
+    """File format of the parts of a dataset snapshot"""
+    ARROW = "arrow"
+    PARQUET = "parquet"
+
+
+class SnapshotLabel(BaseModel):
+    """Schema for a label of a snapshot"""
+    id: int = Field(..., description="Label ID, as found in the label_ids column")
+    name: str = Field(..., description="Label name")
+
+
+class SnapshotPart(BaseModel):
+    """Schema for one part file of a snapshot"""
+    s3_key: str = Field(..., description="S3 key of the part")
+    download_url: str = Field(..., description="Presigned download URL")
+    first_image_id: int = Field(..., description="Start of the image ID range of the part")
+    image_count: int = Field(..., description="Number of images (rows) in the part")
+    annotation_count: int = Field(..., description="Number of boxes in the part")
+    size: int = Field(..., description="File size in bytes")
+
+
+class Snapshot(BaseModel):
+    """Schema for the latest snapshot of a dataset"""
+    dataset_id: int = Field(..., description="Dataset ID")
+    format: SnapshotFormat = Field(..., description="File format of the parts")
+    created_at: datetime = Field(..., description="When the snapshot was last brought up to date")
+    image_count: int = Field(..., description="Number of images")
+    annotation_count: int = Field(..., description="Number of boxes")
+    labels: List[SnapshotLabel] = Field(..., description="Labels of the dataset")
+    parts: List[SnapshotPart] = Field(..., description="Part files, in image ID order")
+    expires_in: int = Field(..., description="Lifetime of the download URLs in seconds")
@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List
+from enum import Enum
+
+
+class SplitGrouping(str, Enum):
+    """Images kept together in the same split"""
+    NONE = "none"
+    CONTENT_HASH = "content_hash"
+    NEAR_DUPLICATE = "near_duplicate"
+
+
+class SplitRequest(BaseModel):
+    """Schema for assigning the images of a dataset to splits"""
+    splits: Dict[str, float] = Field(
+        ..., description="Target share of the images for each split name, e.g. "
+                         '{"train": 0.8, "val": 0.1, "test": 0.1} (normalized to their sum)')
+    seed: int = Field(0, ge=0, description="Seed of the assignment: same seed and data, same splits")
+    group_by: SplitGrouping = Field(
+        SplitGrouping.NONE,
+        description="Keep images with the same content hash, or near-duplicates, in the same split")
+    max_distance: int = Field(
+        4, ge=0, le=10, description="Max Hamming distance between near-duplicate hashes")
+
+
+class SplitClassCount(BaseModel):
+    """Schema for the annotations of a label in a split"""
+    label_id: int = Field(..., description="Label ID")
+    annotation_count: int = Field(..., description="Number of annotations")
+    image_count: int = Field(..., description="Number of images with this label")
+
+
+class SplitCount(BaseModel):
+    """Schema for the content of a split"""
+    name: str = Field(..., description="Split name")
+    image_count: int = Field(..., description="Number of uploaded images")
+    annotation_count: int = Field(..., description="Number of annotations")
+    classes: List[SplitClassCount] = Field(..., description="Annotations per label")
+
+
+class SplitSummary(BaseModel):
+    """Schema for the splits of a dataset"""
+    dataset_id: int = Field(..., description="Dataset ID")
+    unassigned_count: int = Field(..., description="Number of uploaded images without a split")
+    splits: List[SplitCount] = Field(..., description="Splits, by name")
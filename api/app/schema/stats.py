@@ -0,0 +1,55 @@
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+from datetime import datetime
+
+
+class HistogramBin(BaseModel):
+    """Schema for one bin of a histogram"""
+    min: float = Field(..., description="Lower edge (included)")
+    max: Optional[float] = Field(None, description="Upper edge (excluded), null for the last bin")
+    count: int = Field(..., description="Number of values in the bin")
+
+
+class Distribution(BaseModel):
+    """Schema for the distribution of a measure"""
+    count: int = Field(..., description="Number of values")
+    min: Optional[float] = Field(None, description="Smallest value")
+    max: Optional[float] = Field(None, description="Largest value")
+    mean: Optional[float] = Field(None, description="Mean value")
+    quantiles: Dict[str, float] = Field(..., description="Quantiles by name (p5, p25, p50, p75, p95)")
+    histogram: List[HistogramBin] = Field(..., description="Histogram bins, ascending")
+
+
+class ClassStats(BaseModel):
+    """Schema for the annotation counts of a label"""
+    label_id: int = Field(..., description="Label ID")
+    name: str = Field(..., description="Label name")
+    annotation_count: int = Field(..., description="Number of annotations with this label")
+    image_count: int = Field(..., description="Number of images with at least one annotation with this label")
+
+
+class CocoSizes(BaseModel):
+    """Schema for the box counts by COCO object size"""
+    small: int = Field(..., description="Boxes below 32² px²")
+    medium: int = Field(..., description="Boxes from 32² to 96² px²")
+    large: int = Field(..., description="Boxes from 96² px²")
+
+
+class DatasetStats(BaseModel):
+    """Schema for the annotation statistics of the uploaded images of a dataset"""
+    dataset_id: int = Field(..., description="Dataset ID")
+    updated_at: datetime = Field(..., description="Last modification of the dataset the statistics are for")
+    image_count: int = Field(..., description="Number of uploaded images")
+    annotated_image_count: int = Field(..., description="Number of images with at least one annotation")
+    unannotated_image_count: int = Field(..., description="Number of images without annotation")
+    unsized_image_count: int = Field(..., description="Number of images whose dimensions are unknown")
+    annotation_count: int = Field(..., description="Number of annotations")
+    incomplete_box_count: int = Field(...,
+                                      description="Annotations missing a coordinate, left out of the box measures")
+    classes: List[ClassStats] = Field(..., description="Class histogram, by label ID")
+    coco_sizes: CocoSizes = Field(..., description="Boxes by COCO object size")
+    boxes_per_image: Distribution = Field(..., description="Number of annotations per image")
+    box_area: Distribution = Field(..., description="Box area in px²")
+    relative_box_area: Distribution = Field(...,
+                                            description="Box area over image area (images of known size)")
+    aspect_ratio: Distribution = Field(..., description="Box width / height (boxes of non-zero height)")
@@ -8,10 +8,32 @@ from .health_service import HealthService
 from .dataset_service import DatasetService
 from .label_service import LabelService
 from .image_service import ImageService
+from .dataset_counter_service import DatasetCounterService
+from .dataset_deletion_service import DatasetDeletionService
+from .job_service import JobService
+from .near_duplicate_service import NearDuplicateService
+from .annotation_service import AnnotationService
+from .export_service import ExportService
+from .import_service import ImportService
+from .stats_service import StatsService
+from .snapshot_service import SnapshotService
+from .version_service import VersionService
+from .split_service import SplitService
 
 __all__ = [
     "HealthService",
     "DatasetService",
     "LabelService",
-    "ImageService"
+    "ImageService",
+    "DatasetCounterService",
+    "DatasetDeletionService",
+    "JobService",
+    "NearDuplicateService",
+    "AnnotationService",
+    "ExportService",
+    "ImportService",
+    "StatsService",
+    "SnapshotService",
+    "VersionService",
+    "SplitService"
 ]
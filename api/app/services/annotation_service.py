@@ -0,0 +1,337 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import Integer, column, delete, func, insert, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from typing import Iterable, List, Optional
+from fastapi import HTTPException, status
+
+from app.core.database import copy_rows
+from app.core.pagination import decode_cursor, encode_cursor
+from app.model.annotation import Annotation, annotation_box
+from app.model.dataset import Dataset, DatasetStatus, dataset_labels
+from app.model.image import Image
+from app.model.label import Label
+from app.schema.annotation import (
+    AnnotationBatchItem, AnnotationBox, AnnotationCreate, AnnotationRegionQuery, AnnotationUpdate,
+    AnnotationWriteMode, BoxRelation)
+from app.services.dataset_counter_service import DatasetCounterService
+
+# Number of new annotations from which a batch is written with COPY instead
+# of a multi-row INSERT
+ANNOTATION_COPY_THRESHOLD = 5000
+# Columns written for each new annotation, in COPY order
+BOX_COLUMNS = ("image_id", "label_id", "bbox_xmin", "bbox_ymin", "bbox_xmax", "bbox_ymax")
+
+
+class AnnotationService:
+    """Service for annotation business logic"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.counters = DatasetCounterService(db)
+
+    def get_annotation(self, annotation_id: int) -> Optional[Annotation]:
+        """Get a single annotation by ID"""
+        return self.db.query(Annotation).filter(Annotation.id == annotation_id).first()
+
+    def get_image_annotations(self, image_id: int) -> Optional[List[Annotation]]:
+        """Get the annotations of an image ordered by ID, or None if the image does not exist"""
+        if self.db.get(Image, image_id) is None:
+            return None
+        return self.db.query(Annotation).filter(
+            Annotation.image_id == image_id).order_by(Annotation.id).all()
+
+    def search_annotations(
+        self,
+        filters: AnnotationRegionQuery,
+        image_id: Optional[int] = None,
+        dataset_id: Optional[int] = None
+    ) -> Optional[dict]:
+        """
+        Find the boxes of an image, or of all the images of a dataset, by
+        region, area and aspect ratio, ordered by ID with keyset pagination
+
+        Region and area filters go through the SP-GiST and area indexes of
+        annotation_box; boxes missing a coordinate never match a region,
+        area or aspect filter. Aspect is width / height, boxes with a zero
+        height only match a min_aspect.
+
+        Returns dict with items and next_cursor, or None if the image or
+        dataset does not exist
+        """
+        query = select(Annotation)
+        if image_id is not None:
+            if self.db.get(Image, image_id) is None:
+                return None
+            query = query.where(Annotation.image_id == image_id)
+        if dataset_id is not None:
+            if self.db.get(Dataset, dataset_id) is None:
+                return None
+            query = query.join(Image, Image.id == Annotation.image_id).where(
+                Image.dataset_id == dataset_id)
+
+        corners = (filters.xmin, filters.ymin, filters.xmax, filters.ymax)
+        if any(value is not None for value in corners):
+            if None in corners or filters.xmin > filters.xmax or filters.ymin > filters.ymax:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="A region needs xmin <= xmax and ymin <= ymax"
+                )
+            region = func.box(func.point(filters.xmin, filters.ymin),
+                              func.point(filters.xmax, filters.ymax))
+            operator = "&&" if filters.relation == BoxRelation.INTERSECTS else "<@"
+            query = query.where(annotation_box.op(operator)(region))
+
+        area = func.area(annotation_box)
+        if filters.min_area is not None:
+            query = query.where(area >= filters.min_area)
+        if filters.max_area is not None:
+            query = query.where(area <= filters.max_area)
+        # width >= ratio * height avoids dividing by a zero height
+        width, height = func.width(annotation_box), func.height(annotation_box)
+        if filters.min_aspect is not None:
+            query = query.where(width >= filters.min_aspect * height)
+        if filters.max_aspect is not None:
+            query = query.where(width <= filters.max_aspect * height, height > 0)
+        if filters.label_id is not None:
+            query = query.where(Annotation.label_id == filters.label_id)
+
+        if filters.cursor:
+            (last_id,) = decode_cursor(filters.cursor, 1)
+            query = query.where(Annotation.id > last_id)
+
+        # Fetch one extra row to know whether there is a next page
+        limit = filters.limit
+        items = self.db.execute(query.order_by(Annotation.id).limit(limit + 1)).scalars().all()
+        next_cursor = encode_cursor(items[limit - 1].id) if len(items) > limit else None
+        return {"items": items[:limit], "next_cursor": next_cursor}
+
+    def create_annotation(self, annotation_data: AnnotationCreate) -> Optional[Annotation]:
+        """Create one annotation, or return None if the image does not exist"""
+        dataset_id = self._lock_image(annotation_data.image_id)
+        if dataset_id is None:
+            return None
+        self._check_boxes([annotation_data])
+        self._link_labels(dataset_id, {annotation_data.label_id})
+
+        db_annotation = Annotation(**annotation_data.model_dump())
+        self.db.add(db_annotation)
+        self.counters.bump(dataset_id, annotation_count=1)
+        self.db.commit()
+        self.db.refresh(db_annotation)
+        return db_annotation
+
+    def update_annotation(self, annotation_id: int, annotation_data: AnnotationUpdate) -> Optional[Annotation]:
+        """Update the box or label of an annotation"""
+        db_annotation = self.get_annotation(annotation_id)
+        if not db_annotation:
+            return None
+
+        update_data = annotation_data.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_annotation, field, value)
+        self._check_boxes([db_annotation])
+        if "label_id" in update_data:
+            self._link_labels(db_annotation.image.dataset_id, {db_annotation.label_id})
+        self.counters.touch(db_annotation.image.dataset_id)
+
+        self.db.commit()
+        self.db.refresh(db_annotation)
+        return db_annotation
+
+    def delete_annotation(self, annotation_id: int) -> bool:
+        """Delete an annotation"""
+        db_annotation = self.get_annotation(annotation_id)
+        if not db_annotation:
+            return False
+
+        self.counters.bump(db_annotation.image.dataset_id, annotation_count=-1)
+        self.db.delete(db_annotation)
+        self.db.commit()
+        return True
+
+    def replace_image_annotations(self, image_id: int, boxes: List[AnnotationBox]) -> Optional[List[Annotation]]:
+        """
+        Make boxes the full annotation set of an image (see write_annotations)
+
+        Returns the resulting annotations, or None if the image does not exist
+        """
+        image = self.db.get(Image, image_id)
+        if image is None:
+            return None
+
+        result = self.write_annotations(
+            image.dataset_id,
+            [AnnotationBatchItem(image_id=image_id, annotations=boxes)],
+            AnnotationWriteMode.REPLACE
+        )
+        if result is None:
+            return None
+        return self.get_image_annotations(image_id)
+
+    def write_annotations(
+        self,
+        dataset_id: int,
+        items: List[AnnotationBatchItem],
+        mode: AnnotationWriteMode = AnnotationWriteMode.REPLACE
+    ) -> Optional[dict]:
+        """
+        Write the boxes of many images of a dataset in one transaction
+
+        Boxes with an id update that annotation, boxes without one are
+        created. In replace mode, the other annotations of the images are
+        deleted; in upsert mode they are kept. Every write is set-based: one
+        DELETE, one UPDATE from a VALUES list and one multi-row INSERT, or a
+        COPY from ANNOTATION_COPY_THRESHOLD new boxes on. The images are
+        locked, so concurrent writes to the same image apply one after the
+        other. Labels not linked to the dataset yet are linked.
+
+        Returns dict with the counts (images, created, updated, deleted), or
+        None if the dataset does not exist or is being deleted
+        """
+        exists = self.db.execute(
+            select(Dataset.id).where(Dataset.id == dataset_id,
+                                     Dataset.status == DatasetStatus.ACTIVE)
+        ).first()
+        if exists is None:
+            return None
+
+        image_ids = sorted({item.image_id for item in items})
+        # Ordered locks, so two batches sharing images cannot deadlock
+        locked = set(self.db.execute(
+            select(Image.id)
+            .where(Image.id.in_(image_ids), Image.dataset_id == dataset_id)
+            .order_by(Image.id)
+            .with_for_update()
+        ).scalars())
+        missing = [image_id for image_id in image_ids if image_id not in locked]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Images not found in dataset {dataset_id}: {missing[:20]}"
+            )
+
+        boxes = [(item.image_id, box) for item in items for box in item.annotations]
+        self._check_boxes([box for _, box in boxes])
+        self._link_labels(dataset_id, {box.label_id for _, box in boxes})
+
+        updates = [(image_id, box) for image_id, box in boxes if box.id]
+        self._check_owners(updates)
+        kept_ids = [box.id for _, box in updates]
+
+        deleted = 0
+        if mode == AnnotationWriteMode.REPLACE:
+            deleted = self.db.execute(
+                delete(Annotation)
+                .where(Annotation.image_id.in_(image_ids),
+                       Annotation.id.not_in(kept_ids))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+
+        if updates:
+            # One integer array per column instead of a VALUES list: the
+            # statement stays the same size whatever the number of boxes
+            rows = [(box.id, box.label_id, box.bbox_xmin, box.bbox_ymin,
+                     box.bbox_xmax, box.bbox_ymax) for _, box in updates]
+            changes = func.unnest(
+                *(literal(list(values), ARRAY(Integer)) for values in zip(*rows))
+            ).table_valued(
+                *(column(name, Integer) for name in ("id", *BOX_COLUMNS[1:]))
+            ).render_derived(name="changes")
+            self.db.execute(
+                update(Annotation)
+                .where(Annotation.id == changes.c.id)
+                .values({name: changes.c[name] for name in BOX_COLUMNS[1:]})
+                .execution_options(synchronize_session=False)
+            )
+
+        new_rows = [(image_id, box.label_id, box.bbox_xmin, box.bbox_ymin,
+                     box.bbox_xmax, box.bbox_ymax)
+                    for image_id, box in boxes if not box.id]
+        self._insert_boxes(new_rows)
+
+        if len(new_rows) != deleted:
+            self.counters.bump(dataset_id, annotation_count=len(new_rows) - deleted)
+        else:
+            self.counters.touch(dataset_id)
+        self.db.commit()
+
+        return {
+            "images": len(image_ids),
+            "created": len(new_rows),
+            "updated": len(updates),
+            "deleted": deleted
+        }
+
+    def _lock_image(self, image_id: int) -> Optional[int]:
+        """Lock an image row and return its dataset ID, or None if it does not exist"""
+        return self.db.execute(
+            select(Image.dataset_id).where(Image.id == image_id).with_for_update()
+        ).scalar()
+
+    def _check_boxes(self, boxes: Iterable) -> None:
+        """Reject boxes whose corners are swapped"""
+        for box in boxes:
+            for low, high in (("bbox_xmin", "bbox_xmax"), ("bbox_ymin", "bbox_ymax")):
+                low_value, high_value = getattr(box, low), getattr(box, high)
+                if low_value is not None and high_value is not None and low_value > high_value:
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST,
+                        detail=f"{low} ({low_value}) is greater than {high} ({high_value})"
+                    )
+
+    def _check_owners(self, updates: List[tuple]) -> None:
+        """Reject updates of annotations that do not exist, belong to another image or are repeated"""
+        ids = [box.id for _, box in updates]
+        if len(set(ids)) != len(ids):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="The same annotation is given several times"
+            )
+
+        owners = dict(self.db.execute(
+            select(Annotation.id, Annotation.image_id).where(Annotation.id.in_(ids))
+        ).all()) if ids else {}
+        for image_id, box in updates:
+            if owners.get(box.id) != image_id:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Annotation {box.id} does not belong to image {image_id}"
+                )
+
+    def _link_labels(self, dataset_id: int, label_ids: set) -> None:
+        """Check that labels exist and link the missing ones to the dataset (no commit)"""
+        if not label_ids:
+            return
+
+        known = set(self.db.execute(
+            select(Label.id).where(Label.id.in_(label_ids))
+        ).scalars())
+        unknown = sorted(label_ids - known)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Labels not found: {unknown[:20]}"
+            )
+
+        linked = self.db.execute(
+            pg_insert(dataset_labels)
+            .values([{"dataset_id": dataset_id, "label_id": label_id}
+                     for label_id in sorted(label_ids)])
+            .on_conflict_do_nothing()
+            .returning(dataset_labels.c.label_id)
+        ).all()
+        self.counters.bump(dataset_id, label_count=len(linked))
+
+    def _insert_boxes(self, rows: List[tuple]) -> None:
+        """
+        Insert new annotations given as BOX_COLUMNS tuples (no commit): a
+        multi-row INSERT, or COPY from ANNOTATION_COPY_THRESHOLD rows on
+        """
+        if not rows:
+            return
+
+        if len(rows) < ANNOTATION_COPY_THRESHOLD:
+            self.db.execute(insert(Annotation), [dict(zip(BOX_COLUMNS, row)) for row in rows])
+            return
+
+        copy_rows(self.db, Annotation.__tablename__, BOX_COLUMNS, rows)
@@ -0,0 +1,122 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from typing import Dict, Iterable, List, Optional
+from app.model.dataset import Dataset, dataset_labels
+from app.model.image import Image, ImageStatus
+from app.model.annotation import Annotation
+
+# Counter column holding the number of images in each status
+STATUS_COUNTERS = {
+    ImageStatus.UPLOADING: "uploading_count",
+    ImageStatus.UPLOADED: "uploaded_count",
+    ImageStatus.ERROR: "error_count",
+}
+
+
+class DatasetCounterService:
+    """
+    Service maintaining the counter columns of datasets
+
+    Write paths call bump() inside their own transaction, so counters are
+    committed (or rolled back) together with the rows they describe.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def bump(self, dataset_id: int, **deltas: int) -> None:
+        """Add deltas to counter columns of a dataset (single UPDATE, no commit)"""
+        deltas = {name: delta for name, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        self.db.execute(
+            update(Dataset)
+            .where(Dataset.id == dataset_id)
+            .values({getattr(Dataset, name): getattr(Dataset, name) + delta
+                     for name, delta in deltas.items()})
+            .execution_options(synchronize_session=False)
+        )
+
+    def touch(self, dataset_id: int) -> None:
+        """
+        Set the updated_at of a dataset after a write that changes its
+        content but no counter (box edits, image dimensions...), so caches
+        keyed on it are invalidated (no commit)
+        """
+        self.db.execute(
+            update(Dataset)
+            .where(Dataset.id == dataset_id)
+            .values(updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+
+    def bump_many(self, deltas_by_dataset: Dict[int, Dict[str, int]]) -> None:
+        """Add deltas to counter columns of several datasets (no commit)"""
+        for dataset_id, deltas in deltas_by_dataset.items():
+            self.bump(dataset_id, **deltas)
+
+    def reset_images(self, dataset_id: int) -> None:
+        """Zero the image and annotation counters of a dataset whose images were all deleted (no commit)"""
+        self.db.execute(
+            update(Dataset)
+            .where(Dataset.id == dataset_id)
+            .values(image_count=0, uploading_count=0, uploaded_count=0, error_count=0,
+                    annotation_count=0, total_bytes=0)
+            .execution_options(synchronize_session=False)
+        )
+
+    def status_change_deltas(
+        self,
+        changes: Iterable[tuple],
+        new_status: ImageStatus
+    ) -> Dict[int, Dict[str, int]]:
+        """
+        Counter deltas for images switching to a new status
+
+        Args:
+            changes: (dataset_id, old_status) tuples, one per image
+            new_status: Status the images switch to
+        """
+        deltas: Dict[int, Dict[str, int]] = {}
+        for dataset_id, old_status in changes:
+            if old_status == new_status:
+                continue
+            dataset_deltas = deltas.setdefault(dataset_id, {})
+            old_counter = STATUS_COUNTERS[ImageStatus(old_status)]
+            new_counter = STATUS_COUNTERS[new_status]
+            dataset_deltas[old_counter] = dataset_deltas.get(old_counter, 0) - 1
+            dataset_deltas[new_counter] = dataset_deltas.get(new_counter, 0) + 1
+        return deltas
+
+    def recompute(self, dataset_ids: Optional[List[int]] = None) -> int:
+        """
+        Recompute counters from scratch (single UPDATE, commits)
+
+        Returns number of datasets updated
+        """
+        def image_count(*conditions):
+            return select(func.count(Image.id)).where(
+                Image.dataset_id == Dataset.id, *conditions).scalar_subquery()
+
+        query = update(Dataset).values(
+            image_count=image_count(),
+            uploading_count=image_count(
+                Image.status == ImageStatus.UPLOADING),
+            uploaded_count=image_count(Image.status == ImageStatus.UPLOADED),
+            error_count=image_count(Image.status == ImageStatus.ERROR),
+            total_bytes=select(func.coalesce(func.sum(Image.file_size), 0)).where(
+                Image.dataset_id == Dataset.id).scalar_subquery(),
+            annotation_count=select(func.count(Annotation.id)).join(
+                Image, Annotation.image_id == Image.id
+            ).where(Image.dataset_id == Dataset.id).scalar_subquery(),
+            label_count=select(func.count()).select_from(dataset_labels).where(
+                dataset_labels.c.dataset_id == Dataset.id).scalar_subquery(),
+        ).execution_options(synchronize_session=False)
+
+        if dataset_ids:
+            query = query.where(Dataset.id.in_(dataset_ids))
+
+        result = self.db.execute(query)
+        self.db.commit()
+        return result.rowcount
@@ -0,0 +1,224 @@
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy import delete, select
+from typing import Callable, Optional
+from datetime import datetime, timezone
+
+from app.core.config import settings
+from app.core.s3 import S3_DELETE_BATCH_SIZE, s3_client
+from app.model.annotation import Annotation
+from app.model.dataset import Dataset, DatasetStatus, dataset_labels
+from app.model.dataset_deletion import DatasetDeletion, DeletionStatus
+from app.model.dataset_version import DatasetVersion, VersionAnnotation, VersionImage, VersionLabel
+from app.model.image import Image
+from app.model.near_duplicate import NearDuplicateGroup, NearDuplicateGrouping
+from app.services.job_service import JobService
+from app.services.version_service import lock_versions
+
+# Max number of images (with their annotations) deleted per transaction
+ROW_DELETE_CHUNK_SIZE = 5000
+
+
+class DatasetDeletionService:
+    """
+    Service for asynchronous dataset deletion
+
+    start_deletion() hides the dataset, records a deletion and queues a
+    'dataset.delete' job; the job worker then calls run_deletion(), which
+    purges the S3 objects and the rows in bounded chunks, committing the
+    progress after each chunk.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._on_progress = None
+
+    def start_deletion(self, dataset_id: int) -> Optional[DatasetDeletion]:
+        """
+        Mark a dataset as deleting, record its deletion and queue the job
+        running it (commits)
+
+        If the dataset is already being deleted, the current deletion is
+        returned, unless it failed: a new attempt is then recorded.
+
+        Returns the deletion, or None if the dataset does not exist
+        """
+        # Wait for a version being written: once the dataset is marked
+        # deleting, no new version starts
+        lock_versions(self.db, dataset_id)
+        dataset = self.db.query(Dataset).options(raiseload("*")).filter(
+            Dataset.id == dataset_id).with_for_update().first()
+        if not dataset:
+            return None
+
+        if dataset.status == DatasetStatus.DELETING:
+            deletion = self.get_deletion(dataset_id)
+            if deletion and deletion.status != DeletionStatus.FAILED:
+                self.db.commit()
+                return deletion
+
+        dataset.status = DatasetStatus.DELETING
+        deletion = DatasetDeletion(
+            dataset_id=dataset.id,
+            dataset_name=dataset.name,
+            status=DeletionStatus.PENDING,
+            image_total=dataset.image_count,
+            rows_deleted=0,
+            objects_deleted=0,
+            error_count=0
+        )
+        self.db.add(deletion)
+        self.db.flush()
+        deletion.job_id = JobService(self.db).enqueue(
+            "dataset.delete", {"deletion_id": deletion.id}).id
+        self.db.commit()
+        self.db.refresh(deletion)
+        return deletion
+
+    def get_deletion(self, dataset_id: int) -> Optional[DatasetDeletion]:
+        """Get the latest deletion of a dataset"""
+        return self.db.query(DatasetDeletion).filter(
+            DatasetDeletion.dataset_id == dataset_id
+        ).order_by(DatasetDeletion.id.desc()).first()
+
+    def run_deletion(
+        self,
+        deletion_id: int,
+        on_progress: Optional[Callable[..., None]] = None
+    ) -> Optional[DatasetDeletion]:
+        """
+        Purge the S3 objects then the rows of a dataset being deleted
+
+        The dataset rows are only removed once every object is gone, so a
+        failed deletion keeps the dataset hidden and can be run again.
+
+        Args:
+            deletion_id: The deletion to run
+            on_progress: Called with the counters after each committed chunk
+        """
+        deletion = self.db.get(DatasetDeletion, deletion_id)
+        if not deletion or deletion.status == DeletionStatus.COMPLETED:
+            return deletion
+
+        deletion.status = DeletionStatus.RUNNING
+        deletion.error_count = 0
+        self.db.commit()
+        self._on_progress = on_progress
+
+        try:
+            self._purge_objects(deletion)
+            if deletion.error_count:
+                deletion.status = DeletionStatus.FAILED
+            else:
+                self._purge_rows(deletion)
+                deletion.status = DeletionStatus.COMPLETED
+        except Exception as e:
+            self.db.rollback()
+            print(f"Error deleting dataset {deletion.dataset_id}: {e}")
+            deletion.status = DeletionStatus.FAILED
+            deletion.error_count += 1
+            deletion.last_error = str(e)
+
+        deletion.completed_at = datetime.now(timezone.utc)
+        self.db.commit()
+        return deletion
+
+    def _purge_objects(self, deletion: DatasetDeletion) -> None:
+        """Delete every object under the dataset prefix, committing progress per batch"""
+        prefix = f"datasets/{deletion.dataset_id}/"
+        s3_client.abort_multipart_uploads(prefix)
+
+        # Gather enough listed keys to keep S3_MAX_CONCURRENCY DeleteObjects requests busy
+        batch_size = S3_DELETE_BATCH_SIZE * settings.S3_MAX_CONCURRENCY
+        batch = []
+        for keys in s3_client.iter_key_pages(prefix):
+            batch.extend(keys)
+            if len(batch) >= batch_size:
+                self._delete_objects(deletion, batch)
+                batch = []
+        self._delete_objects(deletion, batch)
+
+    def _delete_objects(self, deletion: DatasetDeletion, s3_keys: list[str]) -> None:
+        if not s3_keys:
+            return
+
+        errors = s3_client.delete_files(s3_keys)
+        deletion.objects_deleted += len(s3_keys) - len(errors)
+        if errors:
+            deletion.error_count += len(errors)
+            s3_key, message = next(iter(errors.items()))
+            deletion.last_error = f"{s3_key}: {message}"
+        self.db.commit()
+        self._report(deletion)
+
+    def _report(self, deletion: DatasetDeletion) -> None:
+        if self._on_progress:
+            self._on_progress(
+                rows_deleted=deletion.rows_deleted,
+                objects_deleted=deletion.objects_deleted,
+                error_count=deletion.error_count
+            )
+
+    def _purge_rows(self, deletion: DatasetDeletion) -> None:
+        """
+        Delete images and annotations in chunks, then the versions and the
+        near-duplicate groups, then the dataset itself
+        """
+        dataset_id = deletion.dataset_id
+        while True:
+            image_ids = self.db.execute(
+                select(Image.id).where(Image.dataset_id == dataset_id)
+                .limit(ROW_DELETE_CHUNK_SIZE)
+            ).scalars().all()
+            if not image_ids:
+                break
+
+            self.db.execute(
+                delete(Annotation)
+                .where(Annotation.image_id.in_(image_ids))
+                .execution_options(synchronize_session=False)
+            )
+            deletion.rows_deleted += self.db.execute(
+                delete(Image)
+                .where(Image.id.in_(image_ids))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            self.db.commit()
+            self._report(deletion)
+
+        for model in (VersionAnnotation, VersionImage, VersionLabel):
+            while True:
+                record_ids = select(model.id).where(
+                    model.dataset_id == dataset_id).limit(ROW_DELETE_CHUNK_SIZE)
+                deleted = self.db.execute(
+                    delete(model)
+                    .where(model.id.in_(record_ids.scalar_subquery()))
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                self.db.commit()
+                if deleted < ROW_DELETE_CHUNK_SIZE:
+                    break
+
+        self.db.execute(
+            delete(DatasetVersion).where(DatasetVersion.dataset_id == dataset_id)
+        )
+        grouping_ids = select(NearDuplicateGrouping.id).where(
+            NearDuplicateGrouping.dataset_id == dataset_id)
+        self.db.execute(
+            delete(NearDuplicateGroup)
+            .where(NearDuplicateGroup.grouping_id.in_(grouping_ids.scalar_subquery()))
+            .execution_options(synchronize_session=False)
+        )
+        self.db.execute(
+            delete(NearDuplicateGrouping).where(NearDuplicateGrouping.dataset_id == dataset_id)
+        )
+        self.db.execute(
+            delete(dataset_labels).where(
+                dataset_labels.c.dataset_id == dataset_id)
+        )
+        self.db.execute(
+            delete(Dataset)
+            .where(Dataset.id == dataset_id)
+            .execution_options(synchronize_session=False)
+        )
+        self.db.commit()
+
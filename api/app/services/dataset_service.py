@@ -1,24 +1,36 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, desc, asc, or_
+from sqlalchemy.orm import Session, joinedload, raiseload
+from sqlalchemy import desc, asc, or_, tuple_
 from typing import List, Optional
-from app.model.dataset import Dataset
+from datetime import datetime
+from app.model.dataset import Dataset, DatasetStatus
 from app.model.label import Label
-from app.model.image import Image
 from app.schema.dataset import DatasetCreate, DatasetUpdate
+from app.core.pagination import decode_cursor, encode_cursor
+from app.services.dataset_counter_service import DatasetCounterService
 from fastapi import HTTPException, status
 
+# JSON type of the sort value held by a dataset page cursor, per sort column
+CURSOR_VALUE_TYPES = {
+    "id": int,
+    "name": str,
+    "created_at": str,
+    "image_count": int,
+}
+
 
 class DatasetService:
     """Service for managing datasets"""
 
     def __init__(self, db: Session):
         self.db = db
+        self.counters = DatasetCounterService(db)
 
     def create_dataset(self, dataset_data: DatasetCreate) -> Dataset:
         """Create a new dataset with optional labels"""
         # Check if dataset with same name already exists
         existing_dataset = self.db.query(Dataset).filter(
-            Dataset.name == dataset_data.name
+            Dataset.name == dataset_data.name,
+            Dataset.status == DatasetStatus.ACTIVE
         ).first()
 
         if existing_dataset:
@@ -53,44 +65,48 @@ class DatasetService:
                 if label not in db_dataset.labels:
                     db_dataset.labels.append(label)
 
+            db_dataset.label_count = len(db_dataset.labels)
+
         self.db.commit()
         self.db.refresh(db_dataset)
 
         return db_dataset
 
     def get_dataset(self, dataset_id: int) -> Optional[Dataset]:
-        """Get a dataset by ID"""
-        return self.db.query(Dataset).filter(Dataset.id == dataset_id).first()
+        """Get a dataset by ID (datasets being deleted are ignored)"""
+        return self.db.query(Dataset).filter(
+            Dataset.id == dataset_id,
+            Dataset.status == DatasetStatus.ACTIVE
+        ).first()
     
     def get_dataset_detail(self, dataset_id: int) -> Optional[dict]:
-        """Get detailed dataset information with counts"""
-        dataset = self.db.query(Dataset).filter(
-            Dataset.id == dataset_id).first()
-        
+        """
+        Get detailed dataset information with counts
+
+        The counts come from the counter columns: this is a single SELECT on
+        datasets, the images and labels relationships are never loaded.
+        """
+        dataset = self.db.query(Dataset).options(raiseload("*")).filter(
+            Dataset.id == dataset_id,
+            Dataset.status == DatasetStatus.ACTIVE
+        ).first()
+
         if not dataset:
             return None
-        
-        # Count images
-        image_count = len(dataset.images) if dataset.images else 0
-
-        # Count annotations across all images in the dataset
-        from app.model.annotation import Annotation
-        annotation_count = self.db.query(Annotation).join(Image).filter(
-            Image.dataset_id == dataset_id
-        ).count()
-        
-        # Count labels
-        label_count = len(dataset.labels) if dataset.labels else 0
-        
+
         return {
             "id": dataset.id,
             "name": dataset.name,
             "description": dataset.description,
             "created_at": dataset.created_at,
             "updated_at": dataset.updated_at,
-            "image_count": image_count,
-            "annotation_count": annotation_count,
-            "label_count": label_count
+            "image_count": dataset.image_count,
+            "uploading_count": dataset.uploading_count,
+            "uploaded_count": dataset.uploaded_count,
+            "error_count": dataset.error_count,
+            "annotation_count": dataset.annotation_count,
+            "label_count": dataset.label_count,
+            "total_bytes": dataset.total_bytes
         }
 
     def get_datasets(
@@ -100,18 +116,28 @@ class DatasetService:
         search: Optional[str] = None,
         label_name: Optional[str] = None,
         sort_by: str = "name",
-        sort_order: str = "asc"
-    ) -> List[Dataset]:
-        """Get all datasets with search, filtering and sorting"""
-        query = self.db.query(Dataset)
+        sort_order: str = "asc",
+        cursor: Optional[str] = None
+    ) -> dict:
+        """
+        Get all datasets with search, filtering and sorting
+
+        Rows are ordered by the sort column then by ID. If a cursor is given,
+        skip is ignored and the page starts right after the cursor (keyset
+        pagination on the (sort column, id) pair).
 
-        # Add image count for sorting
-        query = query.outerjoin(Image).group_by(Dataset.id)
+        Counts are read from the counter columns, so a page is fetched with a
+        single statement and no relationship is loaded.
+
+        Returns dict with the datasets and the cursor of the next page
+        """
+        query = self.db.query(Dataset).options(raiseload("*")).filter(
+            Dataset.status == DatasetStatus.ACTIVE)
 
         # Add label filtering if specified
         if label_name:
-            query = query.join(Dataset.labels).filter(
-                Label.name.ilike(f"%{label_name}%"))
+            query = query.filter(Dataset.labels.any(
+                Label.name.ilike(f"%{label_name}%")))
 
         # Add text search
         if search:
@@ -122,25 +148,69 @@ class DatasetService:
                 )
             )
 
-        # Add sorting
-        if sort_by == "id":
-            order_func = asc(
-                Dataset.id) if sort_order == "asc" else desc(Dataset.id)
-        elif sort_by == "name":
-            order_func = asc(
-                Dataset.name) if sort_order == "asc" else desc(Dataset.name)
-        elif sort_by == "created_at":
-            order_func = asc(Dataset.created_at) if sort_order == "asc" else desc(
-                Dataset.created_at)
-        elif sort_by == "image_count":
-            order_func = asc(func.count(Image.id)) if sort_order == "asc" else desc(
-                func.count(Image.id))
+        # Add sorting, with the ID as tie-breaker so the order is stable
+        sort_columns = {
+            "id": Dataset.id,
+            "name": Dataset.name,
+            "created_at": Dataset.created_at,
+            "image_count": Dataset.image_count,
+        }
+        if sort_by not in sort_columns:
+            sort_by, sort_order = "id", "asc"  # Default fallback
+        sort_column = sort_columns[sort_by]
+        descending = sort_order != "asc"
+
+        if descending:
+            query = query.order_by(desc(sort_column), desc(Dataset.id))
         else:
-            order_func = asc(Dataset.id)  # Default fallback
+            query = query.order_by(asc(sort_column), asc(Dataset.id))
 
-        query = query.order_by(order_func)
+        if cursor:
+            last_value, last_id = self._decode_page_cursor(cursor, sort_by, descending)
+            sort_key = tuple_(sort_column, Dataset.id)
+            query = query.filter(
+                sort_key < tuple_(last_value, last_id) if descending
+                else sort_key > tuple_(last_value, last_id)
+            )
+        else:
+            query = query.offset(skip)
+
+        # Fetch one extra row to know whether there is a next page
+        rows = query.add_columns(sort_column).limit(limit + 1).all()
+        next_cursor = None
+        if len(rows) > limit:
+            last_dataset, last_value = rows[limit - 1]
+            next_cursor = encode_cursor(
+                sort_by, "desc" if descending else "asc", last_value, last_dataset.id)
+
+        return {"items": [dataset for dataset, _ in rows[:limit]], "next_cursor": next_cursor}
+
+    @staticmethod
+    def _decode_page_cursor(cursor: str, sort_by: str, descending: bool) -> tuple:
+        """
+        Decode a get_datasets cursor into the (sort value, id) of the last row
+
+        Cursors carry the sort they were made for: one replayed with another
+        sort, or holding values of the wrong type, raises a 400 error.
+        """
+        cursor_sort_by, cursor_order, last_value, last_id = decode_cursor(cursor, 4)
+        if (cursor_sort_by, cursor_order) != (sort_by, "desc" if descending else "asc"):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Pagination cursor does not match the sort order"
+            )
 
-        return query.offset(skip).limit(limit).all()
+        try:
+            if not isinstance(last_id, int) or not isinstance(last_value, CURSOR_VALUE_TYPES[sort_by]):
+                raise TypeError
+            if sort_by == "created_at":
+                last_value = datetime.fromisoformat(last_value)
+        except (TypeError, ValueError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
+        return last_value, last_id
 
     def update_dataset(self, dataset_id: int, dataset_data: DatasetUpdate) -> Optional[Dataset]:
         """Update a dataset"""
@@ -153,7 +223,8 @@ class DatasetService:
         if dataset_data.name and dataset_data.name != db_dataset.name:
             existing_dataset = self.db.query(Dataset).filter(
                 Dataset.name == dataset_data.name,
-                Dataset.id != dataset_id
+                Dataset.id != dataset_id,
+                Dataset.status == DatasetStatus.ACTIVE
             ).first()
 
             if existing_dataset:
@@ -172,18 +243,6 @@ class DatasetService:
 
         return db_dataset
 
-    def delete_dataset(self, dataset_id: int) -> bool:
-        """Delete a dataset"""
-        db_dataset = self.get_dataset(dataset_id)
-
-        if not db_dataset:
-            return False
-
-        self.db.delete(db_dataset)
-        self.db.commit()
-
-        return True
-
     def add_label_to_dataset(self, dataset_id: int, label_id: int) -> bool:
         """Add a label to a dataset"""
         dataset = self.get_dataset(dataset_id)
@@ -194,6 +253,7 @@ class DatasetService:
 
         if label not in dataset.labels:
             dataset.labels.append(label)
+            self.counters.bump(dataset_id, label_count=1)
             self.db.commit()
 
         return True
@@ -208,6 +268,7 @@ class DatasetService:
 
         if label in dataset.labels:
             dataset.labels.remove(label)
+            self.counters.bump(dataset_id, label_count=-1)
             self.db.commit()
 
         return True
@@ -0,0 +1,213 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from typing import Callable, Iterator, Optional
+from datetime import datetime, timezone
+from itertools import groupby
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.exporters import (
+    coco_annotation, coco_image, coco_stream, export_name, voc_xml, yolo_data_yaml, yolo_labels, zip_stream)
+from app.core.s3 import s3_client
+from app.model.annotation import Annotation
+from app.model.dataset import Dataset, DatasetStatus, dataset_labels
+from app.model.image import Image, ImageStatus
+from app.model.label import Label
+from app.schema.export import ExportFormat
+
+# File extension and content type of each export format
+EXPORT_FILES = {
+    ExportFormat.COCO: ("json", "application/json"),
+    ExportFormat.YOLO: ("zip", "application/zip"),
+    ExportFormat.VOC: ("zip", "application/zip"),
+}
+BOX_FIELDS = (Annotation.label_id, Annotation.bbox_xmin, Annotation.bbox_ymin,
+              Annotation.bbox_xmax, Annotation.bbox_ymax)
+
+
+def stream_export(dataset_id: int, export_format: ExportFormat, stats: Optional[dict] = None) -> Iterator[bytes]:
+    """
+    Export of a dataset read from its own REPEATABLE READ session, so every
+    pass sees the same snapshot and the session lives exactly as long as the
+    stream (a response may be streamed after the request session is closed)
+    """
+    db = SessionLocal()
+    try:
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        yield from ExportService(db).iter_export(dataset_id, export_format, stats)
+    finally:
+        db.close()
+
+
+class ExportService:
+    """Service for exporting the annotations of a dataset for training"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_dataset(self, dataset_id: int) -> Optional[Dataset]:
+        """Get an active dataset, or None if it does not exist or is being deleted"""
+        return self.db.query(Dataset).filter(
+            Dataset.id == dataset_id, Dataset.status == DatasetStatus.ACTIVE).first()
+
+    def export_filename(self, dataset_id: int, export_format: ExportFormat) -> str:
+        return f"dataset-{dataset_id}-{export_format.value}.{EXPORT_FILES[export_format][0]}"
+
+    def iter_export(self, dataset_id: int, export_format: ExportFormat, stats: Optional[dict] = None) -> Iterator[bytes]:
+        """
+        Export the uploaded images of a dataset and their annotations
+
+        COCO is one JSON document; YOLO (classes.txt, data.yaml and a
+        labels/*.txt file per image) and Pascal VOC (an Annotations/*.xml file
+        per image) are ZIP archives. Rows are read with server-side cursors,
+        EXPORT_BATCH_SIZE at a time, and the output is produced as it goes,
+        so memory does not grow with the dataset.
+
+        Boxes missing a coordinate or whose label is not linked to the
+        dataset are left out; in YOLO, so are the images whose size is
+        unknown. stats, if given, is filled with the images, annotations and
+        skipped counts once the export is complete.
+        """
+        stats = stats if stats is not None else {}
+        stats.update(images=0, annotations=0, skipped=0)
+        labels = self.db.execute(
+            select(Label.id, Label.name)
+            .join(dataset_labels, dataset_labels.c.label_id == Label.id)
+            .where(dataset_labels.c.dataset_id == dataset_id)
+            .order_by(Label.id)
+        ).all()
+
+        if export_format == ExportFormat.COCO:
+            return self._iter_coco(dataset_id, labels, stats)
+        if export_format == ExportFormat.YOLO:
+            return zip_stream(self._yolo_files(dataset_id, labels, stats))
+        return zip_stream(self._voc_files(dataset_id, labels, stats))
+
+    def export_to_s3(
+        self,
+        dataset_id: int,
+        export_format: ExportFormat,
+        on_progress: Optional[Callable[..., None]] = None
+    ) -> dict:
+        """
+        Write an export to S3 under the dataset's prefix (deleted with it),
+        with a streamed multipart upload
+
+        Returns dict with the S3 key, size, counts and a download URL valid
+        EXPORT_DOWNLOAD_EXPIRES_IN seconds
+        """
+        extension, content_type = EXPORT_FILES[export_format]
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        s3_key = f"datasets/{dataset_id}/exports/{stamp}_{export_format.value}.{extension}"
+
+        stats = {}
+        size = s3_client.upload_stream(
+            s3_key,
+            stream_export(dataset_id, export_format, stats),
+            content_type,
+            on_part=(lambda parts, written: on_progress(bytes_written=written)) if on_progress else None
+        )
+        if size is None:
+            raise RuntimeError(f"Could not upload export to {s3_key}")
+
+        return {
+            "format": export_format.value,
+            "s3_key": s3_key,
+            "size": size,
+            **stats,
+            "download_url": s3_client.generate_presigned_download_url(
+                s3_key, expires_in=settings.EXPORT_DOWNLOAD_EXPIRES_IN),
+            "expires_in": settings.EXPORT_DOWNLOAD_EXPIRES_IN
+        }
+
+    def _images_query(self, dataset_id: int):
+        return (select(Image.id, Image.s3_key, Image.width, Image.height)
+                .where(Image.dataset_id == dataset_id, Image.status == ImageStatus.UPLOADED))
+
+    def _stream(self, query):
+        """Row batches of a query read through a server-side cursor"""
+        return self.db.execute(
+            query.execution_options(yield_per=settings.EXPORT_BATCH_SIZE)).partitions()
+
+    def _iter_images_with_boxes(self, dataset_id: int, label_ids: set, stats: dict) -> Iterator[tuple]:
+        """
+        (image row, boxes) for each uploaded image in ID order, boxes being
+        (label_id, xmin, ymin, xmax, ymax) tuples, from a single ordered join
+        """
+        query = (self._images_query(dataset_id)
+                 .add_columns(Annotation.id.label("annotation_id"), *BOX_FIELDS)
+                 .outerjoin(Annotation, Annotation.image_id == Image.id)
+                 .order_by(Image.id, Annotation.id))
+        rows = (row for partition in self._stream(query) for row in partition)
+        for _, image_rows in groupby(rows, key=lambda row: row.id):
+            image_rows = list(image_rows)
+            boxes = []
+            for row in image_rows:
+                if row.annotation_id is None:
+                    continue
+                box = (row.label_id, row.bbox_xmin, row.bbox_ymin, row.bbox_xmax, row.bbox_ymax)
+                if None in box or row.label_id not in label_ids:
+                    stats["skipped"] += 1
+                else:
+                    boxes.append(box)
+            yield image_rows[0], boxes
+
+    def _iter_coco(self, dataset_id: int, labels: list, stats: dict) -> Iterator[bytes]:
+        label_ids = {label.id for label in labels}
+
+        def images():
+            for partition in self._stream(self._images_query(dataset_id).order_by(Image.id)):
+                stats["images"] += len(partition)
+                yield [coco_image(row.id, export_name(row.s3_key), row.width, row.height)
+                       for row in partition]
+
+        def annotations():
+            query = (select(Annotation.id, Annotation.image_id, *BOX_FIELDS)
+                     .join(Image, Image.id == Annotation.image_id)
+                     .where(Image.dataset_id == dataset_id, Image.status == ImageStatus.UPLOADED)
+                     .order_by(Annotation.id))
+            for partition in self._stream(query):
+                batch = []
+                for row in partition:
+                    box = (row.bbox_xmin, row.bbox_ymin, row.bbox_xmax, row.bbox_ymax)
+                    if None in box or row.label_id not in label_ids:
+                        stats["skipped"] += 1
+                        continue
+                    batch.append(coco_annotation(row.id, row.image_id, row.label_id, box))
+                stats["annotations"] += len(batch)
+                yield batch
+
+        header = {
+            "info": {
+                "description": f"LabelLoop dataset {dataset_id}",
+                "date_created": datetime.now(timezone.utc).isoformat()
+            },
+            "licenses": [],
+            "categories": [{"id": label.id, "name": label.name, "supercategory": ""}
+                           for label in labels]
+        }
+        return coco_stream(header, images(), annotations())
+
+    def _yolo_files(self, dataset_id: int, labels: list, stats: dict) -> Iterator[tuple[str, str]]:
+        names = [label.name for label in labels]
+        classes = {label.id: index for index, label in enumerate(labels)}
+        yield "classes.txt", "".join(f"{name}\n" for name in names)
+        yield "data.yaml", yolo_data_yaml(names)
+
+        for image, boxes in self._iter_images_with_boxes(dataset_id, set(classes), stats):
+            if not image.width or not image.height:
+                stats["skipped"] += len(boxes)
+                continue
+            stats["images"] += 1
+            stats["annotations"] += len(boxes)
+            stem = export_name(image.s3_key).rsplit(".", 1)[0]
+            yield f"labels/{stem}.txt", yolo_labels(boxes, classes, image.width, image.height)
+
+    def _voc_files(self, dataset_id: int, labels: list, stats: dict) -> Iterator[tuple[str, str]]:
+        names = {label.id: label.name for label in labels}
+        for image, boxes in self._iter_images_with_boxes(dataset_id, set(names), stats):
+            stats["images"] += 1
+            stats["annotations"] += len(boxes)
+            name = export_name(image.s3_key)
+            yield f"Annotations/{name.rsplit('.', 1)[0]}.xml", voc_xml(
+                name, image.width, image.height, boxes, names)
@@ -3,7 +3,7 @@ from sqlalchemy import text
 from sqlalchemy.engine import Engine
 from app.core.config import settings
 from app.core.s3 import s3_client
-from app.schema.health import Health, DBHealth, ComponentHealth, S3Health
+from app.schema.health import Health, DBHealth, ComponentHealth, S3Health, CacheStats
 
 
 class HealthService:
@@ -24,7 +24,11 @@ class HealthService:
         has_error = any(c.status == "error" for c in components.values())
         global_status = "degraded" if has_error else "ok"
 
-        return Health(status=global_status, components=components)
+        return Health(
+            status=global_status,
+            components=components,
+            download_url_cache=CacheStats(**s3_client.url_cache.stats())
+        )
 
     def check_db(self) -> DBHealth:
         if not settings.database_url:
@@ -1,11 +1,60 @@
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from sqlalchemy import BigInteger, Integer, and_, cast, column, delete, func, insert, or_, select, update, values
+from typing import Callable, List, Optional, Tuple
+from collections import Counter, defaultdict
+import base64
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import multiprocessing
+import os
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
 
-from app.model.image import Image, ImageStatus
+from app.model.annotation import Annotation
+from app.model.dataset import Dataset, DatasetStatus
+from app.model.image import DerivativeStatus, Image, ImageStatus
 from app.schema.image import ImageCreate, ImageUpdate, ImageUploadRequest
+from app.core.config import settings
+from app.core.derivatives import (
+    DERIVATIVE_CONTENT_TYPE, DERIVATIVE_SIZES, derivative_key, derivative_keys, render_derivatives)
+from app.core.image_probe import (
+    image_dimensions, jpeg_dimensions_at, jpeg_resume_offset, tiff_dimensions, tiff_ifd_offset)
+from app.core.hash_index import to_signed
+from app.core.pagination import decode_cursor, encode_cursor
 from app.core.s3 import s3_client
+from app.services.dataset_counter_service import DatasetCounterService, STATUS_COUNTERS
+from app.services.job_service import JobService
+
+# Max number of S3 keys matched per UPDATE when confirming from bucket notifications
+EVENT_BATCH_SIZE = 1000
+# S3 limit on the number of parts of a multipart upload
+MAX_MULTIPART_PARTS = 10000
+# Max number of 'uploading' images checked per transaction by the stale upload reaper
+REAPER_BATCH_SIZE = 500
+# Max number of images probed per transaction by the metadata extraction stage
+PROBE_BATCH_SIZE = 500
+# Max number of ranged GETs per image when probing its headers
+MAX_PROBE_READS = 8
+# Max number of images rendered per transaction by the thumbnail/preview stage
+DERIVATIVE_BATCH_SIZE = 64
+# Derived files are rewritten in place, so browsers only cache them for the
+# longest presigned URL lifetime
+DERIVATIVE_CACHE_CONTROL = "private, max-age=604800"
+
+
+def _runs_by_size(candidates: List[tuple], max_bytes: int):
+    """Consecutive runs of candidates whose file sizes add up to at most max_bytes (a larger file alone)"""
+    run = []
+    size = 0
+    for candidate in candidates:
+        if run and size + candidate.file_size > max_bytes:
+            yield run
+            run = []
+            size = 0
+        run.append(candidate)
+        size += candidate.file_size
+    if run:
+        yield run
 
 
 class ImageService:
@@ -13,6 +62,7 @@ class ImageService:
 
     def __init__(self, db: Session):
         self.db = db
+        self.counters = DatasetCounterService(db)
 
     def generate_s3_key(self, dataset_id: int, filename: str) -> str:
         """
@@ -24,97 +74,999 @@ class ImageService:
         safe_filename = filename.replace(" ", "_")
         return f"datasets/{dataset_id}/images/{unique_id}_{safe_filename}"
 
-    def create_image_record(
+    def dataset_accepts_uploads(self, dataset_id: int) -> bool:
+        """Check that a dataset exists and is not being deleted"""
+        return self.db.execute(
+            select(Dataset.id).where(
+                Dataset.id == dataset_id,
+                Dataset.status == DatasetStatus.ACTIVE)
+        ).first() is not None
+
+    def create_image_records(
         self,
         dataset_id: int,
-        file_info: ImageUploadRequest,
-        s3_key: str
-    ) -> Image:
+        files: List[ImageUploadRequest],
+        s3_keys: List[str]
+    ) -> dict:
         """
-        Create an image record in DB with 'uploading' status
+        Create image records in DB with 'uploading' status using a single
+        INSERT ... RETURNING statement. Does not commit.
+
+        Returns dict mapping each S3 key to the created image ID
         """
-        db_image = Image(
-            filename=file_info.filename,
-            s3_key=s3_key,
-            file_size=file_info.file_size,
-            mime_type=file_info.mime_type,
-            status=ImageStatus.UPLOADING,
-            dataset_id=dataset_id
+        rows = [
+            {
+                "filename": file_info.filename,
+                "s3_key": s3_key,
+                "file_size": file_info.file_size,
+                "mime_type": file_info.mime_type,
+                "content_sha256": file_info.sha256,
+                "status": ImageStatus.UPLOADING,
+                "dataset_id": dataset_id
+            }
+            for file_info, s3_key in zip(files, s3_keys)
+        ]
+        result = self.db.execute(
+            insert(Image).values(rows).returning(Image.id, Image.s3_key)
         )
-        self.db.add(db_image)
-        self.db.commit()
-        self.db.refresh(db_image)
-        return db_image
+        self.counters.bump(
+            dataset_id,
+            image_count=len(rows),
+            uploading_count=len(rows),
+            total_bytes=sum(file_info.file_size for file_info in files)
+        )
+        return {s3_key: image_id for image_id, s3_key in result}
 
     def prepare_upload(
         self,
         dataset_id: int,
         files: List[ImageUploadRequest]
-    ) -> List[dict]:
+    ) -> dict:
         """
         Prepare batch upload: create DB records and generate presigned URLs
 
-        Returns list of dicts with:
-        - image_id
-        - upload_url
-        - s3_key
-        - expires_in
+        All records are inserted in one statement, all keys are presigned in
+        one pass and the whole batch is committed once. Files whose URL could
+        not be generated are flagged as 'error' and left out of the result.
+
+        Files sent with their SHA-256 are deduplicated against uploaded images:
+        content the dataset already has (or that comes earlier in the batch)
+        gets neither a record nor a URL. Content stored in another dataset
+        gets an 'uploading' record and no URL, and an 'images.copy_content'
+        job copies it inside the bucket (see copy_stored_content), so it is
+        never uploaded again. The checksum is signed into the upload URL, so
+        stored hashes always match the content.
+
+        Returns dict with:
+        - uploads: list of dicts with image_id, upload_url, s3_key, expires_in
+          and checksum_sha256
+        - deduplicated: list of dicts with filename, sha256, image_id and
+          copy_job_id (None if the dataset already had the content)
         """
-        uploads = []
+        if not files:
+            return {"uploads": [], "deduplicated": []}
 
+        expires_in = settings.PRESIGNED_UPLOAD_EXPIRES_IN
+        stored = self._find_stored_content(
+            dataset_id, {file_info.sha256 for file_info in files if file_info.sha256})
+
+        # Only the first file of each content not in the dataset yet gets a record
+        new_files = []
+        duplicates = []
+        first_in_batch = set()
         for file_info in files:
-            # Generate unique S3 key
-            s3_key = self.generate_s3_key(dataset_id, file_info.filename)
+            sha256 = file_info.sha256
+            if sha256 and (sha256 in first_in_batch or
+                           (sha256 in stored and stored[sha256].dataset_id == dataset_id)):
+                duplicates.append(file_info)
+                continue
+            if sha256:
+                first_in_batch.add(sha256)
+            new_files.append(file_info)
 
-            # Create DB record with 'uploading' status
-            db_image = self.create_image_record(dataset_id, file_info, s3_key)
+        # Generate unique S3 keys and create DB records with 'uploading' status
+        s3_keys = [self.generate_s3_key(dataset_id, file_info.filename)
+                   for file_info in new_files]
+        image_ids = self.create_image_records(dataset_id, new_files, s3_keys) if new_files else {}
+        keys_by_sha256 = {file_info.sha256: s3_key
+                          for file_info, s3_key in zip(new_files, s3_keys) if file_info.sha256}
 
-            # Generate presigned URL
-            upload_url = s3_client.generate_presigned_upload_url(
-                s3_key=s3_key,
-                content_type=file_info.mime_type,
-                expires_in=3600  # 1 hour
-            )
+        # Content stored in another dataset: copied inside the bucket by a
+        # job, so nothing is uploaded
+        to_copy = {s3_key for sha256, s3_key in keys_by_sha256.items() if sha256 in stored}
+        copy_job_id = None
+        if to_copy:
+            copy_job_id = JobService(self.db).enqueue(
+                "images.copy_content", {"image_ids": [image_ids[s3_key] for s3_key in to_copy]}).id
+
+        # Generate presigned URLs for the rest of the batch
+        to_upload = [(file_info, s3_key) for file_info, s3_key in zip(new_files, s3_keys)
+                     if s3_key not in to_copy]
+        checksums = {s3_key: base64.b64encode(bytes.fromhex(file_info.sha256)).decode()
+                     for file_info, s3_key in to_upload if file_info.sha256}
+        upload_urls = s3_client.generate_presigned_upload_urls(
+            [(s3_key, file_info.mime_type) for file_info, s3_key in to_upload],
+            expires_in=expires_in,
+            checksums=checksums
+        )
 
+        uploads = []
+        failed_ids = []
+        for _, s3_key in to_upload:
+            upload_url = upload_urls.get(s3_key)
             if not upload_url:
-                # If URL generation fails, mark image as error
-                db_image.status = ImageStatus.ERROR
-                self.db.commit()
+                failed_ids.append(image_ids[s3_key])
                 continue
 
             uploads.append({
-                "image_id": db_image.id,
+                "image_id": image_ids[s3_key],
                 "upload_url": upload_url,
                 "s3_key": s3_key,
-                "expires_in": 3600
+                "expires_in": expires_in,
+                "checksum_sha256": checksums.get(s3_key)
             })
 
-        return uploads
+        # If URL generation failed, mark only those images as error
+        if failed_ids:
+            self.db.execute(
+                update(Image)
+                .where(Image.id.in_(failed_ids))
+                .values(status=ImageStatus.ERROR)
+            )
+            self.counters.bump(dataset_id, uploading_count=-len(failed_ids),
+                               error_count=len(failed_ids))
+
+        # Files that need no upload: copied, already in the dataset, or
+        # repeated in the batch
+        deduplicated = [
+            {"filename": file_info.filename, "sha256": file_info.sha256,
+             "image_id": image_ids[s3_key], "copy_job_id": copy_job_id}
+            for file_info, s3_key in zip(new_files, s3_keys) if s3_key in to_copy
+        ]
+        for file_info in duplicates:
+            s3_key = keys_by_sha256.get(file_info.sha256)
+            deduplicated.append({
+                "filename": file_info.filename,
+                "sha256": file_info.sha256,
+                "image_id": image_ids[s3_key] if s3_key else stored[file_info.sha256].id,
+                "copy_job_id": copy_job_id if s3_key in to_copy else None
+            })
+
+        self.db.commit()
+        return {"uploads": uploads, "deduplicated": deduplicated}
+
+    def copy_stored_content(self, image_ids: List[int]) -> dict:
+        """
+        Copy the content of 'uploading' images deduplicated by prepare_upload
+        from the uploaded images holding it, inside the bucket, and confirm
+        them (commits)
+
+        Copies run concurrently without going through the API (multipart
+        copy for large files). Images whose content is no longer stored
+        anywhere are marked 'error'. If a copy fails, the other images are
+        still confirmed and an error is raised at the end, so the job is
+        retried.
+
+        Returns dict with the counts (copied, missing)
+        """
+        candidates = self.db.execute(
+            select(Image.id, Image.dataset_id, Image.file_size,
+                   Image.s3_key, Image.content_sha256)
+            .where(Image.id.in_(image_ids),
+                   Image.status == ImageStatus.UPLOADING,
+                   Image.content_sha256.is_not(None))
+        ).all()
+
+        by_dataset = defaultdict(list)
+        for candidate in candidates:
+            by_dataset[candidate.dataset_id].append(candidate)
+        sources = {}
+        missing = []
+        for dataset_id, dataset_candidates in by_dataset.items():
+            stored = self._find_stored_content(
+                dataset_id, {candidate.content_sha256 for candidate in dataset_candidates})
+            for candidate in dataset_candidates:
+                if candidate.content_sha256 in stored:
+                    sources[candidate] = stored[candidate.content_sha256]
+                else:
+                    missing.append(candidate)
+
+        copy_errors = s3_client.copy_files(
+            [(source.s3_key, candidate.s3_key) for candidate, source in sources.items()])
+        copied, error_count = self._write_upload_results(
+            [(candidate, source.file_size) for candidate, source in sources.items()
+             if candidate.s3_key not in copy_errors],
+            missing
+        )
+        self.db.commit()
+
+        if copy_errors:
+            s3_key, message = next(iter(copy_errors.items()))
+            raise RuntimeError(f"{len(copy_errors)} copies failed, e.g. {s3_key}: {message}")
+        return {"copied": copied, "missing": error_count}
+
+    def _find_stored_content(self, dataset_id: int, hashes: set) -> dict:
+        """
+        Uploaded images holding the given contents, preferring images of the
+        dataset itself, then any active dataset
+
+        Returns dict mapping SHA-256 to a row with id, dataset_id, s3_key and file_size
+        """
+        if not hashes:
+            return {}
+
+        rows = self.db.execute(
+            select(Image.content_sha256, Image.id, Image.dataset_id,
+                   Image.s3_key, Image.file_size)
+            .join(Dataset, Dataset.id == Image.dataset_id)
+            .where(Image.content_sha256.in_(hashes),
+                   Image.status == ImageStatus.UPLOADED,
+                   Dataset.status == DatasetStatus.ACTIVE)
+            .distinct(Image.content_sha256)
+            .order_by(Image.content_sha256, (Image.dataset_id == dataset_id).desc(), Image.id)
+        ).all()
+        return {row.content_sha256: row for row in rows}
+
+    def multipart_part_size(self, file_size: int) -> int:
+        """
+        Part size for a multipart upload of the given file size
+
+        Uses MULTIPART_PART_SIZE, grown for huge files so the upload stays
+        within the S3 limit of 10,000 parts.
+        """
+        part_size = settings.MULTIPART_PART_SIZE
+        if file_size > part_size * MAX_MULTIPART_PARTS:
+            part_size = -(-file_size // MAX_MULTIPART_PARTS)
+        return part_size
+
+    def multipart_part_count(self, file_size: int) -> int:
+        """Number of parts of a multipart upload of the given file size"""
+        return max(1, -(-file_size // self.multipart_part_size(file_size)))
+
+    def prepare_multipart_upload(
+        self,
+        dataset_id: int,
+        file_info: ImageUploadRequest
+    ) -> Optional[dict]:
+        """
+        Prepare a multipart upload: start it in S3, create the DB record and
+        generate presigned URLs for every part so they can be uploaded in parallel
+
+        Returns the multipart session dict, or None if the upload could not be started
+        """
+        s3_key = self.generate_s3_key(dataset_id, file_info.filename)
+
+        upload_id = s3_client.create_multipart_upload(
+            s3_key=s3_key,
+            content_type=file_info.mime_type
+        )
+        if not upload_id:
+            return None
+
+        db_image = Image(
+            filename=file_info.filename,
+            s3_key=s3_key,
+            file_size=file_info.file_size,
+            mime_type=file_info.mime_type,
+            status=ImageStatus.UPLOADING,
+            upload_id=upload_id,
+            dataset_id=dataset_id
+        )
+        self.db.add(db_image)
+        self.counters.bump(dataset_id, image_count=1, uploading_count=1,
+                           total_bytes=file_info.file_size)
+        self.db.commit()
+        self.db.refresh(db_image)
+
+        return self._multipart_session(db_image, uploaded_parts=[])
+
+    def get_multipart_upload(self, image_id: int) -> Optional[dict]:
+        """
+        Resume a multipart upload: list the parts already stored in S3 and
+        generate presigned URLs for the missing ones
 
-    def confirm_upload(self, image_ids: List[int]) -> int:
+        Returns the multipart session dict, or None if no multipart upload is in progress
+        """
+        db_image = self.get_image(image_id)
+        if not db_image or db_image.status != ImageStatus.UPLOADING or not db_image.upload_id:
+            return None
+
+        uploaded_parts = s3_client.list_parts(
+            db_image.s3_key, db_image.upload_id)
+        if uploaded_parts is None:
+            return None
+
+        return self._multipart_session(db_image, uploaded_parts)
+
+    def abort_multipart_upload(self, image_id: int) -> bool:
+        """Abort a multipart upload in progress and mark the image as error"""
+        db_image = self.get_image(image_id)
+        if not db_image or not db_image.upload_id:
+            return False
+
+        s3_client.abort_multipart_upload(db_image.s3_key, db_image.upload_id)
+
+        self.counters.bump_many(self.counters.status_change_deltas(
+            [(db_image.dataset_id, db_image.status)], ImageStatus.ERROR))
+        db_image.upload_id = None
+        db_image.status = ImageStatus.ERROR
+        self.db.commit()
+        return True
+
+    def _multipart_session(self, db_image: Image, uploaded_parts: List[dict]) -> dict:
+        """Build the multipart session dict with presigned URLs for the parts still to upload"""
+        expires_in = settings.PRESIGNED_UPLOAD_EXPIRES_IN
+        part_size = self.multipart_part_size(db_image.file_size)
+        part_count = self.multipart_part_count(db_image.file_size)
+
+        uploaded_numbers = {part["part_number"] for part in uploaded_parts}
+        part_urls = s3_client.generate_presigned_part_urls(
+            s3_key=db_image.s3_key,
+            upload_id=db_image.upload_id,
+            part_numbers=[number for number in range(1, part_count + 1)
+                          if number not in uploaded_numbers],
+            expires_in=expires_in
+        )
+
+        return {
+            "image_id": db_image.id,
+            "s3_key": db_image.s3_key,
+            "upload_id": db_image.upload_id,
+            "part_size": part_size,
+            "part_count": part_count,
+            "parts": [
+                {"part_number": number, "upload_url": upload_url}
+                for number, upload_url in part_urls.items() if upload_url
+            ],
+            "uploaded_parts": uploaded_parts,
+            "expires_in": expires_in
+        }
+
+    def confirm_upload(self, image_ids: List[int], dataset_id: Optional[int] = None) -> int:
         """
         Confirm successful uploads by updating status to 'uploaded'
+
+        Candidate rows are loaded with one IN query, files are checked in S3
+        with concurrent HEAD requests, and the 'uploaded' / 'error' transitions
+        are written with two set-based UPDATEs. The real object size reported
+        by S3 is stored in file_size. Multipart uploads are completed first.
+
         Returns number of images updated
         """
+        if not image_ids:
+            return 0
+
+        query = select(
+            Image.id, Image.s3_key, Image.dataset_id, Image.file_size, Image.upload_id
+        ).where(
+            Image.id.in_(set(image_ids)),
+            Image.status == ImageStatus.UPLOADING
+        )
+        if dataset_id:
+            query = query.where(Image.dataset_id == dataset_id)
+        candidates = self.db.execute(query).all()
+
+        # Complete multipart uploads first so their objects exist. Those that
+        # cannot be completed yet stay 'uploading' so the client can resume them.
+        completed = s3_client.complete_multipart_uploads([
+            (candidate.s3_key, candidate.upload_id,
+             self.multipart_part_count(candidate.file_size))
+            for candidate in candidates if candidate.upload_id
+        ])
+        candidates = [candidate for candidate in candidates
+                      if not candidate.upload_id or completed[candidate.s3_key]]
+
+        # Verify files exist in S3
+        sizes = s3_client.head_objects(
+            [candidate.s3_key for candidate in candidates])
+
+        count, _ = self._write_upload_results(
+            uploaded=[(candidate, sizes[candidate.s3_key]) for candidate in candidates
+                      if sizes.get(candidate.s3_key) is not None],
+            missing=[candidate for candidate in candidates
+                     if sizes.get(candidate.s3_key) is None]
+        )
+
+        self.db.commit()
+        return count
+
+    def confirm_uploads_from_events(self, objects: List[Tuple[str, Optional[int]]]) -> int:
+        """
+        Confirm uploads from S3 'ObjectCreated' notifications
+
+        Images are matched on their unique s3_key and switched from
+        'uploading' to 'uploaded' in batches, without any HEAD request.
+        The size reported by the event, when present, is stored in file_size.
+        Objects that never produce an event are still handled by confirm_upload.
+
+        Args:
+            objects: List of (s3_key, size) tuples from the notification records
+
+        Returns number of images updated
+        """
+        # Deduplicate keys, keeping the last reported size
+        sizes = dict(objects)
+        created_objects = list(sizes.items())
+
         count = 0
-        for image_id in image_ids:
-            db_image = self.db.query(Image).filter(
-                Image.id == image_id).first()
-            if db_image and db_image.status == ImageStatus.UPLOADING:
-                # Verify file exists in S3
-                if s3_client.file_exists(db_image.s3_key):
-                    db_image.status = ImageStatus.UPLOADED
-                    count += 1
-                else:
-                    db_image.status = ImageStatus.ERROR
+        for start in range(0, len(created_objects), EVENT_BATCH_SIZE):
+            batch = dict(created_objects[start:start + EVENT_BATCH_SIZE])
+            candidates = self.db.execute(
+                select(Image.id, Image.s3_key, Image.dataset_id, Image.file_size).where(
+                    Image.s3_key.in_(batch.keys()),
+                    Image.status == ImageStatus.UPLOADING
+                )
+            ).all()
+            confirmed, _ = self._write_upload_results(
+                uploaded=[(candidate, candidate.file_size if batch[candidate.s3_key] is None
+                           else batch[candidate.s3_key])
+                          for candidate in candidates],
+                missing=[]
+            )
+            count += confirmed
 
         self.db.commit()
         return count
 
+    def _write_upload_results(self, uploaded: List[tuple], missing: List[tuple]) -> Tuple[int, int]:
+        """
+        Write the 'uploaded' and 'error' transitions of 'uploading' images with
+        two set-based UPDATEs and maintain the dataset counters. Does not commit.
+
+        Args:
+            uploaded: (candidate, real size) tuples for files found in S3
+            missing: Candidates whose file was not found
+            Candidates are rows with id, dataset_id and file_size.
+
+        Returns numbers of images switched to 'uploaded' and to 'error'
+        """
+        deltas = defaultdict(Counter)
+        count = 0
+        error_count = 0
+
+        if uploaded:
+            previous = {candidate.id: candidate for candidate, _ in uploaded}
+            confirmed = values(
+                column("id", Integer),
+                column("file_size", BigInteger),
+                name="confirmed"
+            ).data([(candidate.id, size) for candidate, size in uploaded])
+            # The status guard skips rows confirmed concurrently, RETURNING
+            # tells which rows actually switched
+            rows = self.db.execute(
+                update(Image)
+                .where(Image.id == confirmed.c.id,
+                       Image.status == ImageStatus.UPLOADING)
+                .values(status=ImageStatus.UPLOADED,
+                        file_size=confirmed.c.file_size,
+                        upload_id=None,
+                        derivative_status=DerivativeStatus.PENDING)
+                .returning(Image.id, Image.file_size)
+                .execution_options(synchronize_session=False)
+            ).all()
+            for image_id, file_size in rows:
+                candidate = previous[image_id]
+                deltas[candidate.dataset_id].update(
+                    uploading_count=-1,
+                    uploaded_count=1,
+                    total_bytes=file_size - candidate.file_size
+                )
+            count = len(rows)
+
+            # Metadata extraction (dimensions from the file headers) and
+            # thumbnail/preview stages
+            if rows:
+                payload = {"image_ids": [image_id for image_id, _ in rows]}
+                JobService(self.db).enqueue("images.probe_metadata", payload)
+                JobService(self.db).enqueue("images.generate_derivatives", payload)
+
+        if missing:
+            dataset_ids = {candidate.id: candidate.dataset_id for candidate in missing}
+            rows = self.db.execute(
+                update(Image)
+                .where(Image.id.in_(dataset_ids.keys()),
+                       Image.status == ImageStatus.UPLOADING)
+                .values(status=ImageStatus.ERROR)
+                .returning(Image.id)
+                .execution_options(synchronize_session=False)
+            ).all()
+            for (image_id,) in rows:
+                deltas[dataset_ids[image_id]].update(
+                    uploading_count=-1, error_count=1)
+            error_count = len(rows)
+
+        self.counters.bump_many(deltas)
+        return count, error_count
+
+    def reap_stale_uploads(
+        self,
+        action: Optional[str] = None,
+        batch_size: int = REAPER_BATCH_SIZE,
+        on_progress: Optional[Callable[..., None]] = None
+    ) -> dict:
+        """
+        Settle 'uploading' images abandoned after their presigned URL expired
+
+        Rows older than PRESIGNED_UPLOAD_EXPIRES_IN + UPLOAD_REAPER_GRACE
+        (MULTIPART_UPLOAD_MAX_AGE for multipart uploads) are processed in
+        batches of batch_size, each in its own short transaction and without
+        row locks: multipart uploads are completed when all their parts are
+        there (aborted otherwise), files are checked with concurrent HEAD
+        requests, files that landed are promoted to 'uploaded' and the rest
+        are flagged 'error' or deleted.
+
+        Args:
+            action: "error" or "delete" for images whose file never landed
+                (default: UPLOAD_REAPER_ACTION)
+            batch_size: Max number of images per batch
+            on_progress: Called with the counts after each batch
+
+        Returns dict with the counts (checked, promoted, flagged, deleted, aborted)
+        """
+        action = action or settings.UPLOAD_REAPER_ACTION
+        stale = or_(
+            and_(Image.upload_id.is_(None), Image.created_at < func.now() - timedelta(
+                seconds=settings.PRESIGNED_UPLOAD_EXPIRES_IN + settings.UPLOAD_REAPER_GRACE)),
+            and_(Image.upload_id.is_not(None), Image.created_at < func.now() - timedelta(
+                seconds=settings.MULTIPART_UPLOAD_MAX_AGE)),
+        )
+        stats = Counter(checked=0, promoted=0, flagged=0, deleted=0, aborted=0)
+        last_id = 0
+
+        while True:
+            candidates = self.db.execute(
+                select(Image.id, Image.s3_key, Image.dataset_id, Image.file_size, Image.upload_id)
+                .where(Image.status == ImageStatus.UPLOADING, Image.id > last_id, stale)
+                .order_by(Image.id)
+                .limit(batch_size)
+            ).all()
+            if not candidates:
+                break
+            last_id = candidates[-1].id
+
+            multipart = [candidate for candidate in candidates if candidate.upload_id]
+            completed = s3_client.complete_multipart_uploads([
+                (candidate.s3_key, candidate.upload_id,
+                 self.multipart_part_count(candidate.file_size))
+                for candidate in multipart
+            ])
+            for candidate in multipart:
+                if not completed[candidate.s3_key] and s3_client.abort_multipart_upload(
+                        candidate.s3_key, candidate.upload_id):
+                    stats["aborted"] += 1
+
+            sizes = s3_client.head_objects(
+                [candidate.s3_key for candidate in candidates])
+            missing = [candidate for candidate in candidates
+                       if sizes.get(candidate.s3_key) is None]
+
+            promoted, flagged = self._write_upload_results(
+                uploaded=[(candidate, sizes[candidate.s3_key]) for candidate in candidates
+                          if sizes.get(candidate.s3_key) is not None],
+                missing=[] if action == "delete" else missing
+            )
+            if action == "delete":
+                stats["deleted"] += self._delete_uploading(missing)
+            stats.update(checked=len(candidates), promoted=promoted, flagged=flagged)
+            self.db.commit()
+
+            if on_progress:
+                on_progress(**stats)
+
+        return dict(stats)
+
+    def _delete_uploading(self, candidates: List[tuple]) -> int:
+        """
+        Delete images still 'uploading' (guarded DELETE) and maintain the
+        dataset counters. Does not commit.
+
+        Returns number of images deleted
+        """
+        if not candidates:
+            return 0
+
+        rows = self.db.execute(
+            delete(Image)
+            .where(Image.id.in_([candidate.id for candidate in candidates]),
+                   Image.status == ImageStatus.UPLOADING)
+            .returning(Image.dataset_id, Image.file_size)
+            .execution_options(synchronize_session=False)
+        ).all()
+        deltas = defaultdict(Counter)
+        for dataset_id, file_size in rows:
+            deltas[dataset_id].update(
+                image_count=-1, uploading_count=-1, total_bytes=-file_size)
+        self.counters.bump_many(deltas)
+        return len(rows)
+
+    def probe_image_metadata(
+        self,
+        image_ids: Optional[List[int]] = None,
+        dataset_id: Optional[int] = None,
+        batch_size: int = PROBE_BATCH_SIZE,
+        on_progress: Optional[Callable[..., None]] = None
+    ) -> dict:
+        """
+        Fill width, height and real file_size of uploaded images from their
+        file headers, without downloading the files
+
+        Only the first IMAGE_PROBE_BYTES of each file are fetched, with
+        concurrent ranged GETs (JPEG, PNG, WebP, GIF and TIFF headers). JPEGs
+        whose frame header comes after large EXIF/ICC segments are followed
+        marker by marker with further small reads (up to MAX_PROBE_READS per
+        image), TIFFs storing their IFD further in the file get one more read
+        there. Each batch is written with one set-based UPDATE and committed.
+
+        Args:
+            image_ids: Images to probe (default: all uploaded images without dimensions)
+            dataset_id: Only probe images of this dataset
+            batch_size: Max number of images per batch
+            on_progress: Called with the counts after each batch
+
+        Returns dict with the counts (probed, measured, unknown, missing, bytes_read)
+        """
+        conditions = [
+            Image.status == ImageStatus.UPLOADED,
+            or_(Image.width.is_(None), Image.height.is_(None)),
+        ]
+        if image_ids:
+            conditions.append(Image.id.in_(image_ids))
+        if dataset_id:
+            conditions.append(Image.dataset_id == dataset_id)
+
+        stats = Counter(probed=0, measured=0, unknown=0, missing=0, bytes_read=0)
+        last_id = 0
+        while True:
+            candidates = self.db.execute(
+                select(Image.id, Image.s3_key, Image.dataset_id, Image.file_size)
+                .where(Image.id > last_id, *conditions)
+                .order_by(Image.id)
+                .limit(batch_size)
+            ).all()
+            if not candidates:
+                break
+            last_id = candidates[-1].id
+
+            results = self._probe_headers(candidates, stats)
+            self._write_probe_results(candidates, results)
+            self.db.commit()
+
+            stats["probed"] += len(candidates)
+            if on_progress:
+                on_progress(**stats)
+
+        return dict(stats)
+
+    def _probe_headers(self, candidates: List[tuple], stats: Counter) -> dict:
+        """
+        Read the headers of a batch of images, in rounds of concurrent ranged GETs
+
+        Returns dict mapping image IDs to (width, height, file size), with
+        None dimensions for unknown formats. Missing files are left out.
+        """
+        probe_bytes = settings.IMAGE_PROBE_BYTES
+        heads = s3_client.read_ranges(
+            [(candidate.s3_key, 0, probe_bytes) for candidate in candidates])
+
+        results = {}
+        # Image ID -> (file header, (s3_key, offset, length) of the next read)
+        pending = {}
+        for candidate in candidates:
+            read = heads[(candidate.s3_key, 0, probe_bytes)]
+            if read is None:
+                stats["missing"] += 1
+                continue
+            head, size = read
+            stats["bytes_read"] += len(head)
+            results[candidate.id] = (*(image_dimensions(head) or (None, None)), size)
+            if results[candidate.id][0] is not None or size <= len(head):
+                continue
+
+            # Dimensions past the header: JPEG frame header after large
+            # EXIF/ICC segments, or TIFF IFD stored further in the file
+            offset = jpeg_resume_offset(head)
+            if offset is None:
+                offset = tiff_ifd_offset(head)
+            if offset is not None and offset < size:
+                pending[candidate.id] = (head, (candidate.s3_key, offset, probe_bytes))
+
+        for _ in range(MAX_PROBE_READS - 1):
+            if not pending:
+                break
+            reads = s3_client.read_ranges([r for _, r in pending.values()])
+            still_pending = {}
+            for image_id, (head, byte_range) in pending.items():
+                read = reads[byte_range]
+                if read is None:
+                    continue
+                data, size = read
+                stats["bytes_read"] += len(data)
+                s3_key, offset, _ = byte_range
+                if tiff_ifd_offset(head) is not None:
+                    dimensions, offset = tiff_dimensions(head, data), None
+                else:
+                    dimensions, offset = jpeg_dimensions_at(data, offset)
+                if dimensions:
+                    results[image_id] = (*dimensions, size)
+                elif offset is not None and offset < size:
+                    still_pending[image_id] = (head, (s3_key, offset, probe_bytes))
+            pending = still_pending
+
+        for width, _, _ in results.values():
+            stats["measured" if width is not None else "unknown"] += 1
+        return results
+
+    def _write_probe_results(self, candidates: List[tuple], results: dict) -> None:
+        """
+        Write probed dimensions and sizes with one set-based UPDATE and
+        maintain the dataset byte counters. Does not commit.
+        """
+        if not results:
+            return
+
+        probed = values(
+            column("id", Integer),
+            column("width", Integer),
+            column("height", Integer),
+            column("file_size", BigInteger),
+            name="probed"
+        ).data([(image_id, *result) for image_id, result in results.items()])
+        rows = self.db.execute(
+            update(Image)
+            .where(Image.id == probed.c.id,
+                   Image.status == ImageStatus.UPLOADED)
+            # Cast: a VALUES column holding only NULLs is typed as text
+            .values(width=func.coalesce(cast(probed.c.width, Integer), Image.width),
+                    height=func.coalesce(cast(probed.c.height, Integer), Image.height),
+                    file_size=probed.c.file_size)
+            .returning(Image.id, Image.file_size)
+            .execution_options(synchronize_session=False)
+        ).all()
+
+        previous = {candidate.id: candidate for candidate in candidates}
+        deltas = defaultdict(Counter)
+        for image_id, file_size in rows:
+            candidate = previous[image_id]
+            deltas[candidate.dataset_id]["total_bytes"] += file_size - candidate.file_size
+        self.counters.bump_many(deltas)
+        # Dimensions may have changed where sizes did not
+        for dataset_id, delta in deltas.items():
+            if not any(delta.values()):
+                self.counters.touch(dataset_id)
+
+    def request_derivatives(self, image_ids: List[int]) -> int:
+        """
+        Queue the generation of thumbnails and previews of uploaded images
+        that have none (no commit)
+
+        The status guard flags each image 'pending' once, so concurrent
+        listings do not queue the same image twice.
+
+        Returns number of images queued
+        """
+        if not image_ids:
+            return 0
+
+        rows = self.db.execute(
+            update(Image)
+            .where(Image.id.in_(image_ids),
+                   Image.status == ImageStatus.UPLOADED,
+                   Image.derivative_status.is_(None))
+            .values(derivative_status=DerivativeStatus.PENDING)
+            .returning(Image.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        if rows:
+            JobService(self.db).enqueue(
+                "images.generate_derivatives",
+                {"image_ids": [image_id for (image_id,) in rows]})
+        return len(rows)
+
+    def generate_derivatives(
+        self,
+        image_ids: Optional[List[int]] = None,
+        dataset_id: Optional[int] = None,
+        batch_size: int = DERIVATIVE_BATCH_SIZE,
+        on_progress: Optional[Callable[..., None]] = None
+    ) -> dict:
+        """
+        Render the thumbnail and preview of uploaded images, store them next
+        to the originals (see app.core.derivatives) and save the perceptual
+        hash computed on the way
+
+        Originals are downloaded with concurrent GETs and decoded in a pool of
+        DERIVATIVE_PROCESSES processes, the WebP files are uploaded with
+        concurrent PUTs. Each batch is marked 'ready' or 'failed' (undecodable,
+        missing or larger than DERIVATIVE_MAX_SOURCE_BYTES) and committed.
+        Images whose derived files could not be uploaded stay 'pending' and an
+        error is raised at the end, so the job is retried. Images rendered
+        before hashes existed are rendered again to get their hash.
+
+        Args:
+            image_ids: Images to render (default: all uploaded images without derivatives or hash)
+            dataset_id: Only render images of this dataset
+            batch_size: Max number of images per batch
+            on_progress: Called with the counts after each batch
+
+        Returns dict with the counts (generated, failed, missing)
+        """
+        conditions = [
+            Image.status == ImageStatus.UPLOADED,
+            or_(Image.derivative_status.is_(None),
+                Image.derivative_status == DerivativeStatus.PENDING,
+                and_(Image.derivative_status == DerivativeStatus.READY,
+                     Image.dhash.is_(None))),
+        ]
+        if image_ids:
+            conditions.append(Image.id.in_(image_ids))
+        if dataset_id:
+            conditions.append(Image.dataset_id == dataset_id)
+
+        stats = Counter(generated=0, failed=0, missing=0)
+        upload_errors = {}
+        # Spawned rather than forked: the renderers only need Pillow, not a
+        # copy of this process and its database connections
+        with ProcessPoolExecutor(
+            max_workers=settings.DERIVATIVE_PROCESSES or os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            last_id = 0
+            while True:
+                candidates = self.db.execute(
+                    select(Image.id, Image.dataset_id, Image.s3_key, Image.file_size)
+                    .where(Image.id > last_id, *conditions)
+                    .order_by(Image.id)
+                    .limit(batch_size)
+                ).all()
+                if not candidates:
+                    break
+                last_id = candidates[-1].id
+
+                ready, failed, errors = self._render_derivatives(candidates, pool, stats)
+                upload_errors.update(errors)
+                if ready:
+                    rendered = values(
+                        column("id", Integer),
+                        column("dhash", BigInteger),
+                        name="rendered"
+                    ).data([(image_id, to_signed(value)) for image_id, value in ready])
+                    self.db.execute(
+                        update(Image)
+                        .where(Image.id == rendered.c.id)
+                        .values(derivative_status=DerivativeStatus.READY,
+                                dhash=rendered.c.dhash)
+                        .execution_options(synchronize_session=False)
+                    )
+                    # New hashes change the near-duplicate groups of their datasets
+                    dataset_ids = {candidate.id: candidate.dataset_id for candidate in candidates}
+                    for rendered_dataset_id in sorted({dataset_ids[image_id] for image_id, _ in ready}):
+                        self.counters.touch(rendered_dataset_id)
+                if failed:
+                    self.db.execute(
+                        update(Image)
+                        .where(Image.id.in_(failed))
+                        .values(derivative_status=DerivativeStatus.FAILED)
+                        .execution_options(synchronize_session=False)
+                    )
+                self.db.commit()
+
+                stats["generated"] += len(ready)
+                stats["failed"] += len(failed)
+                if on_progress:
+                    on_progress(**stats)
+
+        if upload_errors:
+            s3_key, message = next(iter(upload_errors.items()))
+            raise RuntimeError(
+                f"{len(upload_errors)} derived files could not be uploaded ({s3_key}: {message})")
+        return dict(stats)
+
+    def _render_derivatives(
+        self,
+        candidates: List[tuple],
+        pool: ProcessPoolExecutor,
+        stats: Counter
+    ) -> Tuple[List[tuple], List[int], dict]:
+        """
+        Download, render and upload the derived files of a batch of images
+
+        Originals are downloaded and rendered in runs of at most
+        DERIVATIVE_BATCH_BYTES (an original over it alone), so a worker
+        never holds more than one run of originals and their copies sent to
+        the pool.
+
+        Returns (image ID, dHash) of the images rendered, IDs of the images
+        that cannot be rendered, and the upload errors by S3 key
+        """
+        failed = [candidate.id for candidate in candidates
+                  if candidate.file_size > settings.DERIVATIVE_MAX_SOURCE_BYTES]
+        sources = [candidate for candidate in candidates
+                   if candidate.file_size <= settings.DERIVATIVE_MAX_SOURCE_BYTES]
+
+        ready = []
+        errors = {}
+        for run in _runs_by_size(sources, settings.DERIVATIVE_BATCH_BYTES):
+            originals = s3_client.download_files([candidate.s3_key for candidate in run])
+            found = []
+            for candidate in run:
+                if originals[candidate.s3_key] is None:
+                    stats["missing"] += 1
+                    failed.append(candidate.id)
+                else:
+                    found.append(candidate)
+
+            rendered = pool.map(
+                render_derivatives,
+                [originals.pop(candidate.s3_key) for candidate in found],
+                repeat(DERIVATIVE_SIZES),
+                repeat(settings.DERIVATIVE_QUALITY)
+            )
+            files = {}
+            run_ready = []
+            for candidate, result in zip(found, rendered):
+                if result is None:
+                    failed.append(candidate.id)
+                    continue
+                derivatives, value = result
+                run_ready.append((candidate, value))
+                files.update((derivative_key(candidate.s3_key, name), data)
+                             for name, data in derivatives.items())
+
+            run_errors = s3_client.upload_files(
+                files, DERIVATIVE_CONTENT_TYPE, cache_control=DERIVATIVE_CACHE_CONTROL)
+            errors.update(run_errors)
+            ready.extend((candidate.id, value) for candidate, value in run_ready
+                         if not any(key in run_errors for key in derivative_keys(candidate.s3_key)))
+        return ready, failed, errors
+
+    def verify_derivatives(self, dataset_id: Optional[int] = None, batch_size: int = DERIVATIVE_BATCH_SIZE) -> dict:
+        """
+        Check that the derived files of 'ready' images still exist in S3 and
+        reset the images missing one, so they are generated again
+
+        Returns dict with the counts (checked, reset)
+        """
+        conditions = [Image.derivative_status == DerivativeStatus.READY]
+        if dataset_id:
+            conditions.append(Image.dataset_id == dataset_id)
+
+        stats = Counter(checked=0, reset=0)
+        last_id = 0
+        while True:
+            candidates = self.db.execute(
+                select(Image.id, Image.s3_key)
+                .where(Image.id > last_id, *conditions)
+                .order_by(Image.id)
+                .limit(batch_size)
+            ).all()
+            if not candidates:
+                break
+            last_id = candidates[-1].id
+
+            sizes = s3_client.head_objects(
+                [key for candidate in candidates for key in derivative_keys(candidate.s3_key)])
+            missing = [candidate.id for candidate in candidates
+                       if any(sizes[key] is None for key in derivative_keys(candidate.s3_key))]
+            if missing:
+                self.db.execute(
+                    update(Image)
+                    .where(Image.id.in_(missing))
+                    .values(derivative_status=None)
+                    .execution_options(synchronize_session=False)
+                )
+                self.db.commit()
+
+            stats["checked"] += len(candidates)
+            stats["reset"] += len(missing)
+
+        return dict(stats)
+
     def mark_as_error(self, image_id: int) -> bool:
         """Mark an image as error"""
         db_image = self.db.query(Image).filter(Image.id == image_id).first()
         if db_image:
+            self.counters.bump_many(self.counters.status_change_deltas(
+                [(db_image.dataset_id, db_image.status)], ImageStatus.ERROR))
             db_image.status = ImageStatus.ERROR
             self.db.commit()
             return True
@@ -125,20 +1077,47 @@ class ImageService:
         skip: int = 0,
         limit: int = 100,
         dataset_id: Optional[int] = None,
-        status: Optional[ImageStatus] = None
+        status: Optional[ImageStatus] = None,
+        cursor: Optional[str] = None,
+        split: Optional[str] = None
     ) -> dict:
-        """Get images with optional filters and total count"""
+        """
+        Get images with optional filters and total count, ordered by ID
+
+        If a cursor is given, skip is ignored and the page starts right after
+        the cursor (keyset pagination), so deep pages cost the same as the first.
+        """
         query = self.db.query(Image)
 
         if dataset_id:
             query = query.filter(Image.dataset_id == dataset_id)
         if status:
             query = query.filter(Image.status == status)
+        if split:
+            query = query.filter(Image.split == split)
+
+        # Read the dataset counters instead of counting rows (no counter per split)
+        if dataset_id and not split:
+            counter = getattr(Dataset, STATUS_COUNTERS[status]) if status \
+                else Dataset.image_count
+            total = self.db.execute(
+                select(counter).where(Dataset.id == dataset_id)
+            ).scalar() or 0
+        else:
+            total = query.count()
 
-        total = query.count()
-        items = query.offset(skip).limit(limit).all()
+        query = query.order_by(Image.id)
+        if cursor:
+            (last_id,) = decode_cursor(cursor, 1)
+            query = query.filter(Image.id > last_id)
+        else:
+            query = query.offset(skip)
 
-        return {"total": total, "items": items}
+        # Fetch one extra row to know whether there is a next page
+        items = query.limit(limit + 1).all()
+        next_cursor = encode_cursor(items[limit - 1].id) if len(items) > limit else None
+
+        return {"total": total, "items": items[:limit], "next_cursor": next_cursor}
 
     def get_image(self, image_id: int) -> Optional[Image]:
         """Get a single image by ID"""
@@ -151,8 +1130,12 @@ class ImageService:
             return None
 
         update_data = image_data.model_dump(exclude_unset=True)
+        if update_data.get("status"):
+            self.counters.bump_many(self.counters.status_change_deltas(
+                [(db_image.dataset_id, db_image.status)], ImageStatus(update_data["status"])))
         for field, value in update_data.items():
             setattr(db_image, field, value)
+        self.counters.touch(db_image.dataset_id)
 
         self.db.commit()
         self.db.refresh(db_image)
@@ -164,10 +1147,23 @@ class ImageService:
         if not db_image:
             return False
 
-        # Delete from S3
-        s3_client.delete_file(db_image.s3_key)
+        # Delete from S3 (and free the parts of an unfinished multipart upload)
+        if db_image.upload_id:
+            s3_client.abort_multipart_upload(
+                db_image.s3_key, db_image.upload_id)
+        if db_image.derivative_status:
+            s3_client.delete_files([db_image.s3_key, *derivative_keys(db_image.s3_key)])
+        else:
+            s3_client.delete_file(db_image.s3_key)
 
-        # Delete from DB
+        # Delete from DB (annotations are deleted in cascade)
+        self.counters.bump(
+            db_image.dataset_id,
+            image_count=-1,
+            total_bytes=-db_image.file_size,
+            annotation_count=-len(db_image.annotations),
+            **{STATUS_COUNTERS[db_image.status]: -1}
+        )
         self.db.delete(db_image)
         self.db.commit()
         return True
@@ -176,41 +1172,56 @@ class ImageService:
         """
         Delete all images for a specific dataset (from DB and S3)
 
+        Files are removed with batched DeleteObjects requests and rows with two
+        set-based DELETE statements (annotations first), without loading any
+        ORM object.
+
         Returns dict with deletion statistics
         """
-        # Get all images for this dataset
-        images = self.db.query(Image).filter(
-            Image.dataset_id == dataset_id).all()
+        rows = self.db.execute(
+            select(Image.s3_key, Image.upload_id, Image.derivative_status).where(
+                Image.dataset_id == dataset_id)
+        ).all()
 
-        if not images:
+        if not rows:
             return {
                 "deleted_count": 0,
                 "s3_deleted": 0,
                 "s3_errors": 0,
+                "s3_error_details": {},
                 "message": "No images found for this dataset"
             }
 
-        deleted_count = 0
-        s3_deleted = 0
-        s3_errors = 0
-
-        for image in images:
-            # Try to delete from S3
-            if s3_client.delete_file(image.s3_key):
-                s3_deleted += 1
-            else:
-                s3_errors += 1
+        # Free the parts of unfinished multipart uploads, then delete the files
+        s3_keys = []
+        for s3_key, upload_id, derivative_status in rows:
+            if upload_id:
+                s3_client.abort_multipart_upload(s3_key, upload_id)
+            s3_keys.append(s3_key)
+            if derivative_status:
+                s3_keys.extend(derivative_keys(s3_key))
+        s3_errors = s3_client.delete_files(s3_keys)
 
-            # Delete from DB
-            self.db.delete(image)
-            deleted_count += 1
+        dataset_images = select(Image.id).where(Image.dataset_id == dataset_id)
+        self.db.execute(
+            delete(Annotation)
+            .where(Annotation.image_id.in_(dataset_images))
+            .execution_options(synchronize_session=False)
+        )
+        deleted_count = self.db.execute(
+            delete(Image)
+            .where(Image.dataset_id == dataset_id)
+            .execution_options(synchronize_session=False)
+        ).rowcount
 
+        self.counters.reset_images(dataset_id)
         self.db.commit()
 
         return {
             "deleted_count": deleted_count,
-            "s3_deleted": s3_deleted,
-            "s3_errors": s3_errors,
+            "s3_deleted": len(s3_keys) - len(s3_errors),
+            "s3_errors": len(s3_errors),
+            "s3_error_details": s3_errors,
             "message": f"Successfully deleted {deleted_count} images"
         }
 
@@ -231,7 +1242,9 @@ class ImageService:
         limit: int = 100,
         dataset_id: Optional[int] = None,
         status: Optional[ImageStatus] = None,
-        expires_in: int = 3600
+        expires_in: int = 3600,
+        cursor: Optional[str] = None,
+        split: Optional[str] = None
     ) -> dict:
         """
         Get images with presigned download URLs and total count
@@ -240,11 +1253,23 @@ class ImageService:
         Only generates URLs for images with status 'uploaded'
         """
         images_data = self.get_images(
-            skip=skip, limit=limit, dataset_id=dataset_id, status=status)
+            skip=skip, limit=limit, dataset_id=dataset_id, status=status, cursor=cursor, split=split)
 
         total = images_data["total"]
         images = images_data["items"]
 
+        # Only generate URLs for uploaded images and their generated
+        # thumbnails/previews, reusing cached URLs so the browser sees the same
+        # URL while it is valid
+        s3_keys = []
+        for image in images:
+            if image.status == ImageStatus.UPLOADED:
+                s3_keys.append(image.s3_key)
+                if image.derivative_status == DerivativeStatus.READY:
+                    s3_keys.extend(derivative_keys(image.s3_key))
+        download_urls = s3_client.generate_cached_download_urls(
+            s3_keys, expires_in=expires_in)
+
         result = []
         for image in images:
             image_dict = {
@@ -257,22 +1282,31 @@ class ImageService:
                 "height": image.height,
                 "status": image.status,
                 "dataset_id": image.dataset_id,
+                "split": image.split,
                 "created_at": image.created_at,
                 "updated_at": image.updated_at,
                 "download_url": None,
-                "url_expires_in": None
+                "url_expires_in": None,
+                "thumbnail_url": None,
+                "preview_url": None
             }
 
-            # Only generate URL for uploaded images
-            if image.status == ImageStatus.UPLOADED:
-                download_url = s3_client.generate_presigned_download_url(
-                    s3_key=image.s3_key,
-                    expires_in=expires_in
-                )
-                if download_url:
-                    image_dict["download_url"] = download_url
-                    image_dict["url_expires_in"] = expires_in
+            if image.s3_key in download_urls:
+                download_url, url_expires_in = download_urls[image.s3_key]
+                image_dict["download_url"] = download_url
+                image_dict["url_expires_in"] = url_expires_in
+            for field, name in (("thumbnail_url", "thumb"), ("preview_url", "preview")):
+                if derivative_key(image.s3_key, name) in download_urls:
+                    image_dict[field] = download_urls[derivative_key(image.s3_key, name)][0]
 
             result.append(image_dict)
 
-        return {"total": total, "items": result}
+        # Thumbnails and previews that were never generated (images uploaded
+        # before this stage, or reset by verify_derivatives) are generated in
+        # the background and show up in a later listing
+        if self.request_derivatives([image.id for image in images
+                                     if image.status == ImageStatus.UPLOADED
+                                     and image.derivative_status is None]):
+            self.db.commit()
+
+        return {"total": total, "items": result, "next_cursor": images_data["next_cursor"]}
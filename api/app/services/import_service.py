@@ -0,0 +1,345 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import (
+    BigInteger, Column, Float, Integer, MetaData, String, Table, cast, func, literal, select)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import Callable, Optional
+from fastapi import HTTPException, status
+import mimetypes
+import posixpath
+import uuid
+
+from app.core.coco_reader import CocoReader
+from app.core.config import settings
+from app.core.database import copy_rows
+from app.core.s3 import s3_client
+from app.model.annotation import Annotation
+from app.model.dataset import Dataset, DatasetStatus, dataset_labels
+from app.model.image import Image, ImageStatus
+from app.model.job import Job
+from app.model.label import Label
+from app.services.dataset_counter_service import DatasetCounterService
+from app.services.job_service import JobService
+
+# Rows staged per COPY while the COCO file is read
+STAGING_BATCH_SIZE = 50000
+# Imported images verified per 'images.confirm_upload' job
+CONFIRM_BATCH_SIZE = 1000
+
+# Staging tables of an import, private to its connection and dropped at commit
+_staging = MetaData()
+staged_images = Table(
+    "import_images", _staging,
+    Column("coco_id", BigInteger),
+    Column("s3_key", String(500)),
+    Column("filename", String(255)),
+    Column("mime_type", String(100)),
+    Column("width", Integer),
+    Column("height", Integer),
+    prefixes=["TEMPORARY"], postgresql_on_commit="DROP")
+staged_annotations = Table(
+    "import_annotations", _staging,
+    Column("coco_image_id", BigInteger),
+    Column("category_id", BigInteger),
+    Column("x", Float),
+    Column("y", Float),
+    Column("w", Float),
+    Column("h", Float),
+    prefixes=["TEMPORARY"], postgresql_on_commit="DROP")
+staged_labels = Table(
+    "import_labels", _staging,
+    Column("category_id", BigInteger),
+    Column("label_id", Integer),
+    prefixes=["TEMPORARY"], postgresql_on_commit="DROP")
+created_images = Table(
+    "import_created_images", _staging,
+    Column("image_id", Integer),
+    Column("s3_key", String(500)),
+    prefixes=["TEMPORARY"], postgresql_on_commit="DROP")
+
+
+def _positive_int(value) -> Optional[int]:
+    return value if isinstance(value, int) and not isinstance(value, bool) and value > 0 else None
+
+
+def _coco_box(annotation: dict) -> Optional[tuple]:
+    """(image_id, category_id, x, y, width, height) of a COCO annotation, or None if unusable"""
+    bbox = annotation.get("bbox")
+    if not isinstance(bbox, list) or len(bbox) != 4:
+        return None
+    if not all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in bbox):
+        return None
+    if bbox[2] < 0 or bbox[3] < 0:
+        return None
+    image_id, category_id = annotation.get("image_id"), annotation.get("category_id")
+    if not isinstance(image_id, int) or not isinstance(category_id, int):
+        return None
+    return (image_id, category_id, *bbox)
+
+
+class ImportService:
+    """Service for importing existing annotated datasets"""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.counters = DatasetCounterService(db)
+
+    def _get_active_dataset(self, dataset_id: int) -> Optional[Dataset]:
+        return self.db.query(Dataset).filter(
+            Dataset.id == dataset_id, Dataset.status == DatasetStatus.ACTIVE).first()
+
+    def prepare_coco_upload(self, dataset_id: int) -> Optional[dict]:
+        """
+        Presigned PUT URL to upload a COCO file under the dataset's prefix
+
+        Returns dict with s3_key, upload_url and expires_in, or None if the
+        dataset does not exist
+        """
+        if self._get_active_dataset(dataset_id) is None:
+            return None
+
+        s3_key = f"datasets/{dataset_id}/imports/{uuid.uuid4()}.json"
+        upload_url = s3_client.generate_presigned_upload_url(
+            s3_key, "application/json", expires_in=settings.PRESIGNED_UPLOAD_EXPIRES_IN)
+        if upload_url is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to generate upload URL"
+            )
+        return {"s3_key": s3_key, "upload_url": upload_url,
+                "expires_in": settings.PRESIGNED_UPLOAD_EXPIRES_IN}
+
+    def submit_coco_import(self, dataset_id: int, annotations_key: str, image_prefix: Optional[str]) -> Optional[Job]:
+        """
+        Check an import request and queue its 'dataset.import_coco' job (commits)
+
+        Both keys must be under the dataset's prefix, so imported images are
+        purged with the dataset. Returns the job, or None if the dataset does
+        not exist
+        """
+        if self._get_active_dataset(dataset_id) is None:
+            return None
+
+        dataset_prefix = f"datasets/{dataset_id}/"
+        image_prefix = image_prefix or f"{dataset_prefix}images/"
+        for key in (annotations_key, image_prefix):
+            if not key.startswith(dataset_prefix) or ".." in key.split("/"):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"'{key}' is not under {dataset_prefix}"
+                )
+        if not s3_client.file_exists(annotations_key):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Annotation file '{annotations_key}' not found"
+            )
+
+        return JobService(self.db).submit("dataset.import_coco", {
+            "dataset_id": dataset_id,
+            "annotations_key": annotations_key,
+            "image_prefix": image_prefix
+        })
+
+    def import_coco(
+        self,
+        dataset_id: int,
+        annotations_key: str,
+        image_prefix: str,
+        on_progress: Optional[Callable[..., None]] = None
+    ) -> dict:
+        """
+        Import a COCO JSON file from S3 into a dataset, in one transaction (commits)
+
+        The file is read as a stream and its images and annotations are
+        COPYed into temporary staging tables, STAGING_BATCH_SIZE rows at a
+        time. Then a handful of set-based statements do the rest: categories
+        get-or-create labels by name (linked to the dataset), images are
+        created as 'uploading' rows pointing at image_prefix + file_name, and
+        the annotations of the created images are inserted with their boxes
+        rounded to pixels. Images whose key already exists are left alone,
+        with their annotations, so running an import twice adds nothing.
+        The created images are verified in S3 by 'images.confirm_upload'
+        jobs (CONFIRM_BATCH_SIZE images each), which store their size and
+        switch them to 'uploaded' or 'error'.
+
+        The session must not be shared with on_progress, which may commit
+        its own session. Failures roll everything back, so the job can be
+        retried.
+
+        Returns dict with the counts read, created and skipped
+        """
+        if self._get_active_dataset(dataset_id) is None:
+            raise ValueError(f"Dataset {dataset_id} not found")
+        stream = s3_client.open_stream(annotations_key)
+        if stream is None:
+            raise ValueError(f"Annotation file '{annotations_key}' not found")
+        total_bytes, chunks = stream
+
+        connection = self.db.connection()
+        for table in _staging.sorted_tables:
+            table.create(connection)
+
+        stats = {"bytes": total_bytes, "images_read": 0, "annotations_read": 0, "skipped": 0}
+        categories = self._stage_file(CocoReader(chunks), image_prefix, stats, on_progress)
+
+        # Block the dataset's deletion until the import is committed
+        locked = self.db.execute(
+            select(Dataset.id)
+            .where(Dataset.id == dataset_id, Dataset.status == DatasetStatus.ACTIVE)
+            .with_for_update(read=True)
+        ).first()
+        if locked is None:
+            raise ValueError(f"Dataset {dataset_id} was deleted during the import")
+
+        stats["labels_created"], stats["labels_linked"] = self._import_labels(dataset_id, categories)
+        stats["images_created"] = self._create_images(dataset_id)
+        stats["annotations_created"] = self._create_annotations()
+        stats["confirm_jobs"] = self._queue_confirmations(dataset_id)
+        self.counters.bump(
+            dataset_id,
+            image_count=stats["images_created"],
+            uploading_count=stats["images_created"],
+            annotation_count=stats["annotations_created"],
+            label_count=stats["labels_linked"]
+        )
+        self.db.commit()
+        return stats
+
+    def _stage_file(self, reader: CocoReader, image_prefix: str, stats: dict, on_progress) -> dict[int, str]:
+        """COPY the images and annotations of a COCO file into the staging tables; returns the categories"""
+        categories = {}
+        images, annotations = [], []
+
+        def flush():
+            copy_rows(self.db, staged_images.name, [c.name for c in staged_images.columns], images)
+            copy_rows(self.db, staged_annotations.name, [c.name for c in staged_annotations.columns], annotations)
+            images.clear()
+            annotations.clear()
+            if on_progress:
+                on_progress(bytes_read=reader.bytes_read, **stats)
+
+        for section, item in reader:
+            if not isinstance(item, dict):
+                stats["skipped"] += 1
+            elif section == "images":
+                stats["images_read"] += 1
+                file_name, coco_id = item.get("file_name"), item.get("id")
+                if not isinstance(file_name, str) or not file_name or not isinstance(coco_id, int) \
+                        or len(image_prefix) + len(file_name) > 500:
+                    stats["skipped"] += 1
+                    continue
+                images.append((
+                    coco_id,
+                    image_prefix + file_name,
+                    posixpath.basename(file_name)[:255],
+                    mimetypes.guess_type(file_name)[0] or "application/octet-stream",
+                    _positive_int(item.get("width")),
+                    _positive_int(item.get("height"))
+                ))
+            elif section == "annotations":
+                stats["annotations_read"] += 1
+                box = _coco_box(item)
+                if box is None:
+                    stats["skipped"] += 1
+                else:
+                    annotations.append(box)
+            elif isinstance(item.get("id"), int) and item.get("name"):
+                categories[item["id"]] = str(item["name"])[:255]
+
+            if len(images) + len(annotations) >= STAGING_BATCH_SIZE:
+                flush()
+        flush()
+        return categories
+
+    def _import_labels(self, dataset_id: int, categories: dict[int, str]) -> tuple[int, int]:
+        """Get or create a label per category name and link them to the dataset; returns (created, linked)"""
+        if not categories:
+            return 0, 0
+
+        names = sorted(set(categories.values()))
+        created = self.db.execute(
+            pg_insert(Label)
+            .values([{"name": name} for name in names])
+            .on_conflict_do_nothing(index_elements=[Label.name])
+            .returning(Label.id)
+        ).all()
+        label_ids = dict(self.db.execute(
+            select(Label.name, Label.id).where(Label.name.in_(names))).all())
+        self.db.execute(staged_labels.insert(), [
+            {"category_id": category_id, "label_id": label_ids[name]}
+            for category_id, name in categories.items()
+        ])
+        linked = self.db.execute(
+            pg_insert(dataset_labels)
+            .values([{"dataset_id": dataset_id, "label_id": label_id}
+                     for label_id in sorted(label_ids.values())])
+            .on_conflict_do_nothing()
+            .returning(dataset_labels.c.label_id)
+        ).all()
+        return len(created), len(linked)
+
+    def _create_images(self, dataset_id: int) -> int:
+        """Create the staged images whose key is new, remembering their IDs; returns the count"""
+        inserted = (
+            pg_insert(Image)
+            .from_select(
+                ["filename", "s3_key", "file_size", "mime_type", "width", "height", "status", "dataset_id"],
+                select(
+                    staged_images.c.filename,
+                    staged_images.c.s3_key,
+                    literal(0, BigInteger),
+                    staged_images.c.mime_type,
+                    staged_images.c.width,
+                    staged_images.c.height,
+                    literal(ImageStatus.UPLOADING, Image.status.type),
+                    literal(dataset_id, Integer)
+                )
+            )
+            .on_conflict_do_nothing(index_elements=[Image.s3_key])
+            .returning(Image.id, Image.s3_key)
+            .cte("inserted")
+        )
+        return self.db.execute(
+            created_images.insert().from_select(
+                ["image_id", "s3_key"], select(inserted.c.id, inserted.c.s3_key))
+        ).rowcount
+
+    def _create_annotations(self) -> int:
+        """Insert the staged boxes of the created images with known categories; returns the count"""
+        def pixel(value):
+            return cast(func.greatest(func.round(value), 0), Integer)
+
+        boxes = (
+            select(
+                created_images.c.image_id,
+                staged_labels.c.label_id,
+                pixel(staged_annotations.c.x),
+                pixel(staged_annotations.c.y),
+                pixel(staged_annotations.c.x + staged_annotations.c.w),
+                pixel(staged_annotations.c.y + staged_annotations.c.h)
+            )
+            .select_from(staged_annotations)
+            .join(staged_images, staged_images.c.coco_id == staged_annotations.c.coco_image_id)
+            .join(created_images, created_images.c.s3_key == staged_images.c.s3_key)
+            .join(staged_labels, staged_labels.c.category_id == staged_annotations.c.category_id)
+        )
+        return self.db.execute(
+            pg_insert(Annotation).from_select(
+                ["image_id", "label_id", "bbox_xmin", "bbox_ymin", "bbox_xmax", "bbox_ymax"], boxes)
+        ).rowcount
+
+    def _queue_confirmations(self, dataset_id: int) -> int:
+        """Queue the S3 verification of the created images; returns the number of jobs"""
+        jobs = JobService(self.db)
+        count = 0
+        result = self.db.execute(
+            select(created_images.c.image_id)
+            .order_by(created_images.c.image_id)
+            .execution_options(yield_per=CONFIRM_BATCH_SIZE)
+        )
+        for partition in result.partitions():
+            jobs.enqueue("images.confirm_upload", {
+                "image_ids": [row.image_id for row in partition],
+                "dataset_id": dataset_id
+            })
+            count += 1
+        return count
@@ -0,0 +1,204 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, update, func
+from typing import Optional
+from datetime import timedelta
+
+from app.core.config import settings
+from app.model.job import Job, JobStatus
+
+# Upper bound of the delay between two attempts of a job (seconds)
+MAX_RETRY_DELAY = 3600
+
+
+class JobService:
+    """
+    Service for the Postgres-backed background job queue
+
+    Workers claim jobs with SELECT ... FOR UPDATE SKIP LOCKED, so any number
+    of worker processes can poll the jobs table without a broker and without
+    two of them running the same job.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def enqueue(self, kind: str, payload: Optional[dict] = None, max_attempts: Optional[int] = None) -> Job:
+        """
+        Queue a job for the workers (flushes, does not commit)
+
+        The job only becomes visible to workers once the caller commits, so it
+        can be queued in the same transaction as the rows it works on.
+        """
+        job = Job(
+            kind=kind,
+            payload=payload or {},
+            status=JobStatus.QUEUED,
+            attempts=0,
+            max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS
+        )
+        self.db.add(job)
+        self.db.flush()
+        return job
+
+    def submit(self, kind: str, payload: Optional[dict] = None, max_attempts: Optional[int] = None) -> Job:
+        """Queue a job on its own and commit it"""
+        job = self.enqueue(kind, payload, max_attempts)
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def schedule_periodic(self, kind: str, interval: int) -> Optional[Job]:
+        """
+        Queue the next run of a periodic job unless one is already pending (commits)
+
+        The run is due interval seconds after the last one finished. A
+        transaction-level advisory lock on the kind keeps concurrent workers
+        from queuing it twice.
+
+        Returns the queued job, or None if a run was already pending
+        """
+        self.db.execute(select(func.pg_advisory_xact_lock(func.hashtext(kind))))
+        pending = self.db.execute(
+            select(Job.id).where(
+                Job.kind == kind,
+                Job.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]))
+            .limit(1)
+        ).first()
+        if pending:
+            self.db.commit()
+            return None
+
+        last_finished = self.db.execute(
+            select(func.max(Job.finished_at)).where(Job.kind == kind)
+        ).scalar()
+        job = self.enqueue(kind, max_attempts=1)
+        if last_finished:
+            job.run_at = last_finished + timedelta(seconds=interval)
+        self.db.commit()
+        return job
+
+    def get_job(self, job_id: int) -> Optional[Job]:
+        """Get a job by ID"""
+        return self.db.query(Job).filter(Job.id == job_id).first()
+
+    def claim(self, worker_id: str) -> Optional[Job]:
+        """
+        Claim the next ready job and mark it running (commits)
+
+        Returns the job, or None if no job is ready
+        """
+        job = self.db.execute(
+            select(Job)
+            .where(Job.status == JobStatus.QUEUED, Job.run_at <= func.now())
+            .order_by(Job.run_at, Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        ).scalars().first()
+
+        if not job:
+            self.db.rollback()
+            return None
+
+        job.status = JobStatus.RUNNING
+        job.attempts += 1
+        job.locked_by = worker_id
+        job.heartbeat_at = func.now()
+        self.db.commit()
+        self.db.refresh(job)
+        return job
+
+    def set_progress(self, job: Job, **values) -> None:
+        """Merge values into the progress of a running job and refresh its heartbeat (commits)"""
+        job.progress = {**(job.progress or {}), **values}
+        job.heartbeat_at = func.now()
+        self.db.commit()
+
+    def heartbeat(self, job_id: int, worker_id: str) -> bool:
+        """
+        Refresh the heartbeat of a job still held by a worker (commits)
+
+        Returns False if the job is no longer running on this worker
+        """
+        touched = self.db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.RUNNING, Job.locked_by == worker_id)
+            .values(heartbeat_at=func.now())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.commit()
+        return touched > 0
+
+    def succeed(self, job: Job, worker_id: str, result: Optional[dict] = None) -> bool:
+        """
+        Mark a job as succeeded with its result payload (commits)
+
+        Only if the job is still held by the worker: a job requeued while it
+        ran belongs to whoever claimed it next, and the result is dropped.
+
+        Returns False if the result was dropped
+        """
+        finished = self.db.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.locked_by == worker_id)
+            .values(status=JobStatus.SUCCEEDED, result=result, locked_by=None,
+                    finished_at=func.now())
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.commit()
+        return finished > 0
+
+    def fail(self, job: Job, worker_id: str, error: str, retry: bool = True) -> bool:
+        """
+        Record a failed attempt (commits)
+
+        The job is queued again after an exponential backoff
+        (JOB_RETRY_BACKOFF * 2^(attempts - 1) seconds) until it runs out of
+        attempts. As with succeed, nothing is recorded if the job is no
+        longer held by the worker.
+
+        Returns False if the attempt was dropped
+        """
+        if retry and job.attempts < job.max_attempts:
+            delay = min(settings.JOB_RETRY_BACKOFF * 2 ** (job.attempts - 1),
+                        MAX_RETRY_DELAY)
+            values = {"status": JobStatus.QUEUED, "run_at": func.now() + timedelta(seconds=delay)}
+        else:
+            values = {"status": JobStatus.FAILED, "finished_at": func.now()}
+        failed = self.db.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.locked_by == worker_id)
+            .values(last_error=error, locked_by=None, **values)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.commit()
+        return failed > 0
+
+    def requeue_stale(self) -> int:
+        """
+        Requeue running jobs whose worker stopped sending heartbeats (commits)
+
+        Jobs that already used all their attempts are marked failed instead.
+
+        Returns number of jobs requeued or failed
+        """
+        stale = [
+            Job.status == JobStatus.RUNNING,
+            Job.heartbeat_at < func.now() -
+            timedelta(seconds=settings.JOB_HEARTBEAT_TIMEOUT),
+        ]
+        requeued = self.db.execute(
+            update(Job)
+            .where(*stale, Job.attempts < Job.max_attempts)
+            .values(status=JobStatus.QUEUED, locked_by=None, run_at=func.now(),
+                    last_error="Worker stopped responding")
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        failed = self.db.execute(
+            update(Job)
+            .where(*stale, Job.attempts >= Job.max_attempts)
+            .values(status=JobStatus.FAILED, locked_by=None, finished_at=func.now(),
+                    last_error="Worker stopped responding")
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.commit()
+        return requeued + failed
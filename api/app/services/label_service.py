@@ -1,7 +1,13 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import func, or_, select
 from typing import List, Optional
+from collections import Counter, defaultdict
 from app.model.label import Label
+from app.model.image import Image
+from app.model.annotation import Annotation
+from app.model.dataset import dataset_labels
+from app.services.dataset_counter_service import DatasetCounterService
+from app.core.pagination import decode_cursor, encode_cursor
 from app.schema.label import LabelCreate
 from fastapi import HTTPException, status
 
@@ -38,9 +44,15 @@ class LabelService:
         self,
         skip: int = 0,
         limit: int = 100,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> dict:
-        """Get all labels with optional search and total count"""
+        """
+        Get all labels with optional search and total count, ordered by ID
+
+        If a cursor is given, skip is ignored and the page starts right after
+        the cursor (keyset pagination).
+        """
         query = self.db.query(Label)
 
         # Add text search
@@ -50,10 +62,18 @@ class LabelService:
         # Get total count before pagination
         total = query.count()
 
-        # Get paginated results
-        items = query.offset(skip).limit(limit).all()
+        # Get paginated results, with one extra row to detect the next page
+        query = query.order_by(Label.id)
+        if cursor:
+            (last_id,) = decode_cursor(cursor, 1)
+            query = query.filter(Label.id > last_id)
+        else:
+            query = query.offset(skip)
+
+        items = query.limit(limit + 1).all()
+        next_cursor = encode_cursor(items[limit - 1].id) if len(items) > limit else None
 
-        return {"total": total, "items": items}
+        return {"total": total, "items": items[:limit], "next_cursor": next_cursor}
 
     def delete_label(self, label_id: int) -> bool:
         """Delete a label"""
@@ -62,6 +82,23 @@ class LabelService:
         if not db_label:
             return False
 
+        # The label is unlinked from its datasets and its annotations are
+        # deleted in cascade: update the counters of the affected datasets
+        deltas = defaultdict(Counter)
+        for dataset_id in self.db.execute(
+            select(dataset_labels.c.dataset_id).where(
+                dataset_labels.c.label_id == label_id)
+        ).scalars():
+            deltas[dataset_id]["label_count"] -= 1
+        for dataset_id, annotation_count in self.db.execute(
+            select(Image.dataset_id, func.count(Annotation.id))
+            .join(Image, Annotation.image_id == Image.id)
+            .where(Annotation.label_id == label_id)
+            .group_by(Image.dataset_id)
+        ):
+            deltas[dataset_id]["annotation_count"] -= annotation_count
+        DatasetCounterService(self.db).bump_many(deltas)
+
         self.db.delete(db_label)
         self.db.commit()
 
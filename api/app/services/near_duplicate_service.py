@@ -0,0 +1,188 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, select
+from typing import Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.database import copy_rows
+from app.core.hash_index import HashIndex, HashIndexCache, to_unsigned
+from app.model.dataset import Dataset, DatasetStatus
+from app.model.image import Image, ImageStatus
+from app.model.job import Job
+from app.model.near_duplicate import NearDuplicateGroup, NearDuplicateGrouping
+from app.services.job_service import JobService
+
+# Rows fetched per round trip when loading the hashes of a dataset
+HASH_LOAD_BATCH_SIZE = 50000
+
+# Shared by the requests of an API process
+index_cache = HashIndexCache(
+    max_size=settings.NEAR_DUPLICATE_INDEX_CACHE_SIZE,
+    ttl=settings.NEAR_DUPLICATE_INDEX_TTL
+)
+
+
+class NearDuplicateService:
+    """Service for near-duplicate detection over the perceptual hashes of images"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_index(self, dataset_id: int) -> HashIndex:
+        """
+        Hash index of the uploaded images of a dataset, built from the
+        database and cached for NEAR_DUPLICATE_INDEX_TTL seconds
+        """
+        index = index_cache.get(dataset_id)
+        if index is None:
+            index = self._load_index(dataset_id)
+            index_cache.put(dataset_id, index)
+        return index
+
+    def _load_index(self, dataset_id: int) -> HashIndex:
+        """Hash index of the uploaded images of a dataset, read from the database"""
+        ids = []
+        hashes = []
+        result = self.db.execute(
+            select(Image.id, Image.dhash)
+            .where(Image.dataset_id == dataset_id,
+                   Image.status == ImageStatus.UPLOADED,
+                   Image.dhash.is_not(None))
+            .execution_options(yield_per=HASH_LOAD_BATCH_SIZE)
+        )
+        for partition in result.partitions():
+            ids.append(np.fromiter((row.id for row in partition), dtype=np.int64))
+            hashes.append(np.fromiter((to_unsigned(row.dhash) for row in partition), dtype=np.uint64))
+
+        return HashIndex(
+            np.concatenate(ids) if ids else np.empty(0, dtype=np.int64),
+            np.concatenate(hashes) if hashes else np.empty(0, dtype=np.uint64)
+        )
+
+    def find_similar(self, image_id: int, max_distance: int, limit: int = 100) -> Optional[list[dict]]:
+        """
+        Images of the same dataset within max_distance of an image, closest first
+
+        Returns None if the image does not exist, an empty list if it has no
+        hash yet
+        """
+        row = self.db.execute(
+            select(Image.dataset_id, Image.dhash).where(Image.id == image_id)
+        ).first()
+        if row is None:
+            return None
+        if row.dhash is None:
+            return []
+
+        matches = self.get_index(row.dataset_id).query(to_unsigned(row.dhash), max_distance)
+        return [{"image_id": match_id, "distance": distance}
+                for match_id, distance in matches if match_id != image_id][:limit]
+
+    def get_dataset(self, dataset_id: int) -> Optional[Dataset]:
+        """Get an active dataset, or None if it does not exist or is being deleted"""
+        return self.db.query(Dataset).filter(
+            Dataset.id == dataset_id, Dataset.status == DatasetStatus.ACTIVE).first()
+
+    def submit_groups(self, dataset_id: int, max_distance: int) -> Optional[Job]:
+        """
+        Queue a 'dataset.near_duplicates' job computing the groups of a
+        dataset for a distance (commits)
+
+        Returns the job, or None if the dataset does not exist
+        """
+        if self.get_dataset(dataset_id) is None:
+            return None
+        return JobService(self.db).submit(
+            "dataset.near_duplicates", {"dataset_id": dataset_id, "max_distance": max_distance})
+
+    def compute_groups(self, dataset_id: int, max_distance: int) -> dict:
+        """
+        Compute the groups of near-duplicate images of a dataset for a
+        distance and store them, largest first, in place of the previous
+        ones (commits)
+
+        The dataset's updated_at is read before the hashes and stored with
+        the groups: they are up to date as long as it has not changed, and
+        nothing is computed again until then. Runs for the same dataset and
+        distance are serialized by an advisory lock.
+
+        Returns dict with the hashed image and group counts, and whether the
+        groups were computed (False if the stored ones were up to date)
+        """
+        self.db.execute(select(func.pg_advisory_xact_lock(
+            func.hashtext(f"near-duplicates:{dataset_id}:{max_distance}"))))
+        updated_at = self.db.execute(
+            select(Dataset.updated_at).where(Dataset.id == dataset_id,
+                                             Dataset.status == DatasetStatus.ACTIVE)
+        ).scalar()
+        if updated_at is None:
+            raise ValueError(f"Dataset {dataset_id} not found")
+
+        grouping = self.db.execute(
+            select(NearDuplicateGrouping).where(NearDuplicateGrouping.dataset_id == dataset_id,
+                                                NearDuplicateGrouping.max_distance == max_distance)
+        ).scalar_one_or_none()
+        if grouping is not None and grouping.dataset_updated_at == updated_at:
+            self.db.commit()
+            return {"hashed_count": grouping.hashed_count, "group_count": grouping.group_count,
+                    "computed": False}
+
+        index = self._load_index(dataset_id)
+        groups = index.groups(max_distance)
+
+        if grouping is None:
+            grouping = NearDuplicateGrouping(dataset_id=dataset_id, max_distance=max_distance)
+            self.db.add(grouping)
+        grouping.dataset_updated_at = updated_at
+        grouping.hashed_count = len(index)
+        grouping.group_count = len(groups)
+        grouping.created_at = func.now()
+        self.db.flush()
+        self.db.execute(
+            delete(NearDuplicateGroup).where(NearDuplicateGroup.grouping_id == grouping.id))
+        copy_rows(self.db, NearDuplicateGroup.__tablename__, ["grouping_id", "rank", "image_ids"],
+                  ((grouping.id, rank, "{" + ",".join(map(str, group.tolist())) + "}")
+                   for rank, group in enumerate(groups)))
+        self.db.commit()
+        return {"hashed_count": len(index), "group_count": len(groups), "computed": True}
+
+    def find_groups(self, dataset_id: int, max_distance: int, skip: int = 0, limit: int = 100) -> Optional[dict]:
+        """
+        Page of the stored groups of near-duplicate images of a dataset for
+        a distance, largest first (see compute_groups)
+
+        Pages are read by rank on the primary key, so their cost does not
+        depend on the dataset size or on skip.
+
+        Returns None if the dataset does not exist, else dict with the
+        number of hashed images, the total number of groups, a page of
+        groups (lists of image IDs), when they were computed (None if never)
+        and whether the dataset changed since
+        """
+        dataset = self.get_dataset(dataset_id)
+        if dataset is None:
+            return None
+
+        grouping = self.db.execute(
+            select(NearDuplicateGrouping).where(NearDuplicateGrouping.dataset_id == dataset_id,
+                                                NearDuplicateGrouping.max_distance == max_distance)
+        ).scalar_one_or_none()
+        if grouping is None:
+            return {"max_distance": max_distance, "hashed_count": 0, "total": 0, "items": [],
+                    "computed_at": None, "up_to_date": False}
+
+        image_ids = self.db.execute(
+            select(NearDuplicateGroup.image_ids)
+            .where(NearDuplicateGroup.grouping_id == grouping.id, NearDuplicateGroup.rank >= skip)
+            .order_by(NearDuplicateGroup.rank)
+            .limit(limit)
+        ).scalars().all()
+        return {
+            "max_distance": max_distance,
+            "hashed_count": grouping.hashed_count,
+            "total": grouping.group_count,
+            "items": [{"image_ids": ids} for ids in image_ids],
+            "computed_at": grouping.created_at,
+            "up_to_date": grouping.dataset_updated_at == dataset.updated_at
+        }
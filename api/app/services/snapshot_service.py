@@ -0,0 +1,257 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import Text, and_, cast, func, select
+from typing import Callable, Iterator, Optional
+from datetime import datetime, timezone
+import hashlib
+import io
+import json
+
+import numpy as np
+import pyarrow as pa
+
+from app.core.config import settings
+from app.core.database import SessionLocal, copy_query
+from app.core.s3 import s3_client
+from app.core.snapshots import SNAPSHOT_VERSION, snapshot_batch, write_arrow, write_parquet
+from app.model.annotation import Annotation
+from app.model.dataset import Dataset, DatasetStatus, dataset_labels
+from app.model.image import Image, ImageStatus
+from app.model.label import Label
+from app.schema.snapshot import SnapshotFormat
+
+# File extension, content type and writer of each snapshot format
+SNAPSHOT_FILES = {
+    SnapshotFormat.ARROW: ("arrow", "application/vnd.apache.arrow.file", write_arrow),
+    SnapshotFormat.PARQUET: ("parquet", "application/vnd.apache.parquet", write_parquet),
+}
+BOX_FIELDS = (Annotation.image_id, Annotation.label_id, Annotation.bbox_xmin,
+              Annotation.bbox_ymin, Annotation.bbox_xmax, Annotation.bbox_ymax)
+
+
+def write_snapshot(
+    dataset_id: int,
+    snapshot_format: SnapshotFormat,
+    on_progress: Optional[Callable[..., None]] = None
+) -> dict:
+    """
+    Bring the snapshot of a dataset up to date from a single REPEATABLE READ
+    view of the database
+
+    Runs for the same dataset and format are serialized by an advisory lock
+    held by a separate session: it is taken before the read snapshot starts,
+    so a run that waited sees the rows the previous one wrote out.
+    """
+    lock = SessionLocal()
+    db = SessionLocal()
+    try:
+        lock.execute(select(func.pg_advisory_xact_lock(
+            func.hashtext(f"snapshot:{dataset_id}:{snapshot_format.value}"))))
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        return SnapshotService(db).update_snapshot(dataset_id, snapshot_format, on_progress)
+    finally:
+        db.close()
+        lock.close()
+
+
+class SnapshotService:
+    """Service for columnar (Arrow/Parquet) snapshots of datasets for training loaders"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_dataset(self, dataset_id: int) -> Optional[Dataset]:
+        """Get an active dataset, or None if it does not exist or is being deleted"""
+        return self.db.query(Dataset).filter(
+            Dataset.id == dataset_id, Dataset.status == DatasetStatus.ACTIVE).first()
+
+    def snapshot_prefix(self, dataset_id: int, snapshot_format: SnapshotFormat) -> str:
+        return f"datasets/{dataset_id}/snapshots/{snapshot_format.value}"
+
+    def read_manifest(self, dataset_id: int, snapshot_format: SnapshotFormat) -> Optional[dict]:
+        """Manifest of the current snapshot, or None if there is none"""
+        key = f"{self.snapshot_prefix(dataset_id, snapshot_format)}/manifest.json"
+        content = s3_client.download_files([key])[key]
+        return json.loads(content) if content is not None else None
+
+    def get_snapshot(self, dataset_id: int, snapshot_format: SnapshotFormat) -> Optional[dict]:
+        """
+        Manifest of the current snapshot of a dataset, with a download URL
+        for each part valid EXPORT_DOWNLOAD_EXPIRES_IN seconds
+
+        Returns None if the dataset or the snapshot does not exist
+        """
+        if self.get_dataset(dataset_id) is None:
+            return None
+        manifest = self.read_manifest(dataset_id, snapshot_format)
+        if manifest is None:
+            return None
+
+        expires_in = settings.EXPORT_DOWNLOAD_EXPIRES_IN
+        urls = s3_client.generate_presigned_download_urls(
+            [part["s3_key"] for part in manifest["parts"]], expires_in=expires_in)
+        for part in manifest["parts"]:
+            part["download_url"] = urls[part["s3_key"]]
+        manifest["expires_in"] = expires_in
+        return manifest
+
+    def update_snapshot(
+        self,
+        dataset_id: int,
+        snapshot_format: SnapshotFormat,
+        on_progress: Optional[Callable[..., None]] = None
+    ) -> dict:
+        """
+        Write the uploaded images of a dataset and their boxes to columnar
+        part files in S3, then a manifest listing them
+
+        Images are split into parts by ID range (SNAPSHOT_PART_IMAGES IDs
+        each). A fingerprint of every part (counts and hash sums of its
+        image and box rows) is computed in one aggregate query, and only
+        the parts whose fingerprint differs from the previous manifest are
+        rebuilt: adding images to a large dataset rewrites the last part
+        or two. Parts are immutable objects named after their fingerprint;
+        the ones the new manifest no longer lists are deleted after it is
+        written. Boxes missing a coordinate or whose label is not linked to
+        the dataset are left out, as in exports.
+
+        Returns dict with the manifest key and the part, image and box counts
+        """
+        if self.get_dataset(dataset_id) is None:
+            raise ValueError(f"Dataset {dataset_id} not found")
+        extension, content_type, writer = SNAPSHOT_FILES[snapshot_format]
+        prefix = self.snapshot_prefix(dataset_id, snapshot_format)
+
+        previous = self.read_manifest(dataset_id, snapshot_format) or {"parts": []}
+        previous_parts = {part["part"]: part for part in previous["parts"]}
+        fingerprints = self._fingerprints(dataset_id)
+
+        parts = []
+        written = 0
+        for index, (fingerprint, image_count, annotation_count) in sorted(fingerprints.items()):
+            part = previous_parts.get(index)
+            if part is None or part["fingerprint"] != fingerprint:
+                s3_key = f"{prefix}/part-{index:06d}-{fingerprint}.{extension}"
+                data = writer(self._iter_batches(dataset_id, index))
+                errors = s3_client.upload_files({s3_key: data.to_pybytes()}, content_type)
+                if errors:
+                    raise RuntimeError(f"Could not upload snapshot part {s3_key}: {errors[s3_key]}")
+                part = {
+                    "part": index,
+                    "fingerprint": fingerprint,
+                    "s3_key": s3_key,
+                    "first_image_id": index * settings.SNAPSHOT_PART_IMAGES,
+                    "image_count": image_count,
+                    "annotation_count": annotation_count,
+                    "size": data.size
+                }
+                written += 1
+                if on_progress:
+                    on_progress(parts_written=written, parts_total=len(fingerprints))
+            parts.append(part)
+
+        labels = self.db.execute(
+            select(Label.id, Label.name)
+            .join(dataset_labels, dataset_labels.c.label_id == Label.id)
+            .where(dataset_labels.c.dataset_id == dataset_id)
+            .order_by(Label.id)
+        ).all()
+        manifest = {
+            "version": SNAPSHOT_VERSION,
+            "dataset_id": dataset_id,
+            "format": snapshot_format.value,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "image_count": sum(part["image_count"] for part in parts),
+            "annotation_count": sum(part["annotation_count"] for part in parts),
+            "labels": [{"id": label.id, "name": label.name} for label in labels],
+            "parts": parts
+        }
+        manifest_key = f"{prefix}/manifest.json"
+        errors = s3_client.upload_files({manifest_key: json.dumps(manifest).encode()}, "application/json")
+        if errors:
+            raise RuntimeError(f"Could not upload snapshot manifest {manifest_key}: {errors[manifest_key]}")
+
+        kept = {part["s3_key"] for part in parts}
+        stale = [part["s3_key"] for part in previous["parts"] if part["s3_key"] not in kept]
+        s3_client.delete_files(stale)
+
+        return {
+            "format": snapshot_format.value,
+            "manifest_key": manifest_key,
+            "parts": len(parts),
+            "parts_written": written,
+            "parts_deleted": len(stale),
+            "image_count": manifest["image_count"],
+            "annotation_count": manifest["annotation_count"]
+        }
+
+    def _image_conditions(self, dataset_id: int) -> tuple:
+        return (Image.dataset_id == dataset_id, Image.status == ImageStatus.UPLOADED)
+
+    def _boxes_query(self, dataset_id: int):
+        """Boxes written to snapshots: complete, with a label linked to the dataset"""
+        return (
+            select(*BOX_FIELDS)
+            .join(Image, Image.id == Annotation.image_id)
+            .join(dataset_labels, and_(dataset_labels.c.dataset_id == Image.dataset_id,
+                                       dataset_labels.c.label_id == Annotation.label_id))
+            .where(*self._image_conditions(dataset_id),
+                   *(field.is_not(None) for field in BOX_FIELDS[2:]))
+        )
+
+    def _fingerprints(self, dataset_id: int) -> dict[int, tuple[str, int, int]]:
+        """(fingerprint, image count, box count) of each non-empty part of a dataset"""
+        part = (Image.id // settings.SNAPSHOT_PART_IMAGES).label("part")
+
+        def row_hash(*fields):
+            # Order-independent: a sum of 64-bit hashes of the rows
+            return func.sum(func.hashtextextended(func.concat_ws(
+                "|", *(func.coalesce(cast(field, Text), "\\N") for field in fields)), 0))
+
+        images = self.db.execute(
+            select(part, func.count(), row_hash(Image.id, Image.s3_key, Image.width, Image.height, Image.split))
+            .where(*self._image_conditions(dataset_id))
+            .group_by(part)
+        ).all()
+        boxes_query = self._boxes_query(dataset_id).subquery()
+        box_part = (boxes_query.c.image_id // settings.SNAPSHOT_PART_IMAGES).label("part")
+        boxes = {row[0]: row[1:] for row in self.db.execute(
+            select(box_part, func.count(), row_hash(*boxes_query.c))
+            .group_by(box_part)
+        )}
+
+        fingerprints = {}
+        for index, image_count, image_hash in images:
+            box_count, box_hash = boxes.get(index, (0, 0))
+            digest = hashlib.sha256(
+                f"{SNAPSHOT_VERSION}:{image_count}:{image_hash}:{box_count}:{box_hash}".encode())
+            fingerprints[index] = (digest.hexdigest()[:16], image_count, box_count)
+        return fingerprints
+
+    def _iter_batches(self, dataset_id: int, index: int) -> Iterator[pa.RecordBatch]:
+        """
+        Record batches of a part, EXPORT_BATCH_SIZE images each: the boxes of
+        the part are read at once with COPY into an integer array, the
+        images with a server-side cursor
+        """
+        first_id = index * settings.SNAPSHOT_PART_IMAGES
+        in_part = (Image.id >= first_id, Image.id < first_id + settings.SNAPSHOT_PART_IMAGES)
+
+        buffer = io.BytesIO()
+        copy_query(
+            self.db,
+            self._boxes_query(dataset_id).where(*in_part)
+            .order_by(Annotation.image_id, Annotation.id),
+            buffer
+        )
+        boxes = np.fromstring(buffer.getvalue(), dtype=np.int64, sep=" ").reshape(-1, len(BOX_FIELDS))
+        del buffer
+
+        result = self.db.execute(
+            select(Image.id, Image.s3_key, Image.width, Image.height, Image.split)
+            .where(*self._image_conditions(dataset_id), *in_part)
+            .order_by(Image.id)
+            .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+        for partition in result.partitions():
+            start, end = np.searchsorted(boxes[:, 0], [partition[0].id, partition[-1].id + 1])
+            yield snapshot_batch(partition, boxes[start:end])
@@ -0,0 +1,242 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import Column, Integer, MetaData, String, Table, Text, cast, func, literal, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from typing import Callable, Optional
+from fastapi import HTTPException, status
+import io
+
+import numpy as np
+
+from app.core.database import SessionLocal, copy_query, copy_rows
+from app.core.splits import assign_splits
+from app.model.annotation import Annotation
+from app.model.dataset import Dataset, DatasetStatus
+from app.model.image import Image, ImageStatus
+from app.model.job import Job
+from app.schema.split import SplitGrouping, SplitRequest
+from app.services.job_service import JobService
+from app.services.near_duplicate_service import NearDuplicateService
+
+# Max length of a split name (images.split)
+SPLIT_NAME_MAX_LENGTH = 50
+
+# Staging table of an assignment, private to its connection and dropped at commit
+_staging = MetaData()
+staged_splits = Table(
+    "split_assignments", _staging,
+    Column("image_id", Integer),
+    Column("split", String(SPLIT_NAME_MAX_LENGTH)),
+    prefixes=["TEMPORARY"], postgresql_on_commit="DROP")
+
+
+def write_splits(
+    dataset_id: int,
+    request: SplitRequest,
+    on_progress: Optional[Callable[..., None]] = None
+) -> dict:
+    """
+    Assign the images of a dataset to splits from a single REPEATABLE READ
+    view of the database
+
+    Assignments of the same dataset are serialized by an advisory lock held
+    by a separate session, taken before the read snapshot starts.
+    """
+    lock = SessionLocal()
+    db = SessionLocal()
+    try:
+        lock.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"split:{dataset_id}"))))
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        return SplitService(db).assign(dataset_id, request, on_progress)
+    finally:
+        db.close()
+        lock.close()
+
+
+def _read_ints(db: Session, query, columns: int) -> np.ndarray:
+    """Rows of integer columns of a query, read with COPY into an (n, columns) array"""
+    buffer = io.BytesIO()
+    copy_query(db, query, buffer)
+    return np.fromstring(buffer.getvalue(), dtype=np.int64, sep=" ").reshape(-1, columns)
+
+
+class SplitService:
+    """Service for stratified train/val/test splits of the images of a dataset"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_dataset(self, dataset_id: int) -> Optional[Dataset]:
+        """Get an active dataset, or None if it does not exist or is being deleted"""
+        return self.db.query(Dataset).filter(
+            Dataset.id == dataset_id, Dataset.status == DatasetStatus.ACTIVE).first()
+
+    def submit_split(self, dataset_id: int, request: SplitRequest) -> Optional[Job]:
+        """
+        Check a split request and queue its 'dataset.split' job (commits)
+
+        Returns the job, or None if the dataset does not exist
+        """
+        if self.get_dataset(dataset_id) is None:
+            return None
+        if not request.splits:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="At least one split is required"
+            )
+        for name, ratio in request.splits.items():
+            if not name or len(name) > SPLIT_NAME_MAX_LENGTH:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Split names must have 1 to {SPLIT_NAME_MAX_LENGTH} characters"
+                )
+            if not ratio > 0:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Split '{name}' needs a positive ratio"
+                )
+        return JobService(self.db).submit("dataset.split", {
+            "dataset_id": dataset_id, **request.model_dump(mode="json")})
+
+    def assign(
+        self,
+        dataset_id: int,
+        request: SplitRequest,
+        on_progress: Optional[Callable[..., None]] = None
+    ) -> dict:
+        """
+        Assign every uploaded image of a dataset to one of the requested
+        splits, and clear the split of its other images (commits)
+
+        The image IDs, their group and their distinct labels are read with
+        COPY into integer arrays and assigned in vectorized passes (see
+        app.core.splits.assign_splits): stratified by label, deterministic
+        for a seed and the same data, and with each group of images (same
+        content hash, or near-duplicates within max_distance) in a single
+        split. The images whose split changes are loaded with COPY into a
+        staging table and written with one UPDATE; the others are not
+        touched.
+
+        Returns dict with the image, group and updated counts, and the
+        number of images per split
+        """
+        if self.get_dataset(dataset_id) is None:
+            raise ValueError(f"Dataset {dataset_id} not found")
+        uploaded = (Image.dataset_id == dataset_id, Image.status == ImageStatus.UPLOADED)
+
+        names = list(request.splits)
+        # Group of an image: the lowest image ID of its group
+        if request.group_by == SplitGrouping.CONTENT_HASH:
+            group = func.min(Image.id).over(
+                partition_by=func.coalesce(Image.content_sha256, cast(Image.id, Text)))
+        else:
+            group = Image.id
+        # Current split of an image: 1 + its position in the requested names,
+        # 0 if unassigned or not requested
+        current = func.coalesce(
+            func.array_position(literal(names, ARRAY(String)), Image.split), 0)
+        images = _read_ints(self.db, select(Image.id, group, current).where(*uploaded).order_by(Image.id), 3)
+        image_ids, image_groups, image_current = images[:, 0], images[:, 1], images[:, 2]
+
+        if request.group_by == SplitGrouping.NEAR_DUPLICATE and len(image_ids):
+            for members in NearDuplicateService(self.db).get_index(dataset_id).groups(request.max_distance):
+                # The cached hash index may list images that are gone since
+                positions = np.minimum(np.searchsorted(image_ids, members), len(image_ids) - 1)
+                positions = positions[image_ids[positions] == members]
+                if len(positions):
+                    image_groups[positions] = image_ids[positions].min()
+
+        group_keys, group_index, group_sizes = np.unique(
+            image_groups, return_inverse=True, return_counts=True)
+        pairs = _read_ints(self.db, select(Annotation.image_id, Annotation.label_id).distinct().join(
+            Image, Image.id == Annotation.image_id).where(*uploaded), 2)
+        # Distinct (group position, label ID) pairs
+        pairs = np.unique(group_index[np.searchsorted(image_ids, pairs[:, 0])] << 32 | pairs[:, 1])
+        pairs = np.stack([pairs >> 32, pairs & 0xFFFFFFFF], axis=1)
+        if on_progress:
+            on_progress(images=len(image_ids), groups=len(group_keys))
+
+        group_splits = assign_splits(group_keys, group_sizes, pairs,
+                                     [request.splits[name] for name in names], request.seed)
+        image_splits = group_splits[group_index]
+
+        # Only the images whose split changes are written: every write is an
+        # index update on images, so a re-run with the same seed costs reads only
+        changed = np.flatnonzero(image_current != image_splits + 1)
+        updated = 0
+        if len(changed):
+            staged_splits.create(self.db.connection())
+            copy_rows(self.db, staged_splits.name, ["image_id", "split"],
+                      zip(image_ids[changed].tolist(),
+                          np.array(names, dtype=object)[image_splits[changed]].tolist()))
+            updated = self.db.execute(
+                update(Image)
+                .where(Image.id == staged_splits.c.image_id)
+                .values(split=staged_splits.c.split)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+        cleared = self.db.execute(
+            update(Image)
+            .where(Image.dataset_id == dataset_id, Image.split.is_not(None),
+                   Image.status != ImageStatus.UPLOADED)
+            .values(split=None)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        self.db.commit()
+
+        counts = np.bincount(image_splits, minlength=len(names))
+        return {
+            "image_count": len(image_ids),
+            "group_count": len(group_keys),
+            "updated": updated,
+            "cleared": cleared,
+            "splits": {name: int(count) for name, count in zip(names, counts)}
+        }
+
+    def get_summary(self, dataset_id: int) -> Optional[dict]:
+        """
+        Uploaded images, annotations and annotations per label of each split
+        of a dataset, to check the assignment
+
+        Returns None if the dataset does not exist
+        """
+        if self.get_dataset(dataset_id) is None:
+            return None
+        uploaded = (Image.dataset_id == dataset_id, Image.status == ImageStatus.UPLOADED)
+
+        splits = {}
+        unassigned = 0
+        for name, image_count in self.db.execute(
+                select(Image.split, func.count()).where(*uploaded).group_by(Image.split)):
+            if name is None:
+                unassigned = image_count
+            else:
+                splits[name] = {"name": name, "image_count": image_count,
+                                "annotation_count": 0, "classes": []}
+        names = sorted(splits)
+        if not names:
+            return {"dataset_id": dataset_id, "unassigned_count": unassigned, "splits": []}
+
+        # (image ID, label ID, 1 + split position) of every annotation,
+        # counted with NumPy: distinct images per label without a SQL sort
+        position = func.coalesce(func.array_position(literal(names, ARRAY(String)), Image.split), 0)
+        rows = _read_ints(self.db, select(Annotation.image_id, Annotation.label_id, position).join(
+            Image, Image.id == Annotation.image_id).where(*uploaded, Image.split.is_not(None)), 3)
+        # Splits assigned since the first query are left out
+        rows = rows[rows[:, 2] > 0]
+        classes, class_index, annotation_counts = np.unique(
+            (rows[:, 2] - 1) << 32 | rows[:, 1], return_inverse=True, return_counts=True)
+        _, first = np.unique(rows[:, 0] << 32 | rows[:, 1], return_index=True)
+        image_counts = np.bincount(class_index[first], minlength=len(classes))
+
+        for key, annotation_count, image_count in zip(classes.tolist(), annotation_counts.tolist(),
+                                                      image_counts.tolist()):
+            split = splits[names[key >> 32]]
+            split["annotation_count"] += annotation_count
+            split["classes"].append({"label_id": key & 0xFFFFFFFF, "annotation_count": annotation_count,
+                                     "image_count": image_count})
+
+        return {
+            "dataset_id": dataset_id,
+            "unassigned_count": unassigned,
+            "splits": [splits[name] for name in names]
+        }
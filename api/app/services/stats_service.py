@@ -0,0 +1,78 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import or_, select
+from typing import Optional
+
+from app.core.annotation_stats import StatsBuilder, StatsCache
+from app.core.config import settings
+from app.core.database import copy_query
+from app.model.annotation import Annotation
+from app.model.dataset import Dataset, DatasetStatus, dataset_labels
+from app.model.image import Image, ImageStatus
+from app.model.label import Label
+
+# Shared by the requests of an API process
+stats_cache = StatsCache(max_size=settings.DATASET_STATS_CACHE_SIZE)
+
+
+class StatsService:
+    """Service computing the annotation statistics of datasets"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_stats(self, dataset_id: int) -> Optional[dict]:
+        """
+        Annotation statistics of the uploaded images of a dataset
+
+        The rows (image size, label and box of each annotation, one row per
+        image without annotation) are streamed with COPY and parsed into
+        NumPy columns, never loaded as ORM objects or tuples. The result is
+        cached per dataset and reused as long as the dataset's updated_at
+        has not changed: every write to its images or annotations sets it.
+
+        Returns None if the dataset does not exist or is being deleted
+        """
+        updated_at = self.db.execute(
+            select(Dataset.updated_at).where(Dataset.id == dataset_id,
+                                             Dataset.status == DatasetStatus.ACTIVE)
+        ).scalar()
+        if updated_at is None:
+            return None
+        # Read before the rows: a concurrent write can only make the result
+        # newer than its key, never older
+        stats = stats_cache.get(dataset_id, updated_at)
+        if stats is not None:
+            return stats
+
+        # COPY streams the rows as text to the builder, which parses them
+        # with NumPy a few MiB at a time: rows never become Python tuples
+        builder = StatsBuilder()
+        copy_query(
+            self.db,
+            select(Image.id, Image.width, Image.height, Annotation.label_id,
+                   Annotation.bbox_xmin, Annotation.bbox_ymin,
+                   Annotation.bbox_xmax, Annotation.bbox_ymax)
+            .outerjoin(Annotation, Annotation.image_id == Image.id)
+            .where(Image.dataset_id == dataset_id, Image.status == ImageStatus.UPLOADED),
+            builder
+        )
+        stats = builder.compute()
+
+        # Every label of the dataset is listed, unused ones with zero counts
+        counts = {item["label_id"]: item for item in stats["classes"]}
+        labels = self.db.execute(
+            select(Label.id, Label.name)
+            .where(or_(Label.id.in_(counts),
+                       Label.id.in_(select(dataset_labels.c.label_id)
+                                    .where(dataset_labels.c.dataset_id == dataset_id))))
+            .order_by(Label.id)
+        ).all()
+        stats["classes"] = [
+            {"label_id": label.id, "name": label.name,
+             **counts.get(label.id, {"annotation_count": 0, "image_count": 0})}
+            for label in labels
+        ]
+        stats.update(dataset_id=dataset_id, updated_at=updated_at)
+
+        stats_cache.put(dataset_id, updated_at, stats)
+        return stats
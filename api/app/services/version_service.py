@@ -0,0 +1,324 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import except_, func, insert, literal, or_, select, tuple_, update
+from typing import Callable, Optional
+
+from app.core.database import SessionLocal
+from app.core.pagination import decode_cursor, encode_cursor
+from app.model.annotation import Annotation
+from app.model.dataset import Dataset, DatasetStatus, dataset_labels
+from app.model.dataset_version import DatasetVersion, VersionAnnotation, VersionImage, VersionLabel
+from app.model.image import Image, ImageStatus
+from app.model.label import Label
+from app.schema.dataset_version import ChangeType, VersionedKind
+
+# Record table of each kind of versioned rows, the column holding the ID of
+# the versioned row and the columns compared between versions
+VERSIONED_ROWS = {
+    VersionedKind.IMAGES: (VersionImage, "image_id",
+                           ("filename", "s3_key", "width", "height", "content_sha256")),
+    VersionedKind.LABELS: (VersionLabel, "label_id", ("name",)),
+    VersionedKind.ANNOTATIONS: (VersionAnnotation, "annotation_id",
+                                ("image_id", "label_id", "bbox_xmin", "bbox_ymin", "bbox_xmax", "bbox_ymax")),
+}
+
+
+def lock_versions(db: Session, dataset_id: int) -> None:
+    """
+    Wait for the version being written for a dataset, and keep others from
+    starting until the session's transaction ends
+    """
+    db.execute(select(func.pg_advisory_xact_lock(func.hashtext(f"version:{dataset_id}"))))
+
+
+def write_version(
+    dataset_id: int,
+    message: Optional[str],
+    on_progress: Optional[Callable[..., None]] = None
+) -> dict:
+    """
+    Record a new version of a dataset from a single REPEATABLE READ view of
+    the database
+
+    Versions of a dataset are serialized by an advisory lock held by a
+    separate session, taken before the read snapshot starts so a run that
+    waited compares against the version the previous one recorded.
+    """
+    lock = SessionLocal()
+    db = SessionLocal()
+    try:
+        lock_versions(lock, dataset_id)
+        db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+        version = VersionService(db).create_version(dataset_id, message, on_progress)
+        return {
+            "version_id": version.id,
+            "number": version.number,
+            "image_count": version.image_count,
+            "label_count": version.label_count,
+            "annotation_count": version.annotation_count,
+            "change_count": version.change_count
+        }
+    finally:
+        db.close()
+        lock.close()
+
+
+class VersionService:
+    """
+    Service for immutable dataset versions, stored as differences between
+    consecutive versions (see app.model.dataset_version)
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_dataset(self, dataset_id: int) -> Optional[Dataset]:
+        """Get an active dataset, or None if it does not exist or is being deleted"""
+        return self.db.query(Dataset).filter(
+            Dataset.id == dataset_id, Dataset.status == DatasetStatus.ACTIVE).first()
+
+    def get_versions(self, dataset_id: int) -> Optional[list[DatasetVersion]]:
+        """Versions of a dataset, newest first, or None if the dataset does not exist"""
+        if self.get_dataset(dataset_id) is None:
+            return None
+        return self.db.execute(
+            select(DatasetVersion).where(DatasetVersion.dataset_id == dataset_id)
+            .order_by(DatasetVersion.number.desc())
+        ).scalars().all()
+
+    def get_version(self, dataset_id: int, number: int) -> Optional[DatasetVersion]:
+        """Get a version of an active dataset by number"""
+        return self.db.execute(
+            select(DatasetVersion)
+            .join(Dataset, Dataset.id == DatasetVersion.dataset_id)
+            .where(DatasetVersion.dataset_id == dataset_id, DatasetVersion.number == number,
+                   Dataset.status == DatasetStatus.ACTIVE)
+        ).scalar_one_or_none()
+
+    def create_version(
+        self,
+        dataset_id: int,
+        message: Optional[str],
+        on_progress: Optional[Callable[..., None]] = None
+    ) -> DatasetVersion:
+        """
+        Record the current uploaded images, labels and annotations of a
+        dataset as its next version (commits)
+
+        For each kind, the current rows are compared with the states still
+        open in the record table, with two set operations: states whose
+        row changed or disappeared are closed (removed_in = the new number)
+        and the new states of added or changed rows are inserted (added_in =
+        the new number). Unchanged rows write nothing, so a version costs
+        one scan of the dataset and storage proportional to its changes.
+        """
+        # Key share: the dataset cannot be deleted until the version is
+        # committed, but its counters can still be updated. Deletions also
+        # wait for the version lock (see lock_versions) before starting.
+        dataset = self.db.execute(
+            select(Dataset)
+            .where(Dataset.id == dataset_id, Dataset.status == DatasetStatus.ACTIVE)
+            .with_for_update(read=True, key_share=True)
+        ).scalar_one_or_none()
+        if dataset is None:
+            raise ValueError(f"Dataset {dataset_id} not found")
+
+        previous = self.db.execute(
+            select(DatasetVersion).where(DatasetVersion.dataset_id == dataset_id)
+            .order_by(DatasetVersion.number.desc()).limit(1)
+        ).scalar_one_or_none()
+        number = previous.number + 1 if previous else 1
+
+        counts = {}
+        change_count = 0
+        for kind, (model, id_name, value_names) in VERSIONED_ROWS.items():
+            names = (id_name, *value_names)
+            current = select(*(getattr(model, name) for name in names)).where(
+                model.dataset_id == dataset_id, model.removed_in.is_(None))
+            live = self._live_rows(kind, dataset_id)
+
+            gone = except_(current, live).subquery()
+            closed = self.db.execute(
+                update(model)
+                .where(model.dataset_id == dataset_id, model.removed_in.is_(None),
+                       getattr(model, id_name).in_(select(gone.c[id_name])))
+                .values(removed_in=number)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            # Compared with the open states left after closing the changed ones
+            new = except_(live, current).subquery()
+            added = self.db.execute(
+                insert(model).from_select(
+                    ["dataset_id", *names, "added_in"],
+                    select(literal(dataset_id), *(new.c[name] for name in names), literal(number))
+                )
+            ).rowcount
+
+            count_name = f"{kind.value[:-1]}_count"
+            counts[count_name] = (getattr(previous, count_name) if previous else 0) - closed + added
+            change_count += closed + added
+            if on_progress:
+                on_progress(**{f"{kind.value}_changed": closed + added})
+
+        version = DatasetVersion(
+            dataset_id=dataset_id,
+            number=number,
+            message=message,
+            change_count=change_count,
+            **counts
+        )
+        self.db.add(version)
+        self.db.commit()
+        self.db.refresh(version)
+        return version
+
+    def _live_rows(self, kind: VersionedKind, dataset_id: int):
+        """Current rows of a kind, with the columns of its record table"""
+        if kind == VersionedKind.IMAGES:
+            return select(Image.id.label("image_id"), Image.filename, Image.s3_key,
+                          Image.width, Image.height, Image.content_sha256).where(
+                Image.dataset_id == dataset_id, Image.status == ImageStatus.UPLOADED)
+        if kind == VersionedKind.LABELS:
+            return select(Label.id.label("label_id"), Label.name).join(
+                dataset_labels, dataset_labels.c.label_id == Label.id).where(
+                dataset_labels.c.dataset_id == dataset_id)
+        return select(Annotation.id.label("annotation_id"), Annotation.image_id, Annotation.label_id,
+                      Annotation.bbox_xmin, Annotation.bbox_ymin,
+                      Annotation.bbox_xmax, Annotation.bbox_ymax).join(
+            Image, Image.id == Annotation.image_id).where(
+            Image.dataset_id == dataset_id, Image.status == ImageStatus.UPLOADED)
+
+    def get_rows(
+        self,
+        dataset_id: int,
+        number: int,
+        kind: VersionedKind,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Optional[dict]:
+        """
+        Images, labels or annotations of a version, by ID with keyset
+        pagination: the states valid in the version are read directly
+        (added_in <= number < removed_in), without replaying differences
+
+        Returns dict with items and next_cursor, or None if the version
+        does not exist
+        """
+        if self.get_version(dataset_id, number) is None:
+            return None
+        model, id_name, _ = VERSIONED_ROWS[kind]
+        row_id = getattr(model, id_name)
+
+        query = select(model).where(
+            model.dataset_id == dataset_id,
+            model.added_in <= number,
+            or_(model.removed_in.is_(None), model.removed_in > number)
+        )
+        if cursor:
+            (last_id,) = decode_cursor(cursor, 1)
+            query = query.where(row_id > last_id)
+
+        # Fetch one extra row to know whether there is a next page
+        items = self.db.execute(query.order_by(row_id).limit(limit + 1)).scalars().all()
+        next_cursor = encode_cursor(getattr(items[limit - 1], id_name)) if len(items) > limit else None
+        return {"items": items[:limit], "next_cursor": next_cursor}
+
+    def _changes(self, dataset_id: int, kind: VersionedKind, from_number: int, to_number: int):
+        """
+        States of a kind valid in only one of two versions, joined by row ID
+
+        Only the states added or closed between the two versions are read,
+        through the (dataset_id, added_in) and (dataset_id, removed_in)
+        indexes. Returns (before, after, joined, changed): the states in the
+        source and target versions, their full outer join, and the condition
+        dropping rows that changed and changed back.
+        """
+        model, id_name, value_names = VERSIONED_ROWS[kind]
+        low, high = sorted((from_number, to_number))
+        only_low = select(model).where(
+            model.dataset_id == dataset_id,
+            model.removed_in > low, model.removed_in <= high, model.added_in <= low
+        ).subquery()
+        only_high = select(model).where(
+            model.dataset_id == dataset_id,
+            model.added_in > low, model.added_in <= high,
+            or_(model.removed_in.is_(None), model.removed_in > high)
+        ).subquery()
+        before, after = (only_low, only_high) if from_number <= to_number else (only_high, only_low)
+
+        joined = before.join(after, before.c[id_name] == after.c[id_name], full=True)
+        names = (id_name, *value_names)
+        changed = tuple_(*(before.c[name] for name in names)).is_distinct_from(
+            tuple_(*(after.c[name] for name in names)))
+        return before, after, joined, changed
+
+    def get_diff_summary(self, dataset_id: int, from_number: int, to_number: int) -> Optional[dict]:
+        """
+        Number of images, labels and annotations added, removed and
+        modified from one version to another (either may be the older)
+
+        Returns None if either version does not exist
+        """
+        if self.get_version(dataset_id, from_number) is None or self.get_version(dataset_id, to_number) is None:
+            return None
+
+        summary = {"from_version": from_number, "to_version": to_number}
+        for kind in VersionedKind:
+            before, after, joined, changed = self._changes(dataset_id, kind, from_number, to_number)
+            added, removed, modified = self.db.execute(
+                select(
+                    func.count().filter(before.c.id.is_(None)),
+                    func.count().filter(after.c.id.is_(None)),
+                    func.count().filter(before.c.id.is_not(None), after.c.id.is_not(None))
+                ).select_from(joined).where(changed)
+            ).one()
+            summary[kind.value] = {"added": added, "removed": removed, "modified": modified}
+        return summary
+
+    def get_diff(
+        self,
+        dataset_id: int,
+        from_number: int,
+        to_number: int,
+        kind: VersionedKind,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Optional[dict]:
+        """
+        Images, labels or annotations that differ from one version to
+        another, by ID with keyset pagination, with their state in each
+
+        Returns dict with items and next_cursor, or None if either version
+        does not exist
+        """
+        if self.get_version(dataset_id, from_number) is None or self.get_version(dataset_id, to_number) is None:
+            return None
+        model, id_name, _ = VERSIONED_ROWS[kind]
+        before, after, joined, changed = self._changes(dataset_id, kind, from_number, to_number)
+
+        row_id = func.coalesce(before.c[id_name], after.c[id_name])
+        query = select(row_id, before.c.id, after.c.id).select_from(joined).where(changed)
+        if cursor:
+            (last_id,) = decode_cursor(cursor, 1)
+            query = query.where(row_id > last_id)
+        rows = self.db.execute(query.order_by(row_id).limit(limit + 1)).all()
+        next_cursor = encode_cursor(rows[limit - 1][0]) if len(rows) > limit else None
+        rows = rows[:limit]
+
+        record_ids = [record_id for row in rows for record_id in row[1:] if record_id is not None]
+        records = {record.id: record for record in self.db.execute(
+            select(model).where(model.id.in_(record_ids))).scalars()}
+        items = []
+        for item_id, before_id, after_id in rows:
+            if before_id is None:
+                change = ChangeType.ADDED
+            elif after_id is None:
+                change = ChangeType.REMOVED
+            else:
+                change = ChangeType.MODIFIED
+            items.append({
+                "id": item_id,
+                "change": change,
+                "before": records.get(before_id),
+                "after": records.get(after_id)
+            })
+        return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,5 @@
+import os
+
+# The settings are read when app is imported: tests bring their own
+# in-memory databases, the module-level engine is never connected
+os.environ.setdefault("DATABASE_URL", "sqlite://")
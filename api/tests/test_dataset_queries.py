@@ -0,0 +1,129 @@
+from contextlib import contextmanager
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.model  # noqa: F401 (every mapper must be configured)
+from app.core.database import Base
+from app.core.pagination import encode_cursor
+from app.model.dataset import Dataset, dataset_labels
+from app.model.label import Label
+from app.schema.dataset import Dataset as DatasetSchema, DatasetDetail
+from app.services.dataset_service import DatasetService
+
+DATASET_COUNT = 25
+
+
+@pytest.fixture
+def db():
+    """Session on an in-memory database holding DATASET_COUNT datasets with labels"""
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(engine, tables=[Dataset.__table__, Label.__table__, dataset_labels])
+    session = sessionmaker(bind=engine)()
+
+    labels = [Label(name=name) for name in ("car", "person", "bike")]
+    for i in range(DATASET_COUNT):
+        session.add(Dataset(
+            name=f"dataset-{i:02d}",
+            description="street scenes" if i % 2 else "indoor scenes",
+            labels=labels[:i % 3 + 1],
+            image_count=i * 10,
+            uploaded_count=i * 10,
+            annotation_count=i * 30,
+            label_count=i % 3 + 1,
+        ))
+    session.commit()
+    # Nothing loaded by the setup may hide a lazy load from the tests
+    session.expunge_all()
+
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@contextmanager
+def count_statements(session):
+    """Collect the SQL statements executed on the session's engine"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"sort_by": "image_count", "sort_order": "desc"},
+    {"sort_by": "created_at"},
+    {"search": "street"},
+    {"label_name": "bike"},
+])
+def test_dataset_pages_are_one_statement(db, options):
+    service = DatasetService(db)
+    cursor = None
+    seen = []
+    while True:
+        db.expunge_all()
+        with count_statements(db) as statements:
+            page = service.get_datasets(limit=10, cursor=cursor, **options)
+            # Serialized as the list endpoint does, counts included
+            items = [DatasetSchema.model_validate(dataset) for dataset in page["items"]]
+        assert len(statements) == 1, statements
+        seen.extend(items)
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len({item.id for item in seen}) == len(seen)
+    assert all(item.image_count == int(item.name[-2:]) * 10 for item in seen)
+    assert all(item.label_count == int(item.name[-2:]) % 3 + 1 for item in seen)
+    if not options:
+        assert len(seen) == DATASET_COUNT
+
+
+@pytest.mark.parametrize("options", [
+    {"sort_by": "created_at"},
+    {"sort_by": "image_count"},
+    {"sort_by": "name", "sort_order": "desc"},
+])
+def test_dataset_cursor_rejects_another_sort(db, options):
+    service = DatasetService(db)
+    cursor = service.get_datasets(limit=10)["next_cursor"]
+
+    with pytest.raises(HTTPException) as error:
+        service.get_datasets(limit=10, cursor=cursor, **options)
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("values", [
+    ("created_at", "asc", "dataset-09", 10),
+    ("name", "asc", 90, 10),
+    ("name", "asc", "dataset-09", "10"),
+])
+def test_dataset_cursor_rejects_malformed_values(db, values):
+    with pytest.raises(HTTPException) as error:
+        DatasetService(db).get_datasets(limit=10, cursor=encode_cursor(*values), sort_by=values[0])
+    assert error.value.status_code == 400
+
+
+def test_dataset_detail_is_one_statement(db):
+    dataset_id = db.query(Dataset.id).filter(Dataset.name == "dataset-07").scalar()
+    db.expunge_all()
+
+    with count_statements(db) as statements:
+        detail = DatasetDetail.model_validate(DatasetService(db).get_dataset_detail(dataset_id))
+    assert len(statements) == 1, statements
+    assert (detail.image_count, detail.annotation_count, detail.label_count) == (70, 210, 2)
+
+    with count_statements(db) as statements:
+        assert DatasetService(db).get_dataset_detail(dataset_id + 1000) is None
+    assert len(statements) == 1